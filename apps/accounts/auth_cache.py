@@ -0,0 +1,95 @@
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import Member
+
+# Campos do usuário guardados no contexto; os demais (ex.: password) ficam
+# adiados e são carregados do banco só se forem acessados
+USER_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+)
+
+# Indica que o usuário não veio do cache e o membro ainda não foi consultado
+_MISSING = object()
+
+
+def _context_key(jti):
+    return f"auth:ctx:{jti}"
+
+
+def _version_key(user_id):
+    return f"auth:user:{user_id}:version"
+
+
+def invalidate_user(user_id):
+    """
+    Descarta os contextos em cache de todos os tokens do usuário.
+
+    A versão precisa durar pelo menos o tempo de vida do access token, para que
+    nenhum contexto anterior volte a ser considerado válido.
+    """
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    cache.set(_version_key(user_id), uuid.uuid4().hex, timeout)
+
+
+def get_cached_user(jti, user_id):
+    """
+    Retorna o usuário (com o snapshot do membro) guardado para o token, ou None.
+    """
+    entries = cache.get_many([_context_key(jti), _version_key(user_id)])
+    context = entries.get(_context_key(jti))
+    if context is None or context["version"] != entries.get(_version_key(user_id)):
+        return None
+    if str(context["user"]["id"]) != str(user_id):
+        return None
+
+    # from_db espera os valores na ordem dos campos do model
+    fields = [
+        field.attname
+        for field in User._meta.concrete_fields
+        if field.attname in USER_FIELDS
+    ]
+    user = User.from_db(
+        User.objects.db, fields, [context["user"][field] for field in fields]
+    )
+    user.member_snapshot = context["member"]
+    return user
+
+
+def store_user(jti, user, expires_at):
+    """
+    Guarda o contexto do token até a expiração dele (`exp` em timestamp).
+    """
+    timeout = int(expires_at - time.time())
+    if timeout <= 0:
+        return
+
+    member = Member.objects.filter(user_id=user.pk).values("id", "name").first()
+    user.member_snapshot = member
+    context = {
+        "version": cache.get(_version_key(user.pk)),
+        "user": {field: getattr(user, field) for field in USER_FIELDS},
+        "member": member,
+    }
+    cache.set(_context_key(jti), context, timeout)
+
+
+def get_member_id(user):
+    """
+    Id do membro do usuário, usando o snapshot da autenticação quando houver.
+    """
+    member = getattr(user, "member_snapshot", _MISSING)
+    if member is _MISSING:
+        member = Member.objects.filter(user_id=user.pk).values("id").first()
+    return member["id"] if member else None
@@ -1,6 +1,13 @@
+import logging
+
 from django.core import signing
 from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from . import auth_cache
+
+logger = logging.getLogger(__name__)
 
 
 class JWTAuthenticationFromCookie(JWTAuthentication):
@@ -16,14 +23,19 @@ class JWTAuthenticationFromCookie(JWTAuthentication):
                 raise NotAuthenticated(detail="Token não encontrado")
         
         try:
-            # Descriptografa o token
-            decrypted_token = signing.loads(raw_token)
-            
-            # Valida o token JWT
-            validated_token = self.get_validated_token(decrypted_token)
+            # Token já validado (ou emitido) pelo RefreshTokenMiddleware
+            validated = getattr(request._request, "validated_access_token", None)
+            if validated and validated[0] == raw_token:
+                validated_token = validated[1]
+            else:
+                # Descriptografa o token
+                decrypted_token = signing.loads(raw_token)
+
+                # Valida o token JWT
+                validated_token = self.get_validated_token(decrypted_token)
             
             # Retorna usuário e token validado
-            return self.get_user(validated_token), validated_token
+            return self.get_cached_user(validated_token), validated_token
             
         except signing.BadSignature:
             logger.error("Token com assinatura inválida")
@@ -31,3 +43,18 @@ class JWTAuthenticationFromCookie(JWTAuthentication):
         except Exception as e:
             logger.error(f"Erro na validação do token: {str(e)}")
             raise AuthenticationFailed(detail="Token inválido ou expirado")
+
+    def get_cached_user(self, validated_token):
+        """
+        Usuário do token a partir do cache (chave: jti), sem consultar o banco.
+        """
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if jti is None or user_id is None:
+            return self.get_user(validated_token)
+
+        user = auth_cache.get_cached_user(jti, user_id)
+        if user is None:
+            user = self.get_user(validated_token)
+            auth_cache.store_user(jti, user, validated_token["exp"])
+        return user
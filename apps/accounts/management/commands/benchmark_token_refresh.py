@@ -0,0 +1,109 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import Member
+
+URL = "/api/praise/me/"
+MIDDLEWARE = "apps.accounts.middleware.jwt_refresh_middleware.RefreshTokenMiddleware"
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Simula uma hora de sessão e compara as requisições HTTP e o tempo gastos "
+        "pelo fluxo antigo (401, refresh e repetição) e pela renovação na requisição."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--actions",
+            type=int,
+            default=360,
+            help="Ações do usuário (requisições à API) por hora de sessão.",
+        )
+
+    def handle(self, *args, **options):
+        actions = options["actions"]
+        lifetime = api_settings.ACCESS_TOKEN_LIFETIME
+        # Uma ação a cada `interval`; o access token vence a cada `lifetime`
+        interval = timedelta(hours=1) / actions
+        per_token = max(1, int(lifetime / interval))
+        expiring = set(range(per_token, actions, per_token))
+
+        # Os 401 esperados do fluxo antigo não precisam poluir a saída
+        logging.getLogger("apps.accounts.authentication").setLevel(logging.CRITICAL)
+        setup_test_environment()
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(username="benchmark-token-refresh")
+                Member.objects.create(name="Benchmark", user=user)
+                legacy = self._session(user, actions, expiring, legacy=True)
+                inline = self._session(user, actions, expiring, legacy=False)
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            teardown_test_environment()
+
+        for name, (requests, elapsed) in [
+            ("401 + refresh", legacy),
+            ("renovação inline", inline),
+        ]:
+            self.stdout.write(
+                f"{name:<18} {requests:>5} requisições/hora de sessão "
+                f"({elapsed * 1000:.1f} ms)"
+            )
+        saved = legacy[0] - inline[0]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(expiring)} expirações: {saved} round-trips a menos por hora."
+            )
+        )
+
+    def _session(self, user, actions, expiring, legacy):
+        middleware = [m for m in settings.MIDDLEWARE if m != MIDDLEWARE]
+        if not legacy:
+            middleware.append(MIDDLEWARE)
+
+        client = Client()
+        refresh = RefreshToken.for_user(user)
+        client.cookies["refresh_token"] = signing.dumps(str(refresh))
+        client.cookies["access_token"] = signing.dumps(str(refresh.access_token))
+
+        requests = 0
+        start = time.perf_counter()
+        with override_settings(MIDDLEWARE=middleware):
+            for action in range(actions):
+                if action in expiring:
+                    client.cookies["access_token"] = self._expired_access(refresh)
+
+                response = client.get(URL)
+                requests += 1
+                if legacy and response.status_code == 401:
+                    # Fluxo antigo: o frontend renova e repete a requisição
+                    client.post("/api/token/refresh/")
+                    client.get(URL)
+                    requests += 2
+        return requests, time.perf_counter() - start
+
+    def _expired_access(self, refresh):
+        access = refresh.access_token
+        access.set_exp(
+            from_time=timezone.now() - api_settings.ACCESS_TOKEN_LIFETIME * 2
+        )
+        return signing.dumps(str(access))
@@ -1,89 +1,95 @@
-from django.http import JsonResponse
-from django.utils.deprecation import MiddlewareMixin
-from rest_framework_simplejwt.exceptions import InvalidToken
-from rest_framework_simplejwt.tokens import RefreshToken, TokenError
-
+import time
 
-class RefreshTokenMiddleware(MiddlewareMixin):
-    def process_response(self, request, response):
-        if response.status_code == 401 and request.COOKIES.get("refresh_token"):
-            refresh_token = request.COOKIES.get("refresh_token")
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, TokenError
 
-            try:
-                refresh = RefreshToken(refresh_token)
-                new_access = str(refresh.access_token)
+ACCESS_COOKIE = "access_token"
+REFRESH_COOKIE = "refresh_token"
 
-                # Criar nova resposta
-                new_response = JsonResponse({"detail": "Token renovado"})
 
-                # Transferir cabeçalhos CORS da resposta original para a nova resposta
-                cors_headers = [
-                    "Access-Control-Allow-Origin",
-                    "Access-Control-Allow-Methods",
-                    "Access-Control-Allow-Headers",
-                    "Access-Control-Allow-Credentials",
-                    "Access-Control-Expose-Headers",
-                    "Access-Control-Max-Age",
-                ]
+def load_access_token(cookie):
+    """
+    Descriptografa e valida o access token do cookie; None se inválido ou expirado.
+    """
+    if not cookie:
+        return None
+    try:
+        return AccessToken(signing.loads(cookie))
+    except (signing.BadSignature, TokenError):
+        return None
 
-                for header in cors_headers:
-                    if header in response:
-                        new_response[header] = response[header]
 
-                # Definir cabeçalho CORS explicitamente caso a origem seja de Vercel
-                if (
-                    "Origin" in request.headers
-                    and "vercel" in request.headers["Origin"]
-                ):
-                    new_response["Access-Control-Allow-Origin"] = request.headers[
-                        "Origin"
-                    ]
-                    new_response["Access-Control-Allow-Credentials"] = "true"
+class RefreshTokenMiddleware(MiddlewareMixin):
+    """
+    Renova o access token dentro da própria requisição.
 
-                # Configurar cookie
-                new_response.set_cookie(
-                    key="access_token",
-                    value=new_access,
-                    httponly=True,
-                    secure=True,  # True em produção
-                    samesite="None",
-                    max_age=60 * 10,  # 10 minutos
-                )
+    Antes da view, se o access token estiver ausente, inválido ou perto de
+    expirar (settings.ACCESS_TOKEN_REFRESH_MARGIN) e houver refresh token, um
+    novo access token é emitido e usado pela autenticação; a view roda uma única
+    vez e a resposta leva o novo cookie.
 
-                return new_response
+    A renovação passa pelo TokenRefreshSerializer do simplejwt, com as mesmas
+    regras do endpoint de refresh (ex.: usuário inativo não recebe token).
+    """
 
-            except (TokenError, InvalidToken):
-                # Refresh inválido -> logout
-                new_response = JsonResponse(
-                    {"detail": "Sessão expirada. Faça login novamente."}, status=401
-                )
+    def process_request(self, request):
+        request.renewed_access_token = None
+        request.refresh_failed = False
 
-                # Transferir cabeçalhos CORS da resposta original para a nova resposta
-                cors_headers = [
-                    "Access-Control-Allow-Origin",
-                    "Access-Control-Allow-Methods",
-                    "Access-Control-Allow-Headers",
-                    "Access-Control-Allow-Credentials",
-                    "Access-Control-Expose-Headers",
-                    "Access-Control-Max-Age",
-                ]
+        refresh_cookie = request.COOKIES.get(REFRESH_COOKIE)
+        if not refresh_cookie:
+            return
 
-                for header in cors_headers:
-                    if header in response:
-                        new_response[header] = response[header]
+        access_cookie = request.COOKIES.get(ACCESS_COOKIE)
+        access = load_access_token(access_cookie)
+        margin = settings.ACCESS_TOKEN_REFRESH_MARGIN.total_seconds()
+        if access is not None and access["exp"] - time.time() > margin:
+            # Reaproveitado pela autenticação, sem validar o token de novo
+            request.validated_access_token = (access_cookie, access)
+            return
 
-                # Definir cabeçalho CORS explicitamente caso a origem seja de Vercel
-                if (
-                    "Origin" in request.headers
-                    and "vercel" in request.headers["Origin"]
-                ):
-                    new_response["Access-Control-Allow-Origin"] = request.headers[
-                        "Origin"
-                    ]
-                    new_response["Access-Control-Allow-Credentials"] = "true"
+        try:
+            serializer = TokenRefreshSerializer(
+                data={"refresh": signing.loads(refresh_cookie)}
+            )
+            serializer.is_valid(raise_exception=True)
+            access = AccessToken(serializer.validated_data["access"])
+        except (
+            signing.BadSignature,
+            TokenError,
+            # Usuário inativo ou refresh malformado (erros do serializer)
+            APIException,
+            get_user_model().DoesNotExist,
+        ):
+            request.refresh_failed = True
+            return
 
-                new_response.delete_cookie("access_token")
-                new_response.delete_cookie("refresh_token")
-                return new_response
+        access_cookie = signing.dumps(str(access))
+        request.COOKIES[ACCESS_COOKIE] = access_cookie
+        request.renewed_access_token = access_cookie
+        request.validated_access_token = (access_cookie, access)
 
+    def process_response(self, request, response):
+        renewed = getattr(request, "renewed_access_token", None)
+        # A view já definiu ou removeu o cookie (ex.: logout): prevalece
+        if renewed and ACCESS_COOKIE not in response.cookies:
+            response.set_cookie(
+                key=ACCESS_COOKIE,
+                value=renewed,
+                httponly=True,
+                secure=True,
+                samesite="None",
+                max_age=int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+                path="/",
+            )
+        elif getattr(request, "refresh_failed", False) and response.status_code == 401:
+            # Refresh inválido -> logout
+            response.delete_cookie(ACCESS_COOKIE, path="/")
+            response.delete_cookie(REFRESH_COOKIE, path="/")
         return response
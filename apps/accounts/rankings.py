@@ -0,0 +1,87 @@
+from django.db.models import Count, Value
+from django.db.models.functions import Coalesce, NullIf
+
+from apps.dashboard.rankings import cached_ranking, window_range
+from apps.lineup.models import LineupMember
+
+NAMESPACE = "most_escalated"
+DEFAULT_WINDOW_MONTHS = 12
+
+# Agrupamentos extras aceitos (mesmo formato de apps.music.rankings)
+BREAKDOWNS = {"function"}
+
+
+def _escalated_in_window(months):
+    start, end = window_range(months)
+    return LineupMember.objects.filter(
+        lineup__lineup_date__range=(start, end), member__isnull=False
+    ).order_by()
+
+
+def _rank(members, limit):
+    return sorted(members, key=lambda item: (-item["total-member"], item["name"]))[
+        :limit
+    ]
+
+
+def compute_most_escalated(months=DEFAULT_WINDOW_MONTHS, limit=10, breakdowns=()):
+    """
+    Ranking dos membros mais escalados nos últimos `months` meses.
+
+    Uma única consulta agrupada em LineupMember com o nome do membro; com o
+    agrupamento por função, a mesma consulta agrupa por (membro, função) e os
+    totais são somados em uma passada.
+    """
+    queryset = _escalated_in_window(months)
+
+    if "function" not in breakdowns:
+        top_members = (
+            queryset.values("member", "member__name")
+            .annotate(total=Count("id"))
+            .order_by("-total", "member__name", "member")[:limit]
+        )
+        return {
+            "top_members": [
+                {
+                    "id": item["member"],
+                    "name": item["member__name"],
+                    "total-member": item["total"],
+                }
+                for item in top_members
+            ]
+        }
+
+    # Função removida: usa o nome guardado na escalação
+    rows = (
+        queryset.annotate(
+            function_label=Coalesce(
+                "function__function_name",
+                NullIf("function_name_snapshot", Value("")),
+            )
+        )
+        .values("member", "member__name", "function_label")
+        .annotate(total=Count("id"))
+        .order_by("member", "-total", "function_label")
+    )
+    members = {}
+    for item in rows:
+        member = members.setdefault(
+            item["member"],
+            {
+                "id": item["member"],
+                "name": item["member__name"],
+                "total-member": 0,
+                "functions": [],
+            },
+        )
+        member["total-member"] += item["total"]
+        member["functions"].append(
+            {"function": item["function_label"], "total": item["total"]}
+        )
+    return {"top_members": _rank(members.values(), limit)}
+
+
+def most_escalated(months=DEFAULT_WINDOW_MONTHS, limit=10, breakdowns=()):
+    return cached_ranking(
+        NAMESPACE, compute_most_escalated, months, limit, tuple(breakdowns)
+    )
@@ -0,0 +1,36 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.dashboard import rankings as dashboard_rankings
+from apps.lineup.models import LineupMember, PraiseLineup
+from setup import conditional
+
+from . import auth_cache, rankings
+from .models import Member, MemberFunctions
+
+
+@receiver([post_save, post_delete], sender=LineupMember)
+@receiver([post_save, post_delete], sender=PraiseLineup)
+@receiver([post_save, post_delete], sender=Member)
+@receiver([post_save, post_delete], sender=MemberFunctions)
+def invalidate_most_escalated(sender, **kwargs):
+    dashboard_rankings.invalidate(rankings.NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_auth_context(sender, instance, **kwargs):
+    # Inclui troca de senha, que salva o usuário
+    auth_cache.invalidate_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Member)
+def invalidate_member_auth_context(sender, instance, **kwargs):
+    auth_cache.invalidate_user(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Member)
+@receiver([post_save, post_delete], sender=MemberFunctions)
+@receiver(m2m_changed, sender=Member.function.through)
+def invalidate_collection_versions(sender, **kwargs):
+    conditional.invalidate(sender)
@@ -1,3 +1,172 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core import signing
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.lineup.models import LineupMember, PraiseLineup
+from setup.testing import QueryBudgetMixin
+
+from .models import Member, MemberFunctions
+from .rankings import compute_most_escalated
+
+
+class MemberQueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        self.function = MemberFunctions.objects.create(function_name="Violão")
+        self.create_members(2)
+
+    def create_members(self, count):
+        start = Member.objects.count()
+        for index in range(start, start + count):
+            user = User.objects.create_user(username=f"membro{index}")
+            member = Member.objects.create(name=f"Membro {index}", user=user)
+            member.function.add(self.function)
+
+    def test_members_me_list_does_not_issue_queries_per_member(self):
+        self.assertQueriesDoNotGrow(
+            lambda: self.client.get("/api/praise/members-me"),
+            lambda: self.create_members(3),
+            max_queries=2,
+        )
+
+
+class MostEscalatedMembersTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        guitar = MemberFunctions.objects.create(function_name="Violão")
+        vocal = MemberFunctions.objects.create(function_name="Vocal")
+        self.ana = Member.objects.create(
+            name="Ana", user=User.objects.create_user(username="ana")
+        )
+        bruno = Member.objects.create(
+            name="Bruno", user=User.objects.create_user(username="bruno")
+        )
+
+        for index in range(3):
+            lineup = PraiseLineup.objects.create(lineup_event=f"Culto {index}")
+            LineupMember.objects.create(lineup=lineup, member=self.ana, function=vocal)
+            if index == 0:
+                LineupMember.objects.create(
+                    lineup=lineup, member=self.ana, function=guitar
+                )
+                LineupMember.objects.create(
+                    lineup=lineup, member=bruno, function=guitar
+                )
+
+    def test_ranking_is_computed_in_one_query(self):
+        with self.assertNumQueries(1):
+            ranking = compute_most_escalated()
+        self.assertEqual(
+            ranking["top_members"],
+            [
+                {"id": self.ana.id, "name": "Ana", "total-member": 4},
+                {
+                    "id": ranking["top_members"][1]["id"],
+                    "name": "Bruno",
+                    "total-member": 1,
+                },
+            ],
+        )
+
+    def test_function_breakdown_in_one_query(self):
+        with self.assertNumQueries(1):
+            ranking = compute_most_escalated(limit=1, breakdowns=("function",))
+        self.assertEqual(
+            ranking["top_members"][0]["functions"],
+            [{"function": "Vocal", "total": 3}, {"function": "Violão", "total": 1}],
+        )
+
+    def test_cache_follows_lineup_writes(self):
+        url = "/api/praise/member/most-escalated?limit=1"
+        self.assertEqual(self.client.get(url).json()["top_members"][0]["name"], "Ana")
+        LineupMember.objects.filter(member=self.ana).delete()
+        self.assertEqual(self.client.get(url).json()["top_members"][0]["name"], "Bruno")
+
+
+class AuthContextCacheTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="ana", password="senha-antiga-123"
+        )
+        self.member = Member.objects.create(name="Ana", user=self.user)
+        self.client = APIClient()
+        token = AccessToken.for_user(self.user)
+        self.client.cookies["access_token"] = signing.dumps(str(token))
+
+    def test_authenticated_requests_skip_user_and_member_queries(self):
+        url = "/api/praise/scale-history/"
+        self.assertEqual(self.client.get(url).status_code, 200)
+        # Só a consulta das escalas; usuário e membro vêm do cache
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_member_save_invalidates_context(self):
+        self.client.get("/api/praise/me/")
+        self.member.name = "Ana Paula"
+        self.member.save()
+        self.assertEqual(self.client.get("/api/praise/me/").json()["name"], "Ana Paula")
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/api/praise/me/").status_code, 401)
+
+    def test_password_change_with_cached_user(self):
+        self.client.get("/api/praise/me/")
+        response = self.client.post(
+            "/api/praise/change-password/",
+            {"old_password": "senha-antiga-123", "new_password": "Nova-senha-456"},
+        )
+        self.assertEqual(response.status_code, 201)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("Nova-senha-456"))
+        self.assertEqual(self.user.username, "ana")
+
+
+class InRequestTokenRefreshTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="ana")
+        Member.objects.create(name="Ana", user=self.user)
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client = APIClient()
+        self.client.cookies["refresh_token"] = signing.dumps(str(self.refresh))
+
+        access = self.refresh.access_token
+        access.set_exp(from_time=timezone.now() - timedelta(hours=1))
+        self.client.cookies["access_token"] = signing.dumps(str(access))
+
+    def test_expired_access_is_renewed_in_the_same_request(self):
+        response = self.client.get("/api/praise/me/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["name"], "Ana")
+
+        renewed = response.cookies["access_token"].value
+        self.assertEqual(signing.loads(renewed).count("."), 2)
+        self.assertEqual(self.client.get("/api/praise/me/").status_code, 200)
+
+    def test_invalid_refresh_logs_out(self):
+        self.client.cookies["refresh_token"] = "invalido"
+        response = self.client.get("/api/praise/me/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.cookies["refresh_token"].value, "")
+
+    def test_logout_with_expiring_access_deletes_both_cookies(self):
+        response = self.client.post("/api/praise/logout/")
+        self.assertEqual(response.status_code, 205)
+        self.assertEqual(response.cookies["access_token"].value, "")
+        self.assertEqual(response.cookies["access_token"]["max-age"], 0)
+        self.assertEqual(response.cookies["refresh_token"].value, "")
 
-# Create your tests here.
+    def test_inactive_user_is_not_renewed(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get("/api/praise/me/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.cookies["access_token"].value, "")
@@ -1,12 +1,8 @@
 from datetime import timedelta
 
-from dateutil.relativedelta import relativedelta
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils import timezone
-from django.db.models import Count
 from django.core import signing
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg import openapi
@@ -24,8 +20,16 @@ from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import AccessToken, RefreshToken, UntypedToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from apps.lineup.models import LineupMember, PraiseLineup
+from apps.dashboard.rankings import parse_breakdowns, parse_ranking_params
+from apps.dashboard.stats import get_statistic
+from apps.jobs.serializers import JobAcceptedSerializer
+from apps.jobs.views import accepted_response
+from apps.mailing.delivery import queue_mail
+from setup.async_views import AsyncAPIView
+from setup.conditional import ConditionalGetMixin
+from setup.replica import ReplicaReadMixin
 
+from . import auth_cache, rankings
 from .models import Member, MemberFunctions
 from .serializers import (
     ChangePasswordSerializer,
@@ -57,10 +61,11 @@ class UserViewSet(viewsets.ModelViewSet):
     filterset_fields = ["username"]
 
 
-class MemberFunctionsViewSet(viewsets.ModelViewSet):
+class MemberFunctionsViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = MemberFunctions.objects.all()
     serializer_class = MemberFunctionsSerializers
     pagination_class = None
+    cache_control = {"private": True, "max_age": 300}
     filter_backends = [
         DjangoFilterBackend,
         filters.OrderingFilter,
@@ -70,9 +75,10 @@ class MemberFunctionsViewSet(viewsets.ModelViewSet):
     search_fields = ["function_name"]
 
 
-class MemberViewSet(viewsets.ModelViewSet):
+class MemberViewSet(ConditionalGetMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Member.objects.all()
     serializer_class = MemberSerializer
+    replica_actions = {"list", "get_total_member"}
     parser_classes = (MultiPartParser, FormParser)
     pagination_class = None
 
@@ -102,12 +108,12 @@ class MemberViewSet(viewsets.ModelViewSet):
     )
     @action(detail=False, methods=["get"], url_path="total-member")
     def get_total_member(self, request):
-        members = Member.objects.all()
-
-        return Response({"total": members.count()}, status=status.HTTP_200_OK)
+        return Response(
+            {"total": get_statistic("total_member")}, status=status.HTTP_200_OK
+        )
 
 
-class MemberMeView(APIView):
+class MemberMeView(AsyncAPIView):
     @swagger_auto_schema(
         operation_description="Rota para buscar membro logado.",
         responses={
@@ -116,9 +122,14 @@ class MemberMeView(APIView):
             )
         },
     )
-    def get(self, request, *args, **kwargs):
+    async def get(self, request, *args, **kwargs):
         try:
-            member = Member.objects.get(user=request.user)
+            member_id = await sync_to_async(auth_cache.get_member_id)(request.user)
+            member = await Member.objects.prefetch_related("function").aget(
+                pk=member_id
+            )
+            # O usuário autenticado já está carregado
+            member.user = request.user
             serializer = MemberMeSerializer(member, context={"request": request})
             return Response(serializer.data)
         except Member.DoesNotExist:
@@ -128,7 +139,7 @@ class MemberMeView(APIView):
 
 
 class MemberMeListView(ListAPIView):
-    queryset = Member.objects.all()
+    queryset = Member.objects.select_related("user").prefetch_related("function")
     serializer_class = MemberMeSerializer
     pagination_class = None
     filter_backends = [
@@ -369,15 +380,18 @@ class RequestPasswordResetView(APIView):
                     "link_expired": "Este convite expira em 1 hora.",
                 }
 
-                html_content = render_to_string("emails/invitation_email.html", context)
-                send_email = EmailMultiAlternatives(
-                    subject=context["subject"],
-                    body=f"Seu e-mail não suporta HTML. Clique no link para redefinir sua senha: {link}",
+                # Entregue em segundo plano pela fila de jobs
+                queue_mail(
+                    template="emails/invitation_email.html",
+                    subject=context.pop("subject"),
+                    text_body=(
+                        "Seu e-mail não suporta HTML. Clique no link para redefinir "
+                        "sua senha: {link}"
+                    ),
                     from_email=from_email,
-                    to=[email],
+                    recipients=[(email, {"link": context.pop("link")})],
+                    context=context,
                 )
-                send_email.attach_alternative(html_content, "text/html")
-                send_email.send()
 
             except Exception as e:
                 return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -525,11 +539,19 @@ class RegisterUserView(APIView):
 class SendRegistrationEmailView(APIView):
     @swagger_auto_schema(
         operation_summary="Enviar convites por e-mail",
-        operation_description="Recebe uma lista de e-mails e envia convites personalizados com um link de registro.",
+        operation_description=(
+            "Recebe uma lista de e-mails e enfileira convites personalizados com um "
+            "link de registro. O resultado do job traz os e-mails enviados (sent) e "
+            "os que falharam (failed)."
+        ),
         request_body=SendEmailSerializer,
         responses={
-            200: openapi.Response(
-                schema=SendEmailResponseSerializer, description="E-mails enviado"
+            202: openapi.Response(
+                schema=JobAcceptedSerializer,
+                description=(
+                    "Envio enfileirado. O resultado fica disponível em "
+                    "/api/praise/jobs/<id>/result/."
+                ),
             )
         },
     )
@@ -544,47 +566,39 @@ class SendRegistrationEmailView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        success = []
-        failed = []
-
+        recipients = []
         for email in serializer.validated_data["emails"]:
-            try:
-                # Gerar um token provisório com expiração
-                temporary_access_token = AccessToken()
-                temporary_access_token.set_exp(
-                    lifetime=timedelta(days=1)
-                )  # Token válido por 1 dias
-                temporary_access_token["email"] = email
-                temporary_access_token["purpose"] = "registration"
-
-                token = generate_email_token(email)
-                link = f"{settings.FRONTEND_URL}/register?token={token}&temporary_token={temporary_access_token}"
-
-                context = {
-                    "subject": "Você foi convidado para participar do nosso site!",
-                    "message": """
+            # Gerar um token provisório com expiração
+            temporary_access_token = AccessToken()
+            temporary_access_token.set_exp(
+                lifetime=timedelta(days=1)
+            )  # Token válido por 1 dias
+            temporary_access_token["email"] = email
+            temporary_access_token["purpose"] = "registration"
+
+            token = generate_email_token(email)
+            link = f"{settings.FRONTEND_URL}/register?token={token}&temporary_token={temporary_access_token}"
+            recipients.append((email, {"link": link}))
+
+        # Os convites são enviados em segundo plano, com uma única conexão SMTP;
+        # o resultado do job traz {"sent": [...], "failed": [...]}
+        job = queue_mail(
+            template="emails/invitation_email.html",
+            subject="Você foi convidado para participar do nosso site!",
+            text_body="Seu e-mail não suporta HTML. Clique no link: {link}",
+            from_email=from_email,
+            recipients=recipients,
+            context={
+                "message": """
                     Olá,
 
                     Você foi convidado para participar do nosso site! Clique no botão abaixo para aceitar o convite.
                     """,
-                    "link": link,
-                    "link_expired": "Este convite expira em 7 dias.",
-                }
-
-                html_content = render_to_string("emails/invitation_email.html", context)
-                send_email = EmailMultiAlternatives(
-                    subject=context["subject"],
-                    body=f"Seu e-mail não suporta HTML. Clique no link: {link}",
-                    from_email=from_email,
-                    to=[email],
-                )
-                send_email.attach_alternative(html_content, "text/html")
-                send_email.send()
-                success.append(email)
-            except Exception as e:
-                failed.append({"email": email, "detail": str(e)})
-
-        return Response({"sent": success, "failed": failed}, status=status.HTTP_200_OK)
+                "link_expired": "Este convite expira em 7 dias.",
+            },
+            user=request.user,
+        )
+        return accepted_response(job)
 
 
 class VerifyRegistrationTokenView(APIView):
@@ -625,10 +639,39 @@ class VerifyRegistrationTokenView(APIView):
             )
 
 
-class MostEscalatedMembers(APIView):
+class MostEscalatedMembers(ReplicaReadMixin, APIView):
 
     @swagger_auto_schema(
-        operation_description="Retorna os 10 membros mais escalados no último ano.",
+        operation_description=(
+            "Retorna os membros mais escalados na janela informada (padrão: 10 "
+            "membros nos últimos 12 meses), em ordem de ranking."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "months",
+                openapi.IN_QUERY,
+                description="Janela em meses até hoje (1 a 60)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "limit",
+                openapi.IN_QUERY,
+                description="Quantidade de membros do ranking (1 a 50)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "breakdown",
+                openapi.IN_QUERY,
+                description=(
+                    "Use function para detalhar quantas vezes cada membro serviu em "
+                    "cada função"
+                ),
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+        ],
         responses={
             200: openapi.Response(
                 description="Lista de membros mais escalados",
@@ -640,10 +683,25 @@ class MostEscalatedMembers(APIView):
                             items=openapi.Schema(
                                 type=openapi.TYPE_OBJECT,
                                 properties={
+                                    "id": openapi.Schema(type=openapi.TYPE_INTEGER),
                                     "name": openapi.Schema(type=openapi.TYPE_STRING),
                                     "total-member": openapi.Schema(
                                         type=openapi.TYPE_INTEGER
                                     ),
+                                    "functions": openapi.Schema(
+                                        type=openapi.TYPE_ARRAY,
+                                        items=openapi.Schema(
+                                            type=openapi.TYPE_OBJECT,
+                                            properties={
+                                                "function": openapi.Schema(
+                                                    type=openapi.TYPE_STRING
+                                                ),
+                                                "total": openapi.Schema(
+                                                    type=openapi.TYPE_INTEGER
+                                                ),
+                                            },
+                                        ),
+                                    ),
                                 },
                             ),
                         )
@@ -653,38 +711,11 @@ class MostEscalatedMembers(APIView):
         },
     )
     def get(self, request):
-        date_now = timezone.now()
-        date_last_year = date_now - relativedelta(years=1)
-
-        lineup = PraiseLineup.objects.filter(
-            lineup_date__range=(date_last_year, date_now)
-        )
-
-        lineup_ids = lineup.values("id")
-        lineup_member = LineupMember.objects.filter(lineup__in=lineup_ids)
-
-        top_members = (
-            lineup_member.values("member")
-            .annotate(total=Count("member"))
-            .order_by("-total")[:10]
+        months, limit = parse_ranking_params(
+            request.query_params, rankings.DEFAULT_WINDOW_MONTHS
         )
-
-        member_ids = [item["member"] for item in top_members]
-        members = Member.objects.filter(id__in=member_ids)
-
+        breakdowns = parse_breakdowns(request.query_params, rankings.BREAKDOWNS)
         return Response(
-            {
-                "top_members": [
-                    {
-                        "name": member.name,
-                        "total-member": next(
-                            item["total"]
-                            for item in top_members
-                            if item["member"] == member.id
-                        ),
-                    }
-                    for member in members
-                ]
-            },
+            rankings.most_escalated(months, limit, breakdowns),
             status=status.HTTP_200_OK,
         )
@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from .models import Statistic
+
+
+@admin.register(Statistic)
+class StatisticAdmin(admin.ModelAdmin):
+    list_display = ("key", "value", "updated_at")
+    readonly_fields = ("updated_at",)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.dashboard import stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula do zero os totais do dashboard. "
+        "Execute periodicamente para corrigir divergências dos contadores."
+    )
+
+    def handle(self, *args, **options):
+        stats.rebuild()
+        for key, value in stats.get_counters().items():
+            self.stdout.write(f"{key}: {value}")
+        self.stdout.write(self.style.SUCCESS("Estatísticas do dashboard recalculadas."))
@@ -0,0 +1,24 @@
+# Generated by Django 4.2 on 2026-10-18 10:13
+
+from django.db import migrations
+
+
+def delete_ranking_rows(apps, schema_editor):
+    # Os rankings passam a vir do cache dos endpoints de ranking
+    Statistic = apps.get_model("dashboard", "Statistic")
+    Statistic.objects.filter(key__in=["top_musics", "top_members"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dashboard", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_ranking_rows, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="statistic",
+            name="data",
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class Statistic(models.Model):
+    """
+    Contador materializado do dashboard, mantido pelos signals.
+
+    Os rankings não ficam aqui: vêm do cache dos endpoints de ranking.
+    """
+
+    key = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["key"]
+
+    def __str__(self):
+        return self.key
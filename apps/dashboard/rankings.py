@@ -0,0 +1,84 @@
+import uuid
+
+from dateutil.relativedelta import relativedelta
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from setup import replica
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+MAX_WINDOW_MONTHS = 60
+
+# Rankings guardados por no máximo um dia (a janela de datas anda diariamente)
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def window_range(months):
+    """
+    Intervalo de datas dos últimos `months` meses até hoje.
+    """
+    today = timezone.localdate()
+    return today - relativedelta(months=months), today
+
+
+def _positive_int(query_params, name, default, maximum):
+    try:
+        value = int(query_params.get(name, default))
+    except (TypeError, ValueError):
+        raise ValidationError({name: "Valor inválido."})
+    return max(1, min(value, maximum))
+
+
+def parse_ranking_params(query_params, default_months):
+    """
+    Lê os parâmetros `months` (janela) e `limit` de um endpoint de ranking.
+    """
+    months = _positive_int(query_params, "months", default_months, MAX_WINDOW_MONTHS)
+    limit = _positive_int(query_params, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+    return months, limit
+
+
+def parse_breakdowns(query_params, allowed):
+    """
+    Lê `breakdown` (valores separados por vírgula) validando contra `allowed`.
+    """
+    breakdowns = [
+        value.strip()
+        for value in query_params.get("breakdown", "").split(",")
+        if value.strip()
+    ]
+    invalid = [value for value in breakdowns if value not in allowed]
+    if invalid:
+        raise ValidationError(
+            {"breakdown": f"Valores aceitos: {', '.join(sorted(allowed))}."}
+        )
+    return tuple(sorted(set(breakdowns)))
+
+
+def _version_key(namespace):
+    return f"ranking:{namespace}:version"
+
+
+def invalidate(namespace):
+    cache.set(_version_key(namespace), uuid.uuid4().hex, None)
+
+
+def cached_ranking(namespace, compute, *args):
+    """
+    Retorna `compute(*args)` a partir do cache, por janela/limite e por dia.
+
+    O resultado é descartado quando `invalidate(namespace)` é chamado.
+    """
+    version = cache.get_or_set(_version_key(namespace), uuid.uuid4().hex, None)
+    params = ":".join(
+        ",".join(arg) if isinstance(arg, tuple) else str(arg) for arg in args
+    )
+    key = f"ranking:{namespace}:{version}:{timezone.localdate()}:{params}"
+
+    result = cache.get(key)
+    if result is None:
+        result = compute(*args)
+        cache.set(key, result, replica.cache_timeout(CACHE_TIMEOUT))
+    return result
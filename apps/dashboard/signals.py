@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.models import Member
+from apps.lineup.models import PraiseLineup
+from apps.music.models import Music
+from apps.playlist.models import Playlist
+
+from . import stats
+
+COUNTER_KEYS = {model: key for key, model in stats.COUNTERS.items()}
+
+
+@receiver(post_save, sender=Music)
+@receiver(post_save, sender=PraiseLineup)
+@receiver(post_save, sender=Playlist)
+@receiver(post_save, sender=Member)
+def count_created(sender, created, **kwargs):
+    if created:
+        stats.increment(COUNTER_KEYS[sender])
+
+
+@receiver(post_delete, sender=Music)
+@receiver(post_delete, sender=PraiseLineup)
+@receiver(post_delete, sender=Playlist)
+@receiver(post_delete, sender=Member)
+def count_deleted(sender, **kwargs):
+    stats.increment(COUNTER_KEYS[sender], -1)
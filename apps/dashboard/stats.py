@@ -0,0 +1,157 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import connection, connections
+from django.db.models import F
+
+from apps.accounts.models import Member
+from apps.accounts.rankings import most_escalated
+from apps.lineup.models import PraiseLineup
+from apps.music.models import Music
+from apps.music.rankings import most_played
+from apps.playlist.models import Playlist
+from setup import replica
+
+from .models import Statistic
+
+CACHE_KEY = "dashboard:statistics"
+CACHE_TIMEOUT = 60 * 60
+
+# Contadores mantidos de forma incremental: chave -> model contado
+COUNTERS = {
+    "total_music": Music,
+    "total_scales": PraiseLineup,
+    "total_playlist": Playlist,
+    "total_member": Member,
+}
+
+
+def top_musics():
+    """
+    As 10 músicas mais tocadas nas escalas dos últimos 6 meses.
+    """
+    return most_played()["top_musics"]
+
+
+def top_members():
+    """
+    Os 10 membros mais escalados no último ano.
+    """
+    return most_escalated()["top_members"]
+
+
+# Rankings lidos do mesmo cache versionado dos endpoints de ranking
+# (invalidado pelos signals de música e de escalas): chave -> função
+RANKINGS = {
+    "top_musics": top_musics,
+    "top_members": top_members,
+}
+
+
+def invalidate_cache():
+    cache.delete(CACHE_KEY)
+
+
+def rebuild(keys=None):
+    """
+    Recalcula do zero os contadores informados (todos por padrão), corrigindo
+    qualquer divergência dos contadores incrementais.
+    """
+    keys = list(COUNTERS) if keys is None else keys
+    for key in keys:
+        Statistic.objects.update_or_create(key=key, defaults=_compute(key))
+    invalidate_cache()
+
+
+def _compute(key):
+    if key in COUNTERS:
+        # O resultado é gravado na tabela resumo: nunca a partir da réplica
+        with replica.primary():
+            return {"value": COUNTERS[key].objects.count()}
+    return RANKINGS[key]()
+
+
+def _compute_in_own_thread(key):
+    # Roda fora da thread da requisição: fecha a conexão aberta aqui
+    try:
+        return _compute(key)
+    finally:
+        connections.close_all()
+
+
+def increment(key, delta=1):
+    updated = Statistic.objects.filter(key=key).update(value=F("value") + delta)
+    if not updated:
+        # Primeiro uso do contador: parte da contagem real
+        rebuild([key])
+    invalidate_cache()
+
+
+def _stale_keys(counters):
+    return [key for key in COUNTERS if key not in counters]
+
+
+def get_counters():
+    """
+    Retorna os contadores do dashboard, lendo do cache ou da tabela resumo.
+    """
+    counters = cache.get(CACHE_KEY)
+    if counters is not None:
+        return counters
+
+    counters = dict(Statistic.objects.values_list("key", "value"))
+    stale = _stale_keys(counters)
+    if stale:
+        rebuild(stale)
+        counters = dict(Statistic.objects.values_list("key", "value"))
+
+    counters = {key: counters[key] for key in COUNTERS}
+    cache.set(CACHE_KEY, counters, replica.cache_timeout(CACHE_TIMEOUT))
+    return counters
+
+
+def get_statistics():
+    """
+    Retorna todos os agregados do dashboard: contadores e rankings.
+    """
+    return {**get_counters(), **{key: ranking() for key, ranking in RANKINGS.items()}}
+
+
+async def aget_statistics():
+    """
+    Versão assíncrona de get_statistics, usada pelo DashboardView.
+
+    Os contadores ausentes e os rankings são independentes: cada um é obtido
+    em uma thread com conexão própria e todos são aguardados juntos
+    (asyncio.gather). Dentro de uma transação eles precisam da conexão da
+    requisição e rodam em sequência.
+    """
+    counters = await cache.aget(CACHE_KEY)
+    cached = counters is not None
+    stale = []
+    if not cached:
+        counters = {
+            key: value
+            async for key, value in Statistic.objects.values_list("key", "value")
+        }
+        stale = _stale_keys(counters)
+
+    if await sync_to_async(lambda: connection.in_atomic_block)():
+        compute = sync_to_async(_compute)
+    else:
+        compute = sync_to_async(_compute_in_own_thread, thread_sensitive=False)
+    keys = stale + list(RANKINGS)
+    computed = dict(zip(keys, await asyncio.gather(*(compute(key) for key in keys))))
+
+    if not cached:
+        for key in stale:
+            await Statistic.objects.aupdate_or_create(key=key, defaults=computed[key])
+            counters[key] = computed[key]["value"]
+        counters = {key: counters[key] for key in COUNTERS}
+        await cache.aset(CACHE_KEY, counters, replica.cache_timeout(CACHE_TIMEOUT))
+    return {**counters, **{key: computed[key] for key in RANKINGS}}
+
+
+def get_statistic(key):
+    return get_counters()[key]
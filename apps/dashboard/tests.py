@@ -0,0 +1,122 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Member
+from apps.lineup.models import LineupMember, PraiseLineup
+from apps.music.models import Music, MusicCategory
+from apps.playlist.models import Playlist
+
+from . import stats
+from .models import Statistic
+
+
+class DashboardStatisticsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="louvor")
+        self.client.force_authenticate(self.user)
+        self.member = Member.objects.create(name="Ana", user=self.user)
+
+        self.playlist = Playlist.objects.create(playlist_name="Culto")
+        for title in ["Santo", "Digno"]:
+            self.playlist.music.add(
+                Music.objects.create(
+                    music_title=title, author="Autor", music_tone="G", music_text="G"
+                )
+            )
+        self.lineup = PraiseLineup.objects.create(
+            lineup_event="Culto", playlist=self.playlist
+        )
+        LineupMember.objects.create(lineup=self.lineup, member=self.member)
+
+    def test_dashboard_returns_all_aggregates(self):
+        data = self.client.get("/api/praise/dashboard/").json()
+        self.assertEqual(data["total_music"], 2)
+        self.assertEqual(data["total_scales"], 1)
+        self.assertEqual(data["total_playlist"], 1)
+        self.assertEqual(data["total_member"], 1)
+        self.assertEqual(
+            [item["music"] for item in data["top_musics"]], ["Digno", "Santo"]
+        )
+        self.assertEqual(
+            data["top_members"],
+            [{"id": self.member.id, "name": "Ana", "total-member": 1}],
+        )
+
+        # Leituras seguintes saem do cache
+        with self.assertNumQueries(0):
+            self.client.get("/api/praise/dashboard/")
+
+    def test_counters_and_rankings_follow_writes(self):
+        stats.get_statistics()
+        Music.objects.get(music_title="Santo").delete()
+        self.playlist.music.add(
+            Music.objects.create(
+                music_title="Aleluia", author="Autor", music_tone="A", music_text="A"
+            )
+        )
+
+        statistics = stats.get_statistics()
+        self.assertEqual(statistics["total_music"], 2)
+        self.assertEqual(
+            [item["music"] for item in statistics["top_musics"]], ["Aleluia", "Digno"]
+        )
+        self.assertEqual(
+            self.client.get("/api/praise/music/total-music/").json(), {"total": 2}
+        )
+
+    def test_rankings_share_the_ranking_endpoints_cache(self):
+        self.client.get("/api/praise/dashboard/")
+        with mock.patch("apps.music.rankings.compute_most_played") as compute:
+            response = self.client.get("/api/praise/music/most-played")
+        compute.assert_not_called()
+        self.assertEqual(len(response.json()["top_musics"]), 2)
+        self.assertFalse(Statistic.objects.filter(key="top_musics").exists())
+
+    def test_unrelated_writes_do_not_touch_statistics(self):
+        with self.assertNumQueries(1):
+            MusicCategory.objects.create(category_name="Adoração")
+
+    def test_rebuild_corrects_drift(self):
+        Statistic.objects.filter(key="total_playlist").update(value=42)
+        stats.invalidate_cache()
+        self.assertEqual(stats.get_statistic("total_playlist"), 42)
+
+        stats.rebuild()
+        self.assertEqual(stats.get_statistic("total_playlist"), 1)
+
+
+class AsyncDashboardTestCase(TransactionTestCase):
+    def test_stale_aggregates_are_computed_concurrently(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username="louvor"))
+        Music.objects.create(
+            music_title="Santo", author="Autor", music_tone="G", music_text="G"
+        )
+        Statistic.objects.all().delete()
+        cache.clear()
+
+        threads = set()
+        compute = stats._compute
+
+        def record_thread(key):
+            threads.add(threading.get_ident())
+            return compute(key)
+
+        # Fora de transação a leitura iria para a réplica, se configurada
+        with (
+            mock.patch.object(stats, "_compute", record_thread),
+            mock.patch("setup.replica.replica_configured", return_value=False),
+        ):
+            data = client.get("/api/praise/dashboard/").json()
+
+        self.assertEqual(data["total_music"], 1)
+        self.assertEqual(data["total_member"], 0)
+        self.assertEqual(Statistic.objects.count(), 4)
+        # Cada agregado em uma thread fora da thread da requisição
+        self.assertNotIn(threading.get_ident(), threads)
@@ -0,0 +1,57 @@
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.response import Response
+
+from setup.async_views import AsyncAPIView
+from setup.replica import ReplicaReadMixin
+
+from .stats import aget_statistics
+
+
+class DashboardView(ReplicaReadMixin, AsyncAPIView):
+    @swagger_auto_schema(
+        operation_description=(
+            "Retorna em uma única resposta os totais e os rankings exibidos no "
+            "dashboard."
+        ),
+        responses={
+            200: openapi.Response(
+                description="Estatísticas do dashboard",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "total_music": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "total_scales": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "total_playlist": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "total_member": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "top_musics": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    "music": openapi.Schema(type=openapi.TYPE_STRING),
+                                    "author": openapi.Schema(type=openapi.TYPE_STRING),
+                                    "total": openapi.Schema(type=openapi.TYPE_INTEGER),
+                                },
+                            ),
+                        ),
+                        "top_members": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    "name": openapi.Schema(type=openapi.TYPE_STRING),
+                                    "total-member": openapi.Schema(
+                                        type=openapi.TYPE_INTEGER
+                                    ),
+                                },
+                            ),
+                        ),
+                    },
+                ),
+            )
+        },
+    )
+    async def get(self, request):
+        return Response(await aget_statistics(), status=status.HTTP_200_OK)
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "task", "status", "attempts", "created_at", "finished_at")
+    list_filter = ("task", "status")
+    readonly_fields = ("created_at", "updated_at", "started_at", "finished_at")
@@ -0,0 +1,79 @@
+import logging
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_setting
+
+logger = logging.getLogger(__name__)
+
+
+def next_due_job():
+    """
+    Retorna o id do próximo Job pendente cujo horário de execução já chegou.
+    """
+    return (
+        Job.objects.filter(status=Job.PENDING, available_at__lte=timezone.now())
+        .order_by("available_at")
+        .values_list("pk", flat=True)
+        .first()
+    )
+
+
+class DatabaseBroker:
+    """
+    Usa a própria tabela de Jobs como fila (sem serviços externos).
+    """
+
+    def push(self, job_id):
+        # O registro do Job já é a mensagem
+        pass
+
+    def pop(self, timeout):
+        job_id = next_due_job()
+        if job_id is None and timeout:
+            time.sleep(timeout)
+        return job_id
+
+
+class RedisBroker(DatabaseBroker):
+    """
+    Usa o Redis configurado em CACHES como fila; a tabela de Jobs continua sendo
+    a fonte da verdade e cobre retentativas e mensagens perdidas.
+    """
+
+    key = "jobs:queue"
+
+    def __init__(self):
+        from django_redis import get_redis_connection
+
+        self.connection = get_redis_connection("default")
+
+    def push(self, job_id):
+        try:
+            self.connection.lpush(self.key, str(job_id))
+        except Exception as e:
+            # O worker encontra o Job pela varredura do banco
+            logger.warning(f"Falha ao publicar o job {job_id} no Redis: {e}")
+
+    def pop(self, timeout):
+        job_id = next_due_job()
+        if job_id is not None:
+            return job_id
+
+        if timeout:
+            item = self.connection.brpop(self.key, timeout=timeout)
+            item = item[1] if item else None
+        else:
+            item = self.connection.rpop(self.key)
+        return item.decode() if item else None
+
+
+def get_broker():
+    # Sem cache Redis configurado, a própria tabela de Jobs faz o papel de fila
+    redis_cache = "django_redis" in settings.CACHES["default"]["BACKEND"]
+    if get_setting("BROKER") == "database" or not redis_cache:
+        return DatabaseBroker()
+    return RedisBroker()
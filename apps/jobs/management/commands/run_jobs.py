@@ -0,0 +1,31 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = "Inicia o worker que executa os jobs da fila (importação de PDF, slides...)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Processa os jobs pendentes e encerra quando a fila esvaziar.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=int,
+            default=None,
+            help="Segundos de espera por novos jobs a cada ciclo.",
+        )
+
+    def handle(self, *args, **options):
+        worker = Worker(poll_interval=options["poll_interval"])
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+
+        self.stdout.write("Worker de jobs iniciado.")
+        processed = worker.run(burst=options["burst"])
+        self.stdout.write(self.style.SUCCESS(f"{processed} job(s) processado(s)."))
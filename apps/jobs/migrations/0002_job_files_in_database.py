@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-18 10:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="job",
+            name="result_file",
+        ),
+        migrations.RemoveField(
+            model_name="job",
+            name="source",
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="result_data",
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="result_name",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="source_data",
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="source_name",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
@@ -0,0 +1,60 @@
+import uuid
+
+from django.contrib.auth.models import User
+from django.db import models
+
+from apps.accounts.models import TimeStampedModel
+
+
+def job_upload_to(instance, filename):
+    # Referenciado pela migração inicial (source e result_file eram FileFields)
+    return f"jobs/{instance.pk}/{filename}"
+
+
+class Job(TimeStampedModel):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCESS = "success"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Pendente"),
+        (RUNNING, "Executando"),
+        (SUCCESS, "Concluído"),
+        (FAILED, "Falhou"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    task = models.CharField(max_length=100)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    payload = models.JSONField(default=dict, blank=True)
+    # Arquivos ficam no banco: web e worker podem não compartilhar disco
+    source_name = models.CharField(max_length=255, blank=True)
+    source_data = models.BinaryField(null=True, blank=True)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=1)
+    timeout = models.PositiveIntegerField(help_text="Tempo limite em segundos")
+    available_at = models.DateTimeField()
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    result = models.JSONField(null=True, blank=True)
+    result_name = models.CharField(max_length=255, blank=True)
+    result_data = models.BinaryField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "available_at"]),
+            models.Index(fields=["expires_at"]),
+        ]
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.task} | {self.get_status_display()}"
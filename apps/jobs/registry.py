@@ -0,0 +1,104 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job
+
+DEFAULTS = {
+    "BROKER": "redis",
+    "EAGER": False,
+    "POLL_INTERVAL": 5,
+    "RESULT_TTL": timedelta(hours=6),
+    "RETRY_DELAY": timedelta(seconds=10),
+}
+
+_tasks = {}
+
+
+class PermanentError(Exception):
+    """
+    Falha que uma nova tentativa não resolve (ex.: arquivo inválido); o Job
+    termina como FAILED sem esgotar max_attempts.
+    """
+
+
+def get_setting(name):
+    return getattr(settings, "JOBS", {}).get(name, DEFAULTS[name])
+
+
+class Task:
+    def __init__(self, name, func, timeout, max_attempts):
+        self.name = name
+        self.func = func
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+
+    def __call__(self, job):
+        return self.func(job)
+
+
+def task(name, timeout=60, max_attempts=3):
+    """
+    Registra uma função como tarefa da fila.
+
+    A função recebe o Job e retorna um dicionário (salvo em Job.result) ou um
+    File do Django (salvo em Job.result_data e servido pelo endpoint de resultado).
+    """
+
+    def decorator(func):
+        _tasks[name] = Task(name, func, timeout, max_attempts)
+        return _tasks[name]
+
+    return decorator
+
+
+def get_task(name):
+    return _tasks[name]
+
+
+@contextmanager
+def source_path(job):
+    """
+    Grava o arquivo de origem do Job em um arquivo temporário do worker e
+    retorna o caminho, para bibliotecas que leem do disco.
+    """
+    suffix = os.path.splitext(job.source_name)[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
+        tmp.write(job.source_data)
+        tmp.flush()
+        yield tmp.name
+
+
+def enqueue(name, payload=None, source=None, user=None):
+    """
+    Cria um Job para a tarefa e o publica no broker configurado.
+    """
+    from .brokers import get_broker
+    from .worker import run_job
+
+    registered = get_task(name)
+    job = Job(
+        task=name,
+        payload=payload or {},
+        timeout=registered.timeout,
+        max_attempts=registered.max_attempts,
+        available_at=timezone.now(),
+        created_by=user if user and user.is_authenticated else None,
+    )
+    if source is not None:
+        job.source_name = os.path.basename(source.name)
+        job.source_data = b"".join(source.chunks())
+    job.save()
+
+    if get_setting("EAGER"):
+        # Execução imediata, útil em desenvolvimento e nos testes
+        run_job(job.pk)
+        job.refresh_from_db()
+    else:
+        get_broker().push(job.pk)
+
+    return job
@@ -0,0 +1,35 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializers(serializers.ModelSerializer):
+    result_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "task",
+            "status",
+            "attempts",
+            "max_attempts",
+            "error",
+            "result_url",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "expires_at",
+        ]
+
+    def get_result_url(self, obj):
+        if obj.status != Job.SUCCESS:
+            return None
+        return reverse("job_result", kwargs={"pk": obj.pk})
+
+
+class JobAcceptedSerializer(serializers.Serializer):
+    job_id = serializers.UUIDField(help_text="Identificador do job criado.")
+    status = serializers.CharField(help_text="Situação atual do job.")
+    status_url = serializers.CharField(help_text="Rota para acompanhar o job.")
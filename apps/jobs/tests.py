@@ -0,0 +1,135 @@
+from datetime import timedelta
+
+import fitz
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.music.models import MusicChord
+
+from .brokers import DatabaseBroker
+from .models import Job
+from .registry import PermanentError, enqueue, task
+from .worker import Worker
+
+JOBS_SETTINGS = {
+    "BROKER": "database",
+    "EAGER": False,
+    "RETRY_DELAY": timedelta(0),
+}
+
+attempts = []
+
+
+@task("tests.flaky", max_attempts=2)
+def flaky_task(job):
+    attempts.append(job.attempts)
+    if job.attempts == 1:
+        raise RuntimeError("falha temporária")
+    return {"ok": True}
+
+
+@task("tests.invalid_input", max_attempts=3)
+def invalid_input_task(job):
+    attempts.append(job.attempts)
+    raise PermanentError("entrada inválida")
+
+
+@override_settings(JOBS=JOBS_SETTINGS)
+class JobQueueTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="louvor", password="senha")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def run_worker(self):
+        return Worker(broker=DatabaseBroker(), poll_interval=1).run(burst=True)
+
+    def test_upload_pdf_returns_job_and_worker_stores_result(self):
+        document = fitz.open()
+        document.new_page().insert_text((72, 72), "G D/F# Em\nSenhor")
+        content = document.tobytes()
+        upload = SimpleUploadedFile(
+            "cifra.pdf", content, content_type="application/pdf"
+        )
+
+        response = self.client.post(
+            "/api/praise/music/upload-pdf/", {"file": upload}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data["job_id"]
+
+        pending = self.client.get(f"/api/praise/jobs/{job_id}/result/")
+        self.assertEqual(pending.status_code, 409)
+
+        # O arquivo enviado fica no banco até o worker terminar
+        job = Job.objects.get(pk=job_id)
+        self.assertEqual(job.source_name, "cifra.pdf")
+        self.assertEqual(bytes(job.source_data), content)
+
+        self.assertEqual(self.run_worker(), 1)
+        job.refresh_from_db()
+        self.assertIsNone(job.source_data)
+
+        result = self.client.get(f"/api/praise/jobs/{job_id}/result/")
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(result.data["chords"], ["G", "D/F#", "Em"])
+        self.assertEqual(
+            result.data["music_chord_ids"],
+            list(MusicChord.objects.order_by("id").values_list("id", flat=True)),
+        )
+
+    def test_failed_job_is_retried(self):
+        attempts.clear()
+        job = enqueue("tests.flaky", user=self.user)
+
+        self.run_worker()
+        job.refresh_from_db()
+
+        self.assertEqual(attempts, [1, 2])
+        self.assertEqual(job.status, Job.SUCCESS)
+        self.assertEqual(job.result, {"ok": True})
+
+    def test_permanent_error_is_not_retried(self):
+        attempts.clear()
+        job = enqueue("tests.invalid_input", user=self.user)
+
+        self.run_worker()
+        job.refresh_from_db()
+
+        self.assertEqual(attempts, [1])
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn("entrada inválida", job.error)
+
+    def test_upload_pdf_rejects_invalid_file_before_enqueueing(self):
+        upload = SimpleUploadedFile(
+            "cifra.pdf", b"texto qualquer", content_type="application/pdf"
+        )
+
+        response = self.client.post(
+            "/api/praise/music/upload-pdf/", {"file": upload}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Erro ao processar PDF", response.data["detail"])
+        self.assertFalse(Job.objects.exists())
+
+    def test_corrupt_pdf_job_fails_without_retry(self):
+        job = enqueue(
+            "music.import_pdf",
+            source=SimpleUploadedFile("cifra.pdf", b"%PDF-1.4 corrompido"),
+            user=self.user,
+        )
+
+        self.run_worker()
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn("Erro ao processar PDF", job.error)
+
+        result = self.client.get(f"/api/praise/jobs/{job.pk}/result/")
+        self.assertEqual(result.status_code, 422)
+        self.assertEqual(result.data["status"], Job.FAILED)
+        self.assertIn("Erro ao processar PDF", result.data["error"])
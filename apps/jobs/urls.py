@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .views import JobResultView, JobStatusView
+
+urlpatterns = [
+    path("jobs/<uuid:pk>/", JobStatusView.as_view(), name="job_status"),
+    path("jobs/<uuid:pk>/result/", JobResultView.as_view(), name="job_result"),
+]
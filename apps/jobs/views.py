@@ -0,0 +1,88 @@
+import io
+
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Job
+from .serializers import JobSerializers
+
+
+def accepted_response(job):
+    """
+    Resposta 202 padrão para endpoints que enfileiram um Job.
+    """
+    return Response(
+        {
+            "job_id": job.pk,
+            "status": job.status,
+            "status_url": reverse("job_status", kwargs={"pk": job.pk}),
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+def get_user_job(request, pk, *deferred):
+    # O arquivo de origem só interessa ao worker
+    jobs = Job.objects.defer("source_data", *deferred)
+    if not request.user.is_staff:
+        jobs = jobs.filter(created_by=request.user)
+    return get_object_or_404(jobs, pk=pk)
+
+
+class JobStatusView(APIView):
+    @swagger_auto_schema(
+        operation_description="Retorna a situação de um job enfileirado.",
+        responses={200: openapi.Response(description="Job", schema=JobSerializers)},
+    )
+    def get(self, request, pk):
+        job = get_user_job(request, pk, "result_data")
+        return Response(JobSerializers(job).data, status=status.HTTP_200_OK)
+
+
+class JobResultView(APIView):
+    @swagger_auto_schema(
+        operation_description=(
+            "Retorna o resultado de um job concluído (JSON ou arquivo)."
+        ),
+        responses={
+            200: openapi.Response(description="Resultado do job"),
+            409: openapi.Response(description="Job ainda não concluído"),
+            410: openapi.Response(description="Resultado expirado"),
+            422: openapi.Response(description="Job falhou (erro em error)"),
+        },
+    )
+    def get(self, request, pk):
+        job = get_user_job(request, pk)
+
+        if job.status == Job.FAILED:
+            return Response(
+                {"detail": "Job falhou.", "status": job.status, "error": job.error},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
+        if job.status != Job.SUCCESS:
+            return Response(
+                {"detail": "Job não concluído.", "status": job.status},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        if job.expires_at and job.expires_at < timezone.now():
+            return Response(
+                {"detail": "Resultado expirado."}, status=status.HTTP_410_GONE
+            )
+
+        if job.result_name:
+            return FileResponse(
+                io.BytesIO(job.result_data),
+                as_attachment=True,
+                filename=job.result_name,
+            )
+
+        return Response(job.result, status=status.HTTP_200_OK)
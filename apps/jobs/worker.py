@@ -0,0 +1,159 @@
+import logging
+import os
+import signal
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.core.files.base import File
+from django.db.models import F
+from django.utils import timezone
+
+from .brokers import get_broker
+from .models import Job
+from .registry import PermanentError, get_setting, get_task
+
+logger = logging.getLogger(__name__)
+
+# Margem antes de considerar perdido um Job que ficou em execução
+STALE_GRACE = timedelta(minutes=1)
+
+
+class JobTimeout(Exception):
+    pass
+
+
+@contextmanager
+def time_limit(seconds):
+    """
+    Interrompe o bloco com JobTimeout após o tempo limite.
+
+    Só é aplicado na thread principal (processo do worker), pois depende de SIGALRM.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def handler(signum, frame):
+        raise JobTimeout(f"Tempo limite de {seconds}s excedido")
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def claim(job_id):
+    """
+    Marca o Job como em execução; retorna False se outro worker chegou antes.
+    """
+    now = timezone.now()
+    return bool(
+        Job.objects.filter(pk=job_id, status=Job.PENDING, available_at__lte=now).update(
+            status=Job.RUNNING, started_at=now, attempts=F("attempts") + 1
+        )
+    )
+
+
+def finish(job, status, error=""):
+    job.status = status
+    job.error = error
+    job.finished_at = timezone.now()
+    job.expires_at = job.finished_at + get_setting("RESULT_TTL")
+    job.source_data = None
+    job.save()
+
+
+def fail(job, error, retry=True):
+    if retry and job.attempts < job.max_attempts:
+        # Nova tentativa com espera exponencial
+        delay = get_setting("RETRY_DELAY") * 2 ** (job.attempts - 1)
+        job.status = Job.PENDING
+        job.error = error
+        job.available_at = timezone.now() + delay
+        job.save()
+        logger.warning(f"Job {job.pk} falhou, nova tentativa em {delay}: {error}")
+    else:
+        finish(job, Job.FAILED, error)
+        logger.error(f"Job {job.pk} falhou definitivamente: {error}")
+
+
+def run_job(job_id):
+    """
+    Executa um Job pendente. Retorna True se o Job foi processado por este worker.
+    """
+    if not claim(job_id):
+        return False
+
+    job = Job.objects.get(pk=job_id)
+    try:
+        with time_limit(job.timeout):
+            result = get_task(job.task)(job)
+    except PermanentError:
+        fail(job, traceback.format_exc(limit=5), retry=False)
+        return True
+    except Exception:
+        fail(job, traceback.format_exc(limit=5))
+        return True
+
+    if isinstance(result, File):
+        job.result_name = os.path.basename(result.name)
+        job.result_data = b"".join(result.chunks())
+    else:
+        job.result = result
+    finish(job, Job.SUCCESS)
+    return True
+
+
+def recover_stale_jobs():
+    """
+    Devolve à fila (ou falha) Jobs cujo worker morreu durante a execução.
+    """
+    now = timezone.now()
+    for job in Job.objects.filter(status=Job.RUNNING):
+        if job.started_at + timedelta(seconds=job.timeout) + STALE_GRACE < now:
+            fail(job, "Execução interrompida (worker perdido)")
+
+
+def purge_expired_jobs():
+    """
+    Remove Jobs finalizados cujo resultado expirou.
+    """
+    return Job.objects.filter(expires_at__lt=timezone.now()).delete()[0]
+
+
+class Worker:
+    def __init__(self, broker=None, poll_interval=None):
+        self.broker = broker or get_broker()
+        self.poll_interval = poll_interval or get_setting("POLL_INTERVAL")
+        self.stopped = False
+        self.last_cleanup = 0
+
+    def stop(self, *args):
+        self.stopped = True
+
+    def run(self, burst=False):
+        """
+        Processa Jobs até ser interrompido; em modo burst, até a fila esvaziar.
+        """
+        processed = 0
+        while not self.stopped:
+            if time.monotonic() - self.last_cleanup >= self.poll_interval:
+                recover_stale_jobs()
+                purge_expired_jobs()
+                self.last_cleanup = time.monotonic()
+
+            job_id = self.broker.pop(0 if burst else self.poll_interval)
+            if job_id is None:
+                if burst:
+                    break
+                continue
+
+            if run_job(job_id):
+                processed += 1
+        return processed
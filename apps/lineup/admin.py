@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import LineupMember, PraiseLineup
+from .models import LineupMember, MemberUnavailability, PraiseLineup
 
 
 @admin.register(PraiseLineup)
@@ -19,4 +19,10 @@ class LineupMemberAdmin(admin.ModelAdmin):
         "get_member_display",
         "get_function_display",
     )
-    list_filter = ("function", "lineup__lineup_date")
+    list_filter = ("function", "lineup_date")
+
+
+@admin.register(MemberUnavailability)
+class MemberUnavailabilityAdmin(admin.ModelAdmin):
+    list_display = ("member", "start_date", "end_date", "reason")
+    list_filter = ("start_date",)
@@ -0,0 +1,12 @@
+import django_filters
+
+from .models import LineupMember
+
+
+class LineupMemberFilter(django_filters.FilterSet):
+    date_from = django_filters.DateFilter(field_name="lineup_date", lookup_expr="gte")
+    date_to = django_filters.DateFilter(field_name="lineup_date", lookup_expr="lte")
+
+    class Meta:
+        model = LineupMember
+        fields = ["lineup", "member", "function", "date_from", "date_to"]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2 on 2026-10-18 09:46
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_lineup_dates(apps, schema_editor):
+    LineupMember = apps.get_model("lineup", "LineupMember")
+    PraiseLineup = apps.get_model("lineup", "PraiseLineup")
+    LineupMember.objects.update(
+        lineup_date=Subquery(
+            PraiseLineup.objects.filter(pk=OuterRef("lineup_id")).values("lineup_date")[
+                :1
+            ]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lineup", "0007_alter_lineupmember_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="lineupmember",
+            options={"ordering": ["-lineup_date", "-id"]},
+        ),
+        migrations.AddField(
+            model_name="lineupmember",
+            name="lineup_date",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.RunPython(copy_lineup_dates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="lineupmember",
+            index=models.Index(
+                fields=["lineup", "member"], name="lineup_line_lineup__20f9bf_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lineupmember",
+            index=models.Index(
+                fields=["member", "lineup_date"], name="lineup_line_member__26b41d_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lineupmember",
+            index=models.Index(
+                fields=["lineup_date", "id"], name="lineup_line_lineup__dff204_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2 on 2026-10-18 09:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "accounts",
+            "0010_alter_member_options_alter_memberfunctions_options_and_more",
+        ),
+        ("lineup", "0008_lineupmember_lineup_date"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MemberUnavailability",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("start_date", models.DateField()),
+                ("end_date", models.DateField()),
+                ("reason", models.CharField(blank=True, max_length=150)),
+                (
+                    "member",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="unavailabilities",
+                        to="accounts.member",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["start_date"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="memberunavailability",
+            index=models.Index(
+                fields=["start_date", "end_date"], name="lineup_memb_start_d_77431b_idx"
+            ),
+        ),
+    ]
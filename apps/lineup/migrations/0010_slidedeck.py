@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-18 10:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lineup", "0009_memberunavailability"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlideDeck",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=100, unique=True)),
+                ("playlist_id", models.PositiveIntegerField(db_index=True)),
+                ("content", models.BinaryField()),
+                ("size", models.PositiveIntegerField()),
+                ("accessed_at", models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -20,6 +20,13 @@ class PraiseLineup(TimeStampedModel):
     def __str__(self):
         return f'{self.lineup_event or "Escala"} | {self.lineup_date}'
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Mantém a cópia da data nos membros escalados
+        self.members.exclude(lineup_date=self.lineup_date).update(
+            lineup_date=self.lineup_date
+        )
+
     def get_playlist_display(self):
         return self.playlist.playlist_name if self.playlist else ""
 
@@ -41,9 +48,17 @@ class LineupMember(TimeStampedModel):
     )
     function_name_snapshot = models.CharField(max_length=100, blank=True)
 
+    # Cópia de lineup.lineup_date para filtrar e ordenar sem join
+    lineup_date = models.DateField(null=True, editable=False)
+
     class Meta:
         unique_together = ("lineup", "member", "function")
-        ordering = ["-lineup__lineup_date"]
+        ordering = ["-lineup_date", "-id"]
+        indexes = [
+            models.Index(fields=["lineup", "member"]),
+            models.Index(fields=["member", "lineup_date"]),
+            models.Index(fields=["lineup_date", "id"]),
+        ]
 
     def save(self, *args, **kwargs):
         # Atualiza snapshot sempre que houver alteração
@@ -51,6 +66,7 @@ class LineupMember(TimeStampedModel):
             self.member_name_snapshot = self.member.name
         if self.function:
             self.function_name_snapshot = self.function.function_name
+        self.lineup_date = self.lineup.lineup_date
         super().save(*args, **kwargs)
 
     def get_member_display(self):
@@ -64,12 +80,53 @@ class LineupMember(TimeStampedModel):
         )
 
     def clean(self):
-        if not self.member.function.filter(pk=self.function.pk).exists():
-            raise ValidationError(
-                f"{self.member.name} não possui a função '{self.function.function_name}'"
+        from .scheduling import assignment_errors
+
+        if self.member and self.function:
+            errors = assignment_errors(
+                self.lineup, self.member, self.function, exclude_id=self.pk
             )
+            if errors:
+                raise ValidationError(errors)
 
     def __str__(self):
         return (
             f"{self.member} como {self.function} na escala de {self.lineup.lineup_date}"
         )
+
+
+class MemberUnavailability(TimeStampedModel):
+    member = models.ForeignKey(
+        Member, on_delete=models.CASCADE, related_name="unavailabilities"
+    )
+    start_date = models.DateField()
+    end_date = models.DateField()
+    reason = models.CharField(max_length=150, blank=True)
+
+    class Meta:
+        ordering = ["start_date"]
+        indexes = [models.Index(fields=["start_date", "end_date"])]
+
+    def clean(self):
+        if self.end_date < self.start_date:
+            raise ValidationError("A data final deve ser posterior à data inicial.")
+
+    def __str__(self):
+        return f"{self.member} indisponível de {self.start_date} a {self.end_date}"
+
+
+class SlideDeck(models.Model):
+    """
+    Apresentação .pptx gerada para um conteúdo de playlist (cache do
+    slide_cache). Fica no banco para que o worker que gera e o processo web que
+    serve a vejam sem compartilhar disco.
+    """
+
+    key = models.CharField(max_length=100, unique=True)
+    playlist_id = models.PositiveIntegerField(db_index=True)
+    content = models.BinaryField()
+    size = models.PositiveIntegerField()
+    accessed_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,41 @@
+from django.db.models import Prefetch
+
+from apps.playlist.content import load_playlists_musics
+
+from .models import LineupMember, PraiseLineup
+
+# Maior intervalo de datas aceito na visão geral por período
+MAX_RANGE_DAYS = 366
+
+# Campos das músicas incluídos na visão geral
+MUSIC_FIELDS = ("music_title", "author", "music_tone", "music_link")
+
+
+def load_overview(lineups):
+    """
+    Carrega as escalas com playlist, membros (com membro e função) e músicas
+    em um número fixo de consultas, independente da quantidade de escalas.
+    """
+    lineups = list(
+        lineups.select_related("playlist").prefetch_related(
+            Prefetch(
+                "members",
+                queryset=LineupMember.objects.select_related(
+                    "member", "function"
+                ).order_by("id"),
+            )
+        )
+    )
+    playlists = [lineup.playlist for lineup in lineups if lineup.playlist]
+    musics = load_playlists_musics(
+        {playlist.id for playlist in playlists}, MUSIC_FIELDS
+    )
+    for playlist in playlists:
+        playlist.overview_musics = musics.get(playlist.id, [])
+    return lineups
+
+
+def lineups_between(start, end):
+    return PraiseLineup.objects.filter(lineup_date__range=(start, end)).order_by(
+        "lineup_date", "id"
+    )
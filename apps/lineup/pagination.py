@@ -0,0 +1,10 @@
+from setup.pagination import KeysetPagination
+
+
+class LineupMemberKeysetPagination(KeysetPagination):
+    """
+    Paginação por cursor (keyset) das escalações, da mais recente para a mais
+    antiga, apoiada no índice (lineup_date, id).
+    """
+
+    ordering = ("-lineup_date", "-id")
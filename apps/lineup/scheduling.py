@@ -0,0 +1,173 @@
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, timedelta
+
+from apps.accounts.models import Member
+
+from .models import LineupMember, MemberUnavailability
+
+# Janela (em dias) usada para medir a carga recente de cada membro
+RECENT_LOAD_DAYS = 90
+
+MISSING_FUNCTION = "missing_function"
+UNAVAILABLE = "unavailable"
+DOUBLE_BOOKED = "double_booked"
+
+CONFLICT_MESSAGES = {
+    MISSING_FUNCTION: "{member} não possui a função '{function}'",
+    UNAVAILABLE: "{member} está indisponível em {date}",
+    DOUBLE_BOOKED: "{member} já está em outra escala em {date}",
+}
+
+
+class ScheduleBoard:
+    """
+    Quadro de escalas de um período, carregado em quatro consultas.
+
+    Membros, funções, escalações (desde `recent_days` antes do início) e
+    indisponibilidades são lidos de uma vez para dicionários e conjuntos; as
+    perguntas de escala ("quem pode cobrir a função X no dia D?") são
+    respondidas em memória, sem consulta por candidato.
+    """
+
+    def __init__(
+        self, start, end, recent_days=RECENT_LOAD_DAYS, members=None, exclude=()
+    ):
+        self.start, self.end = start, end
+        self.recent_days = recent_days
+
+        member_qs = Member.objects.order_by()
+        functions_qs = Member.function.through.objects.order_by()
+        assignments_qs = LineupMember.objects.filter(
+            member__isnull=False,
+            lineup_date__range=(start - timedelta(days=recent_days), end),
+        ).exclude(pk__in=[pk for pk in exclude if pk])
+        unavailable_qs = MemberUnavailability.objects.filter(
+            start_date__lte=end, end_date__gte=start
+        )
+        if members is not None:
+            member_qs = member_qs.filter(pk__in=members)
+            functions_qs = functions_qs.filter(member_id__in=members)
+            assignments_qs = assignments_qs.filter(member_id__in=members)
+            unavailable_qs = unavailable_qs.filter(member_id__in=members)
+
+        self.names = {}
+        self.inactive = set()
+        for member_id, name, availability in member_qs.values_list(
+            "id", "name", "availability"
+        ):
+            self.names[member_id] = name
+            if not availability:
+                self.inactive.add(member_id)
+
+        self.members_by_function = defaultdict(set)
+        for member_id, function_id in functions_qs.values_list(
+            "member_id", "memberfunctions_id"
+        ):
+            self.members_by_function[function_id].add(member_id)
+
+        # Dia -> membro -> escalas; e as datas servidas de cada membro, em ordem
+        self.bookings = defaultdict(lambda: defaultdict(set))
+        self.served = defaultdict(list)
+        for member_id, lineup_id, lineup_date in assignments_qs.values_list(
+            "member_id", "lineup_id", "lineup_date"
+        ).order_by("lineup_date"):
+            lineups = self.bookings[lineup_date][member_id]
+            # Duas funções na mesma escala contam como um culto servido
+            if lineup_id not in lineups:
+                lineups.add(lineup_id)
+                self.served[member_id].append(lineup_date)
+
+        self.unavailable = defaultdict(list)
+        for member_id, start_date, end_date in unavailable_qs.values_list(
+            "member_id", "start_date", "end_date"
+        ):
+            self.unavailable[member_id].append((start_date, end_date))
+
+    def is_unavailable(self, member_id, on_date):
+        return member_id in self.inactive or any(
+            start <= on_date <= end for start, end in self.unavailable[member_id]
+        )
+
+    def other_lineups(self, member_id, on_date, lineup_id=None):
+        return self.bookings[on_date][member_id] - {lineup_id}
+
+    def recent_load(self, member_id, on_date):
+        """
+        Quantidade de cultos servidos nos `recent_days` dias anteriores a `on_date`.
+        """
+        dates = self.served[member_id]
+        since = on_date - timedelta(days=self.recent_days)
+        return bisect_left(dates, on_date) - bisect_left(dates, since)
+
+    def last_served(self, member_id, on_date):
+        dates = self.served[member_id]
+        index = bisect_left(dates, on_date)
+        return dates[index - 1] if index else None
+
+    def conflicts(self, member_id, function_id, on_date, lineup_id=None):
+        """
+        Códigos dos conflitos ao escalar o membro na função e no dia informados.
+        """
+        conflicts = []
+        if member_id not in self.members_by_function[function_id]:
+            conflicts.append(MISSING_FUNCTION)
+        if self.is_unavailable(member_id, on_date):
+            conflicts.append(UNAVAILABLE)
+        if self.other_lineups(member_id, on_date, lineup_id):
+            conflicts.append(DOUBLE_BOOKED)
+        return conflicts
+
+    def candidates(self, function_id, on_date, lineup_id=None):
+        """
+        Membros livres para a função no dia, dos menos escalados recentemente
+        para os mais escalados (empate: quem serviu há mais tempo, depois o nome).
+        """
+        candidates = []
+        for member_id in self.members_by_function[function_id]:
+            if self.is_unavailable(member_id, on_date) or self.other_lineups(
+                member_id, on_date, lineup_id
+            ):
+                continue
+            candidates.append(
+                {
+                    "id": member_id,
+                    "name": self.names[member_id],
+                    "recent_load": self.recent_load(member_id, on_date),
+                    "last_served": self.last_served(member_id, on_date),
+                    # Já escalado em outra função nesta mesma escala
+                    "in_lineup": lineup_id in self.bookings[on_date][member_id],
+                }
+            )
+        candidates.sort(
+            key=lambda item: (
+                item["in_lineup"],
+                item["recent_load"],
+                item["last_served"] or date.min,
+                item["name"],
+            )
+        )
+        return candidates
+
+
+def assignment_errors(lineup, member, function, exclude_id=None):
+    """
+    Mensagens de conflito para escalar `member` em `function` na `lineup`.
+    """
+    board = ScheduleBoard(
+        lineup.lineup_date,
+        lineup.lineup_date,
+        recent_days=0,
+        members=[member.pk],
+        exclude=[exclude_id],
+    )
+    return [
+        CONFLICT_MESSAGES[code].format(
+            member=member.name,
+            function=function.function_name,
+            date=lineup.lineup_date.strftime("%d/%m/%Y"),
+        )
+        for code in board.conflicts(
+            member.pk, function.pk, lineup.lineup_date, lineup.pk
+        )
+    ]
@@ -1,6 +1,16 @@
 from rest_framework import serializers
 
+from apps.music.models import Music
+from apps.playlist.models import Playlist
+from apps.playlist.serializers import PlaylistLinksListSerializers
+
 from .models import LineupMember, PraiseLineup
+from .overview import MUSIC_FIELDS
+from .scheduling import assignment_errors
+
+
+class PraiseLineupListSerializers(PlaylistLinksListSerializers):
+    playlist_attr = "playlist"
 
 
 class PraiseLineupSerializers(serializers.ModelSerializer):
@@ -10,6 +20,7 @@ class PraiseLineupSerializers(serializers.ModelSerializer):
     class Meta:
         model = PraiseLineup
         fields = "__all__"
+        list_serializer_class = PraiseLineupListSerializers
 
     def get_playlist_display(self, obj):
         return obj.get_playlist_display()
@@ -31,3 +42,75 @@ class LineupMemberSerializers(serializers.ModelSerializer):
 
     def get_function_display(self, obj):
         return obj.get_function_display()
+
+    def validate(self, attrs):
+        def current(field):
+            if field in attrs:
+                return attrs[field]
+            return getattr(self.instance, field, None)
+
+        lineup, member, function = (
+            current("lineup"),
+            current("member"),
+            current("function"),
+        )
+        if lineup and member and function:
+            errors = assignment_errors(
+                lineup,
+                member,
+                function,
+                exclude_id=self.instance.pk if self.instance else None,
+            )
+            if errors:
+                raise serializers.ValidationError(errors)
+        return attrs
+
+
+class LineupOverviewMemberSerializers(LineupMemberSerializers):
+    class Meta:
+        model = LineupMember
+        fields = ["id", "member", "member_display", "function", "function_display"]
+
+
+class LineupOverviewMusicSerializers(serializers.ModelSerializer):
+    class Meta:
+        model = Music
+        fields = ["id", *MUSIC_FIELDS]
+
+
+class LineupOverviewPlaylistSerializers(serializers.ModelSerializer):
+    musics = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Playlist
+        fields = ["id", "playlist_name", "playlist_date", "musics"]
+
+    def get_musics(self, obj):
+        return LineupOverviewMusicSerializers(obj.overview_musics, many=True).data
+
+
+class LineupOverviewSerializers(serializers.ModelSerializer):
+    playlist = LineupOverviewPlaylistSerializers(read_only=True)
+    members = LineupOverviewMemberSerializers(many=True, read_only=True)
+
+    class Meta:
+        model = PraiseLineup
+        fields = ["id", "lineup_date", "lineup_event", "playlist", "members"]
+
+
+class ScheduleCandidateSerializers(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    recent_load = serializers.IntegerField()
+    last_served = serializers.DateField(allow_null=True)
+    in_lineup = serializers.BooleanField()
+
+
+class FunctionCandidatesSerializers(serializers.Serializer):
+    function = serializers.IntegerField()
+    candidates = ScheduleCandidateSerializers(many=True)
+
+
+class CandidatesResponseSerializers(serializers.Serializer):
+    date = serializers.DateField()
+    functions = FunctionCandidatesSerializers(many=True)
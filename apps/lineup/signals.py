@@ -0,0 +1,50 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.music.models import Music
+from apps.playlist.models import Playlist
+from setup import conditional
+
+from . import slide_cache
+from .models import LineupMember, MemberUnavailability, PraiseLineup
+
+
+def _invalidate_music_playlists(music):
+    for playlist_id in Playlist.objects.filter(music=music).values_list(
+        "id", flat=True
+    ):
+        slide_cache.invalidate_playlist(playlist_id)
+
+
+@receiver([post_save, pre_delete], sender=Music)
+def invalidate_music_decks(sender, instance, **kwargs):
+    _invalidate_music_playlists(instance)
+
+
+@receiver(post_delete, sender=Playlist)
+def invalidate_playlist_decks(sender, instance, **kwargs):
+    slide_cache.invalidate_playlist(instance.pk)
+
+
+@receiver(m2m_changed, sender=Playlist.music.through)
+def invalidate_playlist_music_decks(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not reverse:
+        if action.startswith("post_"):
+            slide_cache.invalidate_playlist(instance.pk)
+    elif action == "pre_clear":
+        # Limpeza a partir da música: as playlists afetadas só são conhecidas antes
+        _invalidate_music_playlists(instance)
+    elif action in ("post_add", "post_remove"):
+        for playlist_id in pk_set:
+            slide_cache.invalidate_playlist(playlist_id)
+
+
+@receiver([post_save, post_delete], sender=PraiseLineup)
+@receiver([post_save, post_delete], sender=LineupMember)
+@receiver([post_save, post_delete], sender=MemberUnavailability)
+@receiver([post_save, post_delete], sender=Playlist)
+@receiver(m2m_changed, sender=Playlist.music.through)
+def invalidate_collection_versions(sender, **kwargs):
+    conditional.invalidate(sender)
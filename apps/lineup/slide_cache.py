@@ -0,0 +1,80 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps.playlist.content import load_playlist_musics
+
+from .models import SlideDeck
+from .slides import LAYOUT
+
+
+def deck_key(playlist):
+    """
+    Chave derivada do conteúdo da apresentação.
+
+    Combina o id da playlist, os ids das músicas na ordem da playlist com seus
+    updated_at e os parâmetros de layout; qualquer alteração gera outra chave.
+    """
+    songs = [
+        [music.id, music.updated_at.isoformat()]
+        for music in load_playlist_musics(playlist, ["updated_at"])
+    ]
+    content = json.dumps([playlist.id, songs, LAYOUT], sort_keys=True)
+    return f"{playlist.id}-{hashlib.sha256(content.encode()).hexdigest()[:40]}"
+
+
+def get_deck(key):
+    """
+    Retorna os bytes da apresentação em cache, ou None se não existir.
+    """
+    content = SlideDeck.objects.filter(key=key).values_list("content", flat=True)
+    content = content.first()
+    if content is None:
+        return None
+    # Atualiza o horário de acesso usado na remoção LRU
+    SlideDeck.objects.filter(key=key).update(accessed_at=timezone.now())
+    return bytes(content)
+
+
+def store_deck(playlist_id, key, content):
+    """
+    Grava a apresentação no cache e aplica o limite de tamanho.
+    """
+    SlideDeck.objects.update_or_create(
+        key=key,
+        defaults={
+            "playlist_id": playlist_id,
+            "content": content,
+            "size": len(content),
+            "accessed_at": timezone.now(),
+        },
+    )
+    evict()
+
+
+def evict(max_size=None):
+    """
+    Remove as apresentações menos usadas até o cache caber em SLIDES_CACHE_MAX_SIZE.
+    """
+    max_size = settings.SLIDES_CACHE_MAX_SIZE if max_size is None else max_size
+    total = SlideDeck.objects.aggregate(total=Sum("size"))["total"] or 0
+    if total <= max_size:
+        return
+
+    stale = []
+    for pk, size in SlideDeck.objects.order_by("accessed_at").values_list("pk", "size"):
+        if total <= max_size:
+            break
+        stale.append(pk)
+        total -= size
+    SlideDeck.objects.filter(pk__in=stale).delete()
+
+
+def invalidate_playlist(playlist_id):
+    """
+    Remove as apresentações em cache de uma playlist.
+    """
+    SlideDeck.objects.filter(playlist_id=playlist_id).delete()
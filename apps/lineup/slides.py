@@ -0,0 +1,95 @@
+from io import BytesIO
+
+from apps.playlist.content import load_playlist_musics
+from setup.documents import inches, new_presentation, points
+
+PPTX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+)
+SLIDES_FILENAME = "culto_slides.pptx"
+
+# Parâmetros de layout; qualquer mudança aqui gera novas chaves no cache de slides
+LAYOUT_VERSION = 1
+LINES_PER_SLIDE = 5
+TITLE_FONT_SIZE = 32
+TEXT_FONT_SIZE = 30
+
+# Campos de Music usados na geração (os demais não são carregados)
+SLIDE_FIELDS = ("music_title", "author", "plain_lyrics", "updated_at")
+
+LAYOUT = {
+    "version": LAYOUT_VERSION,
+    "lines_per_slide": LINES_PER_SLIDE,
+    "title_font_size": TITLE_FONT_SIZE,
+    "text_font_size": TEXT_FONT_SIZE,
+}
+
+
+def render_slides(playlist):
+    """
+    Gera a apresentação .pptx com as músicas da playlist (sem acordes) e retorna
+    os bytes.
+    """
+    # Apenas as músicas desta playlist, na ordem da playlist, em uma consulta
+    music_list = load_playlist_musics(playlist, SLIDE_FIELDS)
+    # Cria uma nova apresentação
+    prs = new_presentation()
+    title_slide_layout = prs.slide_layouts[5]  # Layout em branco
+
+    # Gera slides para cada música
+    for music in music_list:
+        # Letra sem acordes, pré-calculada ao salvar a música
+        lines = music.plain_lyrics.strip().split("\n")  # cada linha separada
+
+        # Controla o número de slides para esta música
+        slide_count = 0
+        lines_on_current_slide = 0
+
+        # Cria o primeiro slide para a música
+        slide = prs.slides.add_slide(title_slide_layout)
+        slide_count += 1
+
+        # Adiciona título no primeiro slide
+        title_box = slide.shapes.add_textbox(
+            inches(0.5), inches(0.5), inches(9), inches(1)
+        )
+        title_tf = title_box.text_frame
+        title_tf.text = f"{music.music_title} - {music.author}"
+        title_tf.paragraphs[0].font.size = points(TITLE_FONT_SIZE)
+        title_tf.paragraphs[0].font.bold = True
+
+        # Adiciona texto do slide
+        textbox = slide.shapes.add_textbox(
+            inches(0.5), inches(2), inches(9), inches(5.5)
+        )
+        tf = textbox.text_frame
+        tf.word_wrap = True
+
+        # Itera sobre todas as linhas da música
+        for line in lines:
+            # Se já foram adicionadas 5 linhas, cria um novo slide
+            if lines_on_current_slide >= LINES_PER_SLIDE:
+                slide = prs.slides.add_slide(title_slide_layout)
+                slide_count += 1
+
+                # Reseta o textbox para o novo slide
+                textbox = slide.shapes.add_textbox(
+                    inches(0.5), inches(2), inches(9), inches(5.5)
+                )
+                tf = textbox.text_frame
+                tf.word_wrap = True
+
+                # Reseta o contador de linhas
+                lines_on_current_slide = 0
+
+            # Adiciona a linha ao slide atual
+            if line.strip():
+                p = tf.add_paragraph()
+                p.text = line.strip()
+                p.font.size = points(TEXT_FONT_SIZE)
+                lines_on_current_slide += 1
+
+    # Salva a apresentação
+    output = BytesIO()
+    prs.save(output)
+    return output.getvalue()
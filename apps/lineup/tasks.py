@@ -0,0 +1,15 @@
+from django.core.files.base import ContentFile
+
+from apps.jobs.registry import task
+from apps.playlist.models import Playlist
+
+from . import slide_cache
+from .slides import SLIDES_FILENAME, render_slides
+
+
+@task("lineup.generate_slides", timeout=300, max_attempts=2)
+def generate_slides_task(job):
+    playlist = Playlist.objects.get(id=job.payload["playlist_id"])
+    content = render_slides(playlist)
+    slide_cache.store_deck(playlist.id, slide_cache.deck_key(playlist), content)
+    return ContentFile(content, name=SLIDES_FILENAME)
@@ -1,3 +1,391 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from pptx import Presentation
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Member, MemberFunctions
+from apps.jobs.brokers import DatabaseBroker
+from apps.jobs.worker import Worker
+from apps.music.models import Music
+from apps.playlist.models import Playlist
+from setup.testing import QueryBudgetMixin
+
+from . import slide_cache
+from .models import LineupMember, MemberUnavailability, PraiseLineup, SlideDeck
+from .scheduling import ScheduleBoard
+from .slides import render_slides
+
+
+class SlideGeneratorTestCase(TestCase):
+    def setUp(self):
+        self.playlists = []
+        for index in range(5):
+            playlist = Playlist.objects.create(playlist_name=f"Culto {index}")
+            for position in range(4):
+                music = Music.objects.create(
+                    music_title=f"Música {index}-{position}",
+                    author="Autor",
+                    music_tone="G",
+                    music_text="<p>G Santo, santo</p><p>D Digno és</p>",
+                )
+                playlist.music.add(music)
+            self.playlists.append(playlist)
+
+    def test_renders_only_the_requested_playlist_in_one_query(self):
+        playlist = self.playlists[2]
+        # Ordem da playlist diferente da ordem alfabética padrão de Music
+        first = playlist.music.get(music_title="Música 2-0")
+        playlist.music.remove(first)
+        playlist.music.add(first)
+
+        with self.assertNumQueries(1):
+            content = render_slides(playlist)
+
+        slides = Presentation(BytesIO(content)).slides
+        # O primeiro shape é o placeholder do layout; o título vem em seguida
+        titles = [slide.shapes[1].text_frame.text for slide in slides]
+        self.assertEqual(
+            titles,
+            [
+                "Música 2-1 - Autor",
+                "Música 2-2 - Autor",
+                "Música 2-3 - Autor",
+                "Música 2-0 - Autor",
+            ],
+        )
+
+
+@override_settings(JOBS={"BROKER": "database", "EAGER": False})
+class SlideCacheTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        self.music = Music.objects.create(
+            music_title="Santo",
+            author="Autor",
+            music_tone="G",
+            music_text="<p>G Santo</p>",
+        )
+        self.playlist = Playlist.objects.create(playlist_name="Culto")
+        self.playlist.music.add(self.music)
+        self.url = f"/api/praise/slides-generator/?playlist_id={self.playlist.id}"
+
+    def generate(self):
+        response = self.client.post(
+            "/api/praise/slides-generator/", {"playlist_id": self.playlist.id}
+        )
+        Worker(broker=DatabaseBroker(), poll_interval=1).run(burst=True)
+        return response
+
+    def test_deck_is_generated_then_served_from_cache(self):
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        response = self.generate()
+        self.assertEqual(response.status_code, 202)
+        result = self.client.get(response.data["status_url"] + "result/")
+        self.assertEqual(result.status_code, 200)
+        self.assertIn("culto_slides.pptx", result["Content-Disposition"])
+
+        # Mesmo conteúdo: servido do cache, pelo POST e pelo GET condicional
+        cached = self.client.post(
+            "/api/praise/slides-generator/", {"playlist_id": self.playlist.id}
+        )
+        self.assertEqual(cached.status_code, 200)
+        fetched = self.client.get(self.url)
+        self.assertEqual(fetched.status_code, 200)
+        self.assertEqual(fetched["ETag"], cached["ETag"])
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=cached["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+
+        # POST não responde 304: If-None-Match só vale no GET
+        repeated = self.client.post(
+            "/api/praise/slides-generator/",
+            {"playlist_id": self.playlist.id},
+            HTTP_IF_NONE_MATCH=cached["ETag"],
+        )
+        self.assertEqual(repeated.status_code, 200)
+
+        # Alterar uma música da playlist invalida a apresentação
+        self.music.music_text = "<p>G Santo, santo</p>"
+        self.music.save()
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=cached["ETag"])
+        self.assertEqual(changed.status_code, 404)
+        self.assertEqual(self.generate().status_code, 202)
+
+    def test_least_recently_used_decks_are_evicted(self):
+        for index, key in enumerate(["1-a", "1-b", "1-c"]):
+            slide_cache.store_deck(self.playlist.id, key, bytes(10))
+            SlideDeck.objects.filter(key=key).update(
+                accessed_at=timezone.now() - timedelta(minutes=10 - index)
+            )
+        self.assertEqual(slide_cache.get_deck("1-a"), bytes(10))
+
+        slide_cache.evict(max_size=20)
+        self.assertEqual(
+            sorted(SlideDeck.objects.values_list("key", flat=True)), ["1-a", "1-c"]
+        )
+
+
+class LineupOverviewTestCase(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        self.function = MemberFunctions.objects.create(function_name="Vocal")
+        self.create_lineups(2)
+
+    def create_lineups(self, count):
+        start = PraiseLineup.objects.count()
+        for index in range(start, start + count):
+            playlist = Playlist.objects.create(playlist_name=f"Culto {index}")
+            for position in range(2):
+                playlist.music.add(
+                    Music.objects.create(
+                        music_title=f"Música {index}-{position}",
+                        author="Autor",
+                        music_tone="G",
+                        music_text="G",
+                    )
+                )
+            lineup = PraiseLineup.objects.create(
+                lineup_event=f"Culto {index}", playlist=playlist
+            )
+            user = User.objects.create_user(username=f"membro{index}")
+            member = Member.objects.create(name=f"Membro {index}", user=user)
+            LineupMember.objects.create(
+                lineup=lineup, member=member, function=self.function
+            )
+
+    def test_range_overview_costs_constant_queries(self):
+        self.assertQueriesDoNotGrow(
+            lambda: self.client.get("/api/praise/praise-lineup/overview/"),
+            lambda: self.create_lineups(3),
+            max_queries=3,
+        )
+
+        scales = self.client.get("/api/praise/praise-lineup/overview/").json()["scales"]
+        self.assertEqual(len(scales), 5)
+        self.assertEqual(
+            [music["music_title"] for music in scales[0]["playlist"]["musics"]],
+            ["Música 0-0", "Música 0-1"],
+        )
+        self.assertEqual(scales[0]["members"][0]["member_display"], "Membro 0")
+        self.assertEqual(scales[0]["members"][0]["function_display"], "Vocal")
+
+    def test_conditional_get(self):
+        lineup = PraiseLineup.objects.first()
+        url = f"/api/praise/praise-lineup/{lineup.id}/overview/"
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        lineup.lineup_event = "Santa Ceia"
+        lineup.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["lineup_event"], "Santa Ceia")
+
+
+class LineupMemberListTestCase(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        self.function = MemberFunctions.objects.create(function_name="Vocal")
+        self.member = Member.objects.create(
+            name="Ana", user=User.objects.create_user(username="ana")
+        )
+        self.create_scales(3)
+
+    def create_scales(self, count):
+        start = PraiseLineup.objects.count()
+        for index in range(start, start + count):
+            lineup = PraiseLineup.objects.create(
+                lineup_event=f"Culto {index}",
+                lineup_date=date(2024, 1, 1) + timedelta(days=index),
+            )
+            LineupMember.objects.create(
+                lineup=lineup, member=self.member, function=self.function
+            )
+
+    def test_cursor_walk_and_constant_queries(self):
+        self.assertQueriesDoNotGrow(
+            lambda: self.client.get("/api/praise/lineup-member/"),
+            lambda: self.create_scales(3),
+            max_queries=1,
+        )
+
+        seen = []
+        url = "/api/praise/lineup-member/?page_size=4"
+        while url:
+            data = self.client.get(url).json()
+            seen.extend(item["lineup_date"] for item in data["results"])
+            url = data["next"]
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_cursor_walk_with_shared_dates(self):
+        lineup = PraiseLineup.objects.get(lineup_event="Culto 1")
+        for index in range(7):
+            member = Member.objects.create(
+                name=f"Membro {index}",
+                user=User.objects.create_user(username=f"membro{index}"),
+            )
+            LineupMember.objects.create(
+                lineup=lineup, member=member, function=self.function
+            )
+
+        seen = []
+        url = "/api/praise/lineup-member/?page_size=2"
+        while url:
+            data = self.client.get(url).json()
+            seen.extend(data["results"])
+            url = data["next"]
+        self.assertEqual(
+            sorted(item["id"] for item in seen),
+            sorted(LineupMember.objects.values_list("id", flat=True)),
+        )
+        dates = [item["lineup_date"] for item in seen]
+        self.assertEqual(dates.count("2024-01-02"), 8)
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_rejects_ordering(self):
+        response = self.client.get("/api/praise/lineup-member/?ordering=id")
+        self.assertEqual(response.status_code, 400)
+
+    def test_filters_by_member_and_date(self):
+        response = self.client.get(
+            "/api/praise/lineup-member/",
+            {"member": self.member.id, "date_from": "2024-01-02"},
+        )
+        self.assertEqual(
+            [item["lineup_date"] for item in response.json()["results"]],
+            ["2024-01-03", "2024-01-02"],
+        )
+
+    def test_lineup_date_follows_the_lineup(self):
+        lineup = PraiseLineup.objects.get(lineup_event="Culto 0")
+        lineup.lineup_date = date(2025, 5, 5)
+        lineup.save()
+        self.assertEqual(lineup.members.get().lineup_date, date(2025, 5, 5))
+
+
+class ScheduleCandidatesTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        self.vocal = MemberFunctions.objects.create(function_name="Vocal")
+        self.day = date(2024, 6, 2)
+        self.members = {}
+        for name in ["Ana", "Bia", "Caio", "Davi", "Eva"]:
+            member = Member.objects.create(
+                name=name, user=User.objects.create_user(username=name.lower())
+            )
+            member.function.add(self.vocal)
+            self.members[name] = member
+
+        # Ana serviu duas vezes recentemente, Bia uma
+        for days, names in [(7, ["Ana", "Bia"]), (14, ["Ana"])]:
+            self.escalate(self.day - timedelta(days=days), names)
+        # Caio já está em outro culto no dia e Davi está indisponível
+        self.escalate(self.day, ["Caio"])
+        MemberUnavailability.objects.create(
+            member=self.members["Davi"],
+            start_date=self.day - timedelta(days=1),
+            end_date=self.day + timedelta(days=1),
+        )
+
+    def escalate(self, on_date, names):
+        lineup = PraiseLineup.objects.create(lineup_date=on_date)
+        for name in names:
+            LineupMember.objects.create(
+                lineup=lineup, member=self.members[name], function=self.vocal
+            )
+        return lineup
+
+    def test_candidates_ranked_by_recent_load(self):
+        with self.assertNumQueries(4):
+            board = ScheduleBoard(self.day, self.day)
+        with self.assertNumQueries(0):
+            candidates = board.candidates(self.vocal.id, self.day)
+
+        self.assertEqual(
+            [(item["name"], item["recent_load"]) for item in candidates],
+            [("Eva", 0), ("Bia", 1), ("Ana", 2)],
+        )
+
+        response = self.client.get(
+            "/api/praise/lineup-member/candidates/",
+            {"date": "2024-06-02", "function": str(self.vocal.id)},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["date"], "2024-06-02")
+        self.assertEqual(
+            [item["name"] for item in response.json()["functions"][0]["candidates"]],
+            ["Eva", "Bia", "Ana"],
+        )
+
+    def test_candidates_etag_changes_with_the_day(self):
+        url = "/api/praise/lineup-member/candidates/"
+        params = {"date": "2024-06-02", "function": str(self.vocal.id)}
+        etag = self.client.get(url, params)["ETag"]
+        self.assertEqual(
+            self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        with mock.patch.object(timezone, "localdate", return_value=tomorrow):
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_rejects_double_booking_and_unavailability(self):
+        lineup = PraiseLineup.objects.create(lineup_date=self.day)
+        for name in ["Caio", "Davi"]:
+            response = self.client.post(
+                "/api/praise/lineup-member/",
+                {
+                    "lineup": lineup.id,
+                    "member": self.members[name].id,
+                    "function": self.vocal.id,
+                },
+            )
+            self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(
+            "/api/praise/lineup-member/",
+            {
+                "lineup": lineup.id,
+                "member": self.members["Eva"].id,
+                "function": self.vocal.id,
+            },
+        )
+        self.assertEqual(response.status_code, 201)
+
+
+class NextAndPreviousScalesTestCase(TestCase):
+    def test_async_routes_list_upcoming_and_past_scales(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username="louvor"))
+        today = date.today()
+        PraiseLineup.objects.create(
+            lineup_event="Próximo", lineup_date=today + timedelta(days=7)
+        )
+        PraiseLineup.objects.create(
+            lineup_event="Anterior", lineup_date=today - timedelta(days=7)
+        )
+
+        response = client.get("/api/praise/praise-lineup/next-scales/")
+        self.assertEqual(
+            [scale["event"] for scale in response.json()["next-scales"]], ["Próximo"]
+        )
+        response = client.get("/api/praise/praise-lineup/previous-scales/")
+        self.assertEqual(
+            [scale["event"] for scale in response.json()["previous-scales"]],
+            ["Anterior"],
+        )
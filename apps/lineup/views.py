@@ -1,28 +1,113 @@
+import io
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
 from dateutil.relativedelta import relativedelta
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponseNotModified
 from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.http import parse_etags, quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from pptx import Presentation
-from pptx.util import Inches, Pt
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.accounts.models import Member
+from apps.accounts.auth_cache import get_member_id
+from apps.accounts.models import Member, MemberFunctions
+from apps.dashboard.stats import get_statistic
+from apps.jobs.registry import enqueue
+from apps.jobs.serializers import JobAcceptedSerializer
+from apps.jobs.views import accepted_response
 from apps.music.models import Music
-from apps.music.utils import extract_lyrics_without_chords, is_chord
 from apps.playlist.models import Playlist
-
-from .models import LineupMember, PraiseLineup
-from .serializers import LineupMemberSerializers, PraiseLineupSerializers
+from setup.async_views import AsyncAPIView
+from setup.conditional import ConditionalGetMixin
+from setup.replica import ReplicaReadMixin
+
+from . import overview, scheduling, slide_cache
+from .filters import LineupMemberFilter
+from .models import LineupMember, MemberUnavailability, PraiseLineup
+from .pagination import LineupMemberKeysetPagination
+from .serializers import (
+    CandidatesResponseSerializers,
+    LineupMemberSerializers,
+    LineupOverviewSerializers,
+    PraiseLineupSerializers,
+)
+from .slides import PPTX_CONTENT_TYPE, SLIDES_FILENAME
+
+
+LINEUP_OVERVIEW_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "id": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "lineup_date": openapi.Schema(type=openapi.TYPE_STRING, format="date"),
+        "lineup_event": openapi.Schema(type=openapi.TYPE_STRING),
+        "playlist": openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            nullable=True,
+            properties={
+                "id": openapi.Schema(type=openapi.TYPE_INTEGER),
+                "playlist_name": openapi.Schema(type=openapi.TYPE_STRING),
+                "playlist_date": openapi.Schema(
+                    type=openapi.TYPE_STRING, format="date"
+                ),
+                "musics": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            "id": openapi.Schema(type=openapi.TYPE_INTEGER),
+                            "music_title": openapi.Schema(type=openapi.TYPE_STRING),
+                            "author": openapi.Schema(type=openapi.TYPE_STRING),
+                            "music_tone": openapi.Schema(type=openapi.TYPE_STRING),
+                            "music_link": openapi.Schema(
+                                type=openapi.TYPE_STRING, format="uri"
+                            ),
+                        },
+                    ),
+                ),
+            },
+        ),
+        "members": openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "id": openapi.Schema(type=openapi.TYPE_INTEGER),
+                    "member": openapi.Schema(type=openapi.TYPE_INTEGER),
+                    "member_display": openapi.Schema(type=openapi.TYPE_STRING),
+                    "function": openapi.Schema(type=openapi.TYPE_INTEGER),
+                    "function_display": openapi.Schema(type=openapi.TYPE_STRING),
+                },
+            ),
+        ),
+    },
+)
 
 
-class PraiseLineupViewSet(viewsets.ModelViewSet):
-    queryset = PraiseLineup.objects.all()
+class PraiseLineupViewSet(ConditionalGetMixin, ReplicaReadMixin, viewsets.ModelViewSet):
+    queryset = PraiseLineup.objects.select_related("playlist")
     serializer_class = PraiseLineupSerializers
+    # Playlist, músicas e (na visão geral e nos slides) membros e funções
+    conditional_models = (
+        PraiseLineup,
+        Playlist,
+        Music,
+        LineupMember,
+        Member,
+        MemberFunctions,
+    )
+    replica_actions = {
+        "list",
+        "get_scales",
+        "get_total_scales",
+    }
+    # Sem start, o período da visão geral começa hoje
+    date_dependent_actions = {"get_overviews"}
 
     filter_backends = [
         DjangoFilterBackend,
@@ -96,13 +181,114 @@ class PraiseLineupViewSet(viewsets.ModelViewSet):
     )
     @action(detail=False, methods=["get"], url_path="total-scales")
     def get_total_scales(self, request):
-        scales = PraiseLineup.objects.all()
+        return Response(
+            {"total": get_statistic("total_scales")}, status=status.HTTP_200_OK
+        )
 
-        return Response({"total": scales.count()}, status=status.HTTP_200_OK)
+    @swagger_auto_schema(
+        method="get",
+        operation_description=(
+            "Retorna a escala com membros (nome e função), playlist e músicas em uma "
+            "única resposta. Aceita If-None-Match (ETag)."
+        ),
+        responses={
+            200: openapi.Response(
+                description="Visão geral da escala", schema=LINEUP_OVERVIEW_SCHEMA
+            ),
+            304: openapi.Response(
+                description="A escala não mudou desde o ETag enviado"
+            ),
+        },
+    )
+    @action(detail=True, methods=["get"], url_path="overview")
+    def get_overview(self, request, pk=None):
+        # ETag e 304 vêm do ConditionalGetMixin (versões das coleções)
+        lineups = overview.load_overview(PraiseLineup.objects.filter(pk=pk))
+        if not lineups:
+            return Response(
+                {"detail": "Escala não encontrada."}, status=status.HTTP_404_NOT_FOUND
+            )
+        serializer = LineupOverviewSerializers(lineups[0])
+        return Response(serializer.data)
 
     @swagger_auto_schema(
         method="get",
-        operation_description="Retorna as próximas 5 escalas dentro de 6 meses a partir da data atual.",
+        operation_description=(
+            "Retorna as escalas do período (padrão: próximos 30 dias) com membros, "
+            "playlist e músicas em uma única resposta. Aceita If-None-Match (ETag)."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "start",
+                openapi.IN_QUERY,
+                description="Data inicial (AAAA-MM-DD); padrão: hoje",
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE,
+                required=False,
+            ),
+            openapi.Parameter(
+                "end",
+                openapi.IN_QUERY,
+                description=(
+                    "Data final (AAAA-MM-DD); padrão: 30 dias após o início, no "
+                    "máximo 366"
+                ),
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE,
+                required=False,
+            ),
+        ],
+        responses={
+            200: openapi.Response(
+                description="Visão geral das escalas do período",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "scales": openapi.Schema(
+                            type=openapi.TYPE_ARRAY, items=LINEUP_OVERVIEW_SCHEMA
+                        )
+                    },
+                ),
+            ),
+            304: openapi.Response(
+                description="As escalas não mudaram desde o ETag enviado"
+            ),
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="overview")
+    def get_overviews(self, request):
+        try:
+            start = parse_date(request.query_params.get("start", "")) or (
+                timezone.localdate()
+            )
+            end = parse_date(request.query_params.get("end", "")) or (
+                start + timedelta(days=30)
+            )
+        except ValueError:
+            return Response(
+                {"detail": "Data inválida, use AAAA-MM-DD."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if end < start or (end - start).days > overview.MAX_RANGE_DAYS:
+            return Response(
+                {
+                    "detail": (
+                        f"Informe um período de até {overview.MAX_RANGE_DAYS} dias."
+                    )
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        lineups = overview.load_overview(overview.lineups_between(start, end))
+        serializer = LineupOverviewSerializers(lineups, many=True)
+        return Response({"scales": serializer.data})
+
+
+class NextScalesView(ReplicaReadMixin, AsyncAPIView):
+    @swagger_auto_schema(
+        operation_description=(
+            "Retorna as próximas 5 escalas dentro de 6 meses a partir da data atual."
+        ),
         responses={
             200: openapi.Response(
                 description="Lista das próximas escalas",
@@ -126,29 +312,30 @@ class PraiseLineupViewSet(viewsets.ModelViewSet):
             )
         },
     )
-    @action(detail=False, methods=["get"], url_path="next-scales")
-    @action(detail=False, methods=["get"], url_path="next-scales")
-    def get_next_scales(self, request):
+    async def get(self, request):
         date_now = timezone.now()
         date_next_months = date_now + relativedelta(months=6)
 
         lineups = PraiseLineup.objects.filter(
             lineup_date__range=(date_now, date_next_months)
-        )[:5]
+        ).values("lineup_event", "lineup_date")[:5]
 
         return Response(
             {
                 "next-scales": [
-                    {"event": scale.lineup_event, "date": scale.lineup_date}
-                    for scale in lineups
+                    {"event": scale["lineup_event"], "date": scale["lineup_date"]}
+                    async for scale in lineups
                 ]
             },
             status=status.HTTP_200_OK,
         )
 
+
+class PreviousScalesView(ReplicaReadMixin, AsyncAPIView):
     @swagger_auto_schema(
-        method="get",
-        operation_description="Retorna as últimas 5 escalas dos 6 meses anteriores à data atual.",
+        operation_description=(
+            "Retorna as últimas 5 escalas dos 6 meses anteriores à data atual."
+        ),
         responses={
             200: openapi.Response(
                 description="Lista das escalas anteriores",
@@ -172,41 +359,118 @@ class PraiseLineupViewSet(viewsets.ModelViewSet):
             )
         },
     )
-    @action(detail=False, methods=["get"], url_path="previous-scales")
-    def get_previous_scales(self, request):
+    async def get(self, request):
         date_now = timezone.now()
         date_previous_months = date_now - relativedelta(months=6)
 
         lineups = PraiseLineup.objects.filter(
             lineup_date__range=(date_previous_months, date_now)
-        )[:5]
+        ).values("lineup_event", "lineup_date")[:5]
 
         return Response(
             {
                 "previous-scales": [
-                    {"event": scale.lineup_event, "date": scale.lineup_date}
-                    for scale in lineups
+                    {"event": scale["lineup_event"], "date": scale["lineup_date"]}
+                    async for scale in lineups
                 ]
             },
             status=status.HTTP_200_OK,
         )
 
 
-class LineupMemberViewSet(viewsets.ModelViewSet):
-    queryset = LineupMember.objects.all()
+class LineupMemberViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = LineupMember.objects.select_related("member", "function")
     serializer_class = LineupMemberSerializers
-    pagination_class = None
+    pagination_class = LineupMemberKeysetPagination
+    # A data da escala é copiada nos membros com update(), sem sinais
+    conditional_models = (
+        LineupMember,
+        PraiseLineup,
+        Member,
+        MemberFunctions,
+        MemberUnavailability,
+    )
+    # Ranking dos candidatos em janela de datas (carga recente de 90 dias)
+    date_dependent_actions = {"get_candidates"}
 
     filter_backends = [
         DjangoFilterBackend,
-        filters.OrderingFilter,
         filters.SearchFilter,
     ]
-    ordering_fields = ["lineup__lineup_date", "lineup__lineup_event"]
+    filterset_class = LineupMemberFilter
     search_fields = ["member__name", "function__function_name"]
 
+    @swagger_auto_schema(
+        method="get",
+        operation_description=(
+            "Membros que podem cobrir cada função no dia, sem indisponibilidade nem "
+            "outra escala na data, dos menos escalados nos últimos 90 dias para os "
+            "mais escalados."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "date",
+                openapi.IN_QUERY,
+                description="Data da escala (AAAA-MM-DD)",
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE,
+                required=True,
+            ),
+            openapi.Parameter(
+                "function",
+                openapi.IN_QUERY,
+                description="Ids das funções, separados por vírgula",
+                type=openapi.TYPE_STRING,
+                required=True,
+            ),
+            openapi.Parameter(
+                "lineup",
+                openapi.IN_QUERY,
+                description=(
+                    "Id da escala em montagem (membros já escalados nela continuam "
+                    "candidatos)"
+                ),
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+        ],
+        responses={200: CandidatesResponseSerializers},
+    )
+    @action(detail=False, methods=["get"], url_path="candidates")
+    def get_candidates(self, request):
+        try:
+            on_date = parse_date(request.query_params.get("date", ""))
+            function_ids = [
+                int(function_id)
+                for function_id in request.query_params.get("function", "").split(",")
+                if function_id.strip()
+            ]
+            lineup_id = int(request.query_params.get("lineup") or 0) or None
+        except ValueError:
+            on_date = None
+        if not on_date or not function_ids:
+            return Response(
+                {"detail": "Informe a data (AAAA-MM-DD) e os ids das funções."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-class ScaleHistoryViewSet(APIView):
+        board = scheduling.ScheduleBoard(on_date, on_date)
+        serializer = CandidatesResponseSerializers(
+            {
+                "date": on_date,
+                "functions": [
+                    {
+                        "function": function_id,
+                        "candidates": board.candidates(function_id, on_date, lineup_id),
+                    }
+                    for function_id in function_ids
+                ],
+            }
+        )
+        return Response(serializer.data)
+
+
+class ScaleHistoryViewSet(AsyncAPIView):
     @swagger_auto_schema(
         operation_description="Rota para retornar o histórico de escalas do membro logado.",
         responses={
@@ -239,8 +503,12 @@ class ScaleHistoryViewSet(APIView):
             )
         },
     )
-    def get(self, request):
-        member_id = Member.objects.get(user=request.user).id
+    async def get(self, request):
+        member_id = await sync_to_async(get_member_id)(request.user)
+        if member_id is None:
+            return Response(
+                {"detail": "Usuário não é um membro."}, status=status.HTTP_404_NOT_FOUND
+            )
         scales = LineupMember.objects.filter(member_id=member_id)
         scales = scales.values(
             "id",
@@ -257,7 +525,7 @@ class ScaleHistoryViewSet(APIView):
                         "lineup_event": scale["lineup__lineup_event"],
                         "function_name": scale["function__function_name"],
                     }
-                    for scale in scales
+                    async for scale in scales
                 ]
             },
             status=status.HTTP_200_OK,
@@ -265,8 +533,79 @@ class ScaleHistoryViewSet(APIView):
 
 
 class SlideGeneratorView(APIView):
+    def get_playlist(self, playlist_id):
+        """
+        Retorna (playlist, resposta de erro) para o id informado.
+        """
+        if not playlist_id:
+            return None, Response({"playlist_id": "ID não foi passado"}, status=400)
+        try:
+            return Playlist.objects.get(id=playlist_id), None
+        except (Playlist.DoesNotExist, ValueError):
+            return None, Response({"detail": "Playlist não encontrada"}, status=404)
+
+    def deck_response(self, content, etag):
+        response = FileResponse(
+            io.BytesIO(content),
+            as_attachment=True,
+            filename=SLIDES_FILENAME,
+            content_type=PPTX_CONTENT_TYPE,
+        )
+        response["ETag"] = etag
+        return response
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Retorna o arquivo .pptx já gerado para o conteúdo atual da playlist. "
+            "Aceita If-None-Match (ETag)."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "playlist_id",
+                openapi.IN_QUERY,
+                description="ID da playlist",
+                type=openapi.TYPE_INTEGER,
+                required=True,
+            )
+        ],
+        responses={
+            200: openapi.Response(
+                description="Arquivo .pptx em cache",
+                schema=openapi.Schema(type=openapi.TYPE_STRING, format="binary"),
+            ),
+            304: openapi.Response(
+                description="A apresentação não mudou desde o ETag enviado"
+            ),
+            404: openapi.Response(
+                description="Playlist não encontrada ou apresentação ainda não "
+                "gerada (use POST para gerar)"
+            ),
+        },
+    )
+    def get(self, request):
+        playlist, error = self.get_playlist(request.query_params.get("playlist_id"))
+        if error:
+            return error
+
+        # O ETag é a chave do conteúdo: vale mesmo que o arquivo tenha saído do cache
+        key = slide_cache.deck_key(playlist)
+        etag = quote_etag(key)
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return HttpResponseNotModified(headers={"ETag": etag})
+
+        content = slide_cache.get_deck(key)
+        if content is None:
+            return Response(
+                {"detail": "Apresentação ainda não gerada. Use POST para gerar."},
+                status=404,
+            )
+        return self.deck_response(content, etag)
+
     @swagger_auto_schema(
-        operation_description="Gera e retorna um arquivo .pptx com as músicas da playlist (sem acordes).",
+        operation_description=(
+            "Enfileira a geração de um arquivo .pptx com as músicas da playlist (sem "
+            "acordes)."
+        ),
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             required=["playlist_id"],
@@ -279,95 +618,39 @@ class SlideGeneratorView(APIView):
         ),
         responses={
             200: openapi.Response(
-                description="Arquivo .pptx com os slides das músicas",
+                description=(
+                    "Arquivo .pptx já gerado para o conteúdo atual da playlist "
+                    "(cache)"
+                ),
                 schema=openapi.Schema(
                     type=openapi.TYPE_STRING,
                     format="binary",  # <- indica que é um arquivo
                 ),
-            )
+            ),
+            202: openapi.Response(
+                description=(
+                    "Job de geração criado. O arquivo .pptx fica disponível em "
+                    "/api/praise/jobs/<id>/result/."
+                ),
+                schema=JobAcceptedSerializer,
+            ),
         },
     )
     def post(self, request):
-        playlist_id = request.data.get("playlist_id")
-        if not playlist_id:
-            return Response({"playlist_id": "ID não foi passado"}, status=400)
-
-        try:
-            playlist = Playlist.objects.get(id=playlist_id)
-        except Playlist.DoesNotExist:
-            return Response({"detail": "Playlist não encontrada"}, status=404)
-
-        through_model = playlist.music.through  # acesso à tabela M2M
-
-        musics = through_model.objects.values("music")
-        music_ids = [music["music"] for music in musics]
-        music_list = Music.objects.filter(id__in=music_ids)
-        # Cria uma nova apresentação
-        prs = Presentation()
-        title_slide_layout = prs.slide_layouts[5]  # Layout em branco
-
-        # Gera slides para cada música
-        for music in music_list:
-            # Extrai letras sem acordes
-            music_text = extract_lyrics_without_chords(music.music_text)
-            lines = music_text.strip().split("\n")  # cada linha separada
-
-            # Controla o número de slides para esta música
-            slide_count = 0
-            lines_on_current_slide = 0
-
-            # Cria o primeiro slide para a música
-            slide = prs.slides.add_slide(title_slide_layout)
-            slide_count += 1
-
-            # Adiciona título no primeiro slide
-            title_box = slide.shapes.add_textbox(
-                Inches(0.5), Inches(0.5), Inches(9), Inches(1)
-            )
-            title_tf = title_box.text_frame
-            title_tf.text = f"{music.music_title} - {music.author}"
-            title_tf.paragraphs[0].font.size = Pt(32)
-            title_tf.paragraphs[0].font.bold = True
-
-            # Adiciona texto do slide
-            textbox = slide.shapes.add_textbox(
-                Inches(0.5), Inches(2), Inches(9), Inches(5.5)
-            )
-            tf = textbox.text_frame
-            tf.word_wrap = True
-
-            # Itera sobre todas as linhas da música
-            for line in lines:
-                # Se já foram adicionadas 5 linhas, cria um novo slide
-                if lines_on_current_slide >= 5:
-                    slide = prs.slides.add_slide(title_slide_layout)
-                    slide_count += 1
-
-                    # Reseta o textbox para o novo slide
-                    textbox = slide.shapes.add_textbox(
-                        Inches(0.5), Inches(2), Inches(9), Inches(5.5)
-                    )
-                    tf = textbox.text_frame
-                    tf.word_wrap = True
-
-                    # Reseta o contador de linhas
-                    lines_on_current_slide = 0
-
-                # Adiciona a linha ao slide atual
-                if line.strip():
-                    text = ""
-                    for t in line.split():
-                        if not is_chord(t):
-                            text += t + " "
-                    p = tf.add_paragraph()
-                    p.text = text.strip()
-                    p.font.size = Pt(30)
-                    lines_on_current_slide += 1
-
-        # Salva a apresentação
-        response = HttpResponse(
-            content_type="application/vnd.openxmlformats-officedocument.presentationml.presentation"
+        playlist, error = self.get_playlist(request.data.get("playlist_id"))
+        if error:
+            return error
+
+        # Apresentação já gerada para este conteúdo: responde direto do cache
+        key = slide_cache.deck_key(playlist)
+        content = slide_cache.get_deck(key)
+        if content is not None:
+            return self.deck_response(content, quote_etag(key))
+
+        # A renderização do .pptx roda no worker de jobs, fora do ciclo da requisição
+        job = enqueue(
+            "lineup.generate_slides",
+            payload={"playlist_id": playlist.id},
+            user=request.user,
         )
-        response["Content-Disposition"] = 'attachment; filename="culto_slides.pptx"'
-        prs.save(response)
-        return response
+        return accepted_response(job)
@@ -0,0 +1,28 @@
+from django.contrib import admin
+
+from .models import MailBatch, MailRecipient
+
+
+class MailRecipientInline(admin.TabularInline):
+    model = MailRecipient
+    fields = ("email", "status", "attempts", "sent_at", "error")
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+
+@admin.register(MailBatch)
+class MailBatchAdmin(admin.ModelAdmin):
+    list_display = ("subject", "template", "created_by", "created_at")
+    readonly_fields = ("created_at", "updated_at")
+    inlines = [MailRecipientInline]
+
+
+@admin.register(MailRecipient)
+class MailRecipientAdmin(admin.ModelAdmin):
+    list_display = ("email", "batch", "status", "attempts", "sent_at")
+    list_filter = ("status", "batch__template")
+    search_fields = ("email",)
+    # O contexto pode ter links com token (redefinição de senha, convites)
+    exclude = ("context",)
+    readonly_fields = ("created_at", "updated_at", "sent_at")
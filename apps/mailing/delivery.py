@@ -0,0 +1,110 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import escape
+
+from apps.jobs.registry import enqueue
+
+from .models import MailBatch, MailRecipient
+
+
+def _placeholder(field):
+    return f"__mail_{field}__"
+
+
+def queue_mail(
+    template, subject, text_body, from_email, recipients, context=None, user=None
+):
+    """
+    Registra o envio e o entrega em segundo plano pela fila de jobs.
+
+    `recipients` é uma lista de (email, contexto do destinatário); os campos do
+    contexto do destinatário podem ser usados no template e em `text_body`.
+    """
+    batch = MailBatch.objects.create(
+        template=template,
+        subject=subject,
+        text_body=text_body,
+        from_email=from_email,
+        context=context or {},
+        created_by=user if user and user.is_authenticated else None,
+    )
+    MailRecipient.objects.bulk_create(
+        MailRecipient(batch=batch, email=email, context=recipient_context)
+        for email, recipient_context in recipients
+    )
+    return enqueue("mailing.deliver_batch", payload={"batch_id": batch.pk}, user=user)
+
+
+def render_batch(batch, fields):
+    """
+    Renderiza o template uma única vez; os campos de cada destinatário ficam
+    como marcadores, trocados por valores já escapados em `personalize`.
+    """
+    context = {
+        "subject": batch.subject,
+        **batch.context,
+        **{field: _placeholder(field) for field in fields},
+    }
+    return render_to_string(batch.template, context)
+
+
+def personalize(html, recipient):
+    for field, value in recipient.context.items():
+        html = html.replace(_placeholder(field), escape(value))
+    return html
+
+
+def build_message(batch, html, recipient):
+    message = EmailMultiAlternatives(
+        subject=batch.subject,
+        body=batch.text_body.format_map(recipient.context),
+        from_email=batch.from_email,
+        to=[recipient.email],
+    )
+    message.attach_alternative(personalize(html, recipient), "text/html")
+    return message
+
+
+def deliver_batch(batch):
+    """
+    Envia os destinatários pendentes (ou que falharam) usando uma única conexão
+    SMTP e registra a situação de cada um. Retorna a lista dos que falharam.
+    """
+    recipients = list(batch.recipients.exclude(status=MailRecipient.SENT))
+    if not recipients:
+        return []
+
+    fields = {field for recipient in recipients for field in recipient.context}
+    html = render_batch(batch, fields)
+
+    failed = []
+    with get_connection() as connection:
+        for recipient in recipients:
+            recipient.attempts += 1
+            try:
+                connection.send_messages([build_message(batch, html, recipient)])
+            except Exception as e:
+                recipient.status = MailRecipient.FAILED
+                recipient.error = str(e)
+                failed.append(recipient)
+            else:
+                recipient.status = MailRecipient.SENT
+                recipient.error = ""
+                recipient.sent_at = timezone.now()
+                # Links com token (ex.: redefinição de senha) não ficam guardados
+                recipient.context = {}
+
+    MailRecipient.objects.bulk_update(
+        recipients, ["status", "attempts", "error", "sent_at", "context"]
+    )
+    return failed
+
+
+def purge_old_batches():
+    """
+    Apaga os envios (e destinatários) mais antigos que MAIL_RETENTION.
+    """
+    cutoff = timezone.now() - settings.MAIL_RETENTION
+    return MailBatch.objects.filter(created_at__lt=cutoff).delete()[0]
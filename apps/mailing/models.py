@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+from apps.accounts.models import TimeStampedModel
+
+
+class MailBatch(TimeStampedModel):
+    """
+    Um envio (convites, redefinição de senha...) para um ou mais destinatários.
+
+    O template HTML é renderizado uma vez com `context`; os valores de cada
+    destinatário (ex.: link) entram depois, em MailRecipient.context.
+    """
+
+    template = models.CharField(max_length=200)
+    subject = models.CharField(max_length=200)
+    text_body = models.TextField(
+        help_text="Texto puro; aceita {campos} do destinatário"
+    )
+    from_email = models.CharField(max_length=254)
+    context = models.JSONField(default=dict, blank=True)
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True
+    )
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.subject} | {self.created_at:%d/%m/%Y %H:%M}"
+
+
+class MailRecipient(TimeStampedModel):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Pendente"),
+        (SENT, "Enviado"),
+        (FAILED, "Falhou"),
+    ]
+
+    batch = models.ForeignKey(
+        MailBatch, on_delete=models.CASCADE, related_name="recipients"
+    )
+    email = models.EmailField()
+    context = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [models.Index(fields=["status"])]
+
+    def __str__(self):
+        return f"{self.email} | {self.get_status_display()}"
@@ -0,0 +1,31 @@
+from apps.jobs.registry import task
+
+from .delivery import deliver_batch, purge_old_batches
+from .models import MailBatch, MailRecipient
+
+
+class DeliveryFailed(Exception):
+    pass
+
+
+@task("mailing.deliver_batch", timeout=300, max_attempts=4)
+def deliver_batch_task(job):
+    batch = MailBatch.objects.get(pk=job.payload["batch_id"])
+    failed = deliver_batch(batch)
+
+    # Falhas voltam para a fila (com espera exponencial) até a última tentativa
+    if failed and job.attempts < job.max_attempts:
+        raise DeliveryFailed(
+            ", ".join(f"{recipient.email}: {recipient.error}" for recipient in failed)
+        )
+
+    purge_old_batches()
+    recipients = batch.recipients.values("email", "status", "error")
+    return {
+        "sent": [r["email"] for r in recipients if r["status"] == MailRecipient.SENT],
+        "failed": [
+            {"email": r["email"], "detail": r["error"]}
+            for r in recipients
+            if r["status"] == MailRecipient.FAILED
+        ],
+    }
@@ -0,0 +1,125 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.jobs.models import Job
+
+from . import delivery
+from .models import MailBatch, MailRecipient
+
+
+class FlakyBackend(EmailBackend):
+    """
+    Backend em memória que recusa os endereços em `rejected`.
+    """
+
+    rejected = set()
+
+    def send_messages(self, messages):
+        for message in messages:
+            if set(message.to) & self.rejected:
+                raise ConnectionError("Destinatário recusado")
+        return super().send_messages(messages)
+
+
+@override_settings(
+    JOBS={"BROKER": "database", "EAGER": True},
+    EMAIL_HOST_USER="louvor@example.com",
+    FRONTEND_URL="https://louvor.example.com",
+)
+class MailPipelineTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        self.emails = ["ana@example.com", "bruno@example.com", "carla@example.com"]
+
+    def test_invites_share_one_render_and_one_connection(self):
+        with (
+            mock.patch.object(
+                delivery, "get_connection", wraps=delivery.get_connection
+            ) as get_connection,
+            mock.patch.object(
+                delivery, "render_to_string", wraps=delivery.render_to_string
+            ) as render,
+        ):
+            response = self.client.post(
+                "/api/praise/send-registration-email/",
+                {"emails": self.emails},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(get_connection.call_count, 1)
+        self.assertEqual(render.call_count, 1)
+
+        self.assertEqual([message.to[0] for message in mail.outbox], self.emails)
+        html = mail.outbox[0].alternatives[0][0]
+        self.assertIn("https://louvor.example.com/register?token=", html)
+        self.assertNotIn("__mail_link__", html)
+
+        job = Job.objects.get(pk=response.json()["job_id"])
+        self.assertEqual(job.result, {"sent": self.emails, "failed": []})
+        # Os links com token não ficam guardados depois do envio
+        self.assertEqual(
+            list(MailRecipient.objects.values_list("context", flat=True)), [{}] * 3
+        )
+
+    @override_settings(EMAIL_BACKEND="apps.mailing.tests.FlakyBackend")
+    def test_failed_recipients_are_recorded_and_retried(self):
+        FlakyBackend.rejected = {"bruno@example.com"}
+        job = delivery.queue_mail(
+            template="emails/invitation_email.html",
+            subject="Convite",
+            text_body="Clique no link: {link}",
+            from_email="louvor@example.com",
+            recipients=[
+                (email, {"link": f"https://x/{email}"}) for email in self.emails
+            ],
+        )
+
+        failed = MailRecipient.objects.get(status=MailRecipient.FAILED)
+        self.assertEqual((failed.email, failed.attempts), ("bruno@example.com", 1))
+        self.assertEqual(failed.context, {"link": "https://x/bruno@example.com"})
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertEqual(len(mail.outbox), 2)
+
+        # Nova tentativa reenvia apenas quem falhou
+        FlakyBackend.rejected = set()
+        batch = failed.batch
+        self.assertEqual(delivery.deliver_batch(batch), [])
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(batch.recipients.exclude(status=MailRecipient.SENT).exists())
+
+    def test_old_batches_are_purged_on_delivery(self):
+        old = MailBatch.objects.create(
+            template="emails/invitation_email.html",
+            subject="Antigo",
+            text_body="",
+            from_email="louvor@example.com",
+        )
+        MailBatch.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(days=31)
+        )
+        delivery.queue_mail(
+            template="emails/invitation_email.html",
+            subject="Convite",
+            text_body="Clique no link: {link}",
+            from_email="louvor@example.com",
+            recipients=[("ana@example.com", {"link": "https://x/ana"})],
+        )
+        self.assertEqual(
+            list(MailBatch.objects.values_list("subject", flat=True)), ["Convite"]
+        )
+
+    def test_admin_does_not_expose_recipient_context(self):
+        model_admin = admin.site._registry[MailRecipient]
+        request = RequestFactory().get("/")
+        request.user = User.objects.create_superuser(username="admin")
+        self.assertNotIn("context", model_admin.get_fields(request))
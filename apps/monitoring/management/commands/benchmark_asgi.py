@@ -0,0 +1,190 @@
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+# Rotas de leitura servidas pelas views assíncronas
+URLS = [
+    "/api/praise/me/",
+    "/api/praise/scale-history/",
+    "/api/praise/praise-lineup/next-scales/",
+    "/api/praise/praise-lineup/previous-scales/",
+    "/api/praise/dashboard/",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Sobe o projeto com gunicorn em modo síncrono (WSGI, gthread) e assíncrono "
+        "(ASGI, uvicorn) com o mesmo número de workers, aplica a mesma carga "
+        "concorrente nas rotas async e compara vazão, p50/p99 e memória dos workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=4,
+            help="Threads por worker no modo síncrono.",
+        )
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--duration", type=float, default=10.0)
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--username",
+            help="Conta existente, com membro, usada nas requisições "
+            "(padrão: a primeira ativa).",
+        )
+
+    def handle(self, *args, **options):
+        # Só leitura com uma conta existente: nada é criado no banco de produção
+        users = User.objects.filter(is_active=True, user__isnull=False).order_by("pk")
+        if options["username"]:
+            users = users.filter(username=options["username"])
+        user = users.first()
+        if user is None:
+            raise CommandError("Nenhuma conta ativa com membro para as requisições.")
+        cookie = f"access_token={signing.dumps(str(AccessToken.for_user(user)))}"
+        deployments = [
+            (
+                "sync (WSGI)",
+                [
+                    "setup.wsgi:application",
+                    "--worker-class",
+                    "gthread",
+                    "--threads",
+                    str(options["threads"]),
+                ],
+            ),
+            (
+                "async (ASGI)",
+                [
+                    "setup.asgi:application",
+                    "--worker-class",
+                    "uvicorn_worker.UvicornWorker",
+                ],
+            ),
+        ]
+        for name, arguments in deployments:
+            result = self._benchmark(arguments, cookie, options)
+            self.stdout.write(
+                f"{name:<13} {result['rps']:>8.1f} req/s  "
+                f"p50 {result['p50']:>7.1f} ms  p99 {result['p99']:>7.1f} ms  "
+                f"erros {result['errors']:>4}  "
+                f"memória dos workers {result['rss'] / 1024:>6.1f} MB"
+            )
+
+    def _benchmark(self, arguments, cookie, options):
+        port = options["port"]
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                *arguments,
+                "--workers",
+                str(options["workers"]),
+                "--bind",
+                f"127.0.0.1:{port}",
+                "--log-level",
+                "warning",
+            ],
+            cwd=settings.BASE_DIR,
+            env=os.environ.copy(),
+        )
+        try:
+            self._wait_for(port)
+            # Aquecimento: importa as views e enche o cache em todos os workers
+            self._load(port, cookie, options["concurrency"], 2.0)
+            rss = self._workers_rss(server.pid)
+            latencies, errors, elapsed = self._load(
+                port, cookie, options["concurrency"], options["duration"]
+            )
+        finally:
+            # O master encerra os workers de forma ordenada
+            server.terminate()
+            server.wait(timeout=30)
+
+        percentiles = statistics.quantiles(latencies, n=100)
+        return {
+            "rps": len(latencies) / elapsed,
+            "p50": percentiles[49],
+            "p99": percentiles[98],
+            "errors": errors,
+            "rss": rss,
+        }
+
+    def _wait_for(self, port, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"O servidor não respondeu na porta {port}.")
+
+    def _load(self, port, cookie, concurrency, duration):
+        host = next(
+            (host for host in settings.ALLOWED_HOSTS if host != "*"), "localhost"
+        )
+        headers = {"Host": host.lstrip("."), "Cookie": cookie}
+        latencies, errors = [], []
+        deadline = time.monotonic() + duration
+
+        def client(offset):
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            request = offset
+            while time.monotonic() < deadline:
+                url = URLS[request % len(URLS)]
+                request += 1
+                start = time.perf_counter()
+                try:
+                    connection.request("GET", url, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    ok = response.status == 200
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    ok = False
+                elapsed = (time.perf_counter() - start) * 1000
+                (latencies if ok else errors).append(elapsed)
+
+        started = time.monotonic()
+        threads = [
+            threading.Thread(target=client, args=(offset,))
+            for offset in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, len(errors), time.monotonic() - started
+
+    def _workers_rss(self, master_pid):
+        """
+        Soma do VmRSS (KB) dos workers do gunicorn, lido do /proc.
+        """
+        total = 0
+        for status in Path("/proc").glob("[0-9]*/status"):
+            try:
+                fields = dict(
+                    line.split(":", 1) for line in status.read_text().splitlines()
+                )
+            except (OSError, ValueError):
+                continue
+            if int(fields.get("PPid", "0").strip()) == master_pid:
+                total += int(fields.get("VmRSS", "0 kB").split()[0])
+        return total
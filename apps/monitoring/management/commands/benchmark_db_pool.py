@@ -0,0 +1,106 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import RequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.monitoring import pool
+
+URL = "/api/praise/music/"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara a latência p50/p99 de /api/praise/music/ abrindo uma conexão por "
+        "requisição (CONN_MAX_AGE=0) e reaproveitando conexões persistentes. "
+        "Rode contra o MySQL de produção/homologação: no SQLite conectar é barato."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=None,
+            help="CONN_MAX_AGE do modo persistente (padrão: o configurado, ou 300).",
+        )
+        parser.add_argument(
+            "--username",
+            help="Conta existente usada nas requisições (padrão: o primeiro ativo).",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections["default"]
+        max_age = options["max_age"]
+        if max_age is None:
+            max_age = connection.settings_dict["CONN_MAX_AGE"] or 300
+        original = connection.settings_dict["CONN_MAX_AGE"]
+
+        # Só leitura com uma conta existente: o benchmark fecha a conexão entre
+        # requisições, então não há transação para desfazer um usuário criado
+        users = User.objects.filter(is_active=True).order_by("pk")
+        if options["username"]:
+            users = users.filter(username=options["username"])
+        user = users.first()
+        if user is None:
+            raise CommandError("Nenhuma conta ativa para autenticar as requisições.")
+
+        # O Client de testes mantém a conexão aberta entre requisições; o handler
+        # WSGI real aplica o CONN_MAX_AGE como o gunicorn
+        host = next(
+            (host for host in settings.ALLOWED_HOSTS if host != "*"), "localhost"
+        )
+        factory = RequestFactory(HTTP_HOST=host.lstrip("."))
+        factory.cookies["access_token"] = signing.dumps(
+            str(RefreshToken.for_user(user).access_token)
+        )
+        try:
+            results = [
+                ("sem pool", self._run(factory, 0, options["requests"])),
+                ("persistente", self._run(factory, max_age, options["requests"])),
+            ]
+        finally:
+            connection.settings_dict["CONN_MAX_AGE"] = original
+            connection.close()
+
+        for name, (latencies, connects) in results:
+            percentiles = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                f"{name:<12} p50 {percentiles[49]:>7.2f} ms  "
+                f"p99 {percentiles[98]:>7.2f} ms  conexões abertas {connects:>4}"
+            )
+
+    def _run(self, factory, max_age, requests):
+        connection = connections["default"]
+        connection.settings_dict["CONN_MAX_AGE"] = max_age
+        # A idade máxima vale a partir da próxima conexão
+        connection.close()
+
+        before = pool.snapshot()["aliases"]["default"]["connects"]
+        handler = WSGIHandler()
+        self._request(handler, factory)  # aquecimento
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            status = self._request(handler, factory)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not status.startswith("200"):
+                raise RuntimeError(f"{URL} respondeu {status}")
+        connects = pool.snapshot()["aliases"]["default"]["connects"] - before
+        return latencies, connects
+
+    def _request(self, handler, factory):
+        statuses = []
+        response = handler(
+            factory.get(URL).environ, lambda status, headers: statuses.append(status)
+        )
+        b"".join(response)
+        # Dispara request_finished, que fecha as conexões vencidas
+        response.close()
+        return statuses[0]
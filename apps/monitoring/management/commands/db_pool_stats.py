@@ -0,0 +1,43 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.monitoring import pool
+
+
+class Command(BaseCommand):
+    help = (
+        "Mostra as estatísticas das conexões persistentes publicadas pelos "
+        "workers (checkouts, reaproveitamentos, esperas e reconexões)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--json", action="store_true", help="Saída em JSON.")
+
+    def handle(self, *args, **options):
+        workers = pool.collect()
+        summary = pool.totals(workers)
+        if options["json"]:
+            self.stdout.write(json.dumps({"workers": workers, "totals": summary}))
+            return
+
+        if not workers:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Nenhum worker publicou estatísticas (o cache é compartilhado?)."
+                )
+            )
+            return
+
+        for data in workers:
+            self._write(f"worker {data['pid']}", data)
+        self._write("total", summary)
+
+    def _write(self, label, data):
+        self.stdout.write(f"{label}: {data['checkouts']} checkouts")
+        for alias, stats in data["aliases"].items():
+            reuse = stats["reused"] / data["checkouts"] if data["checkouts"] else 0
+            self.stdout.write(
+                f"  {alias:<10} reuso {reuse:>6.1%}  conexões {stats['connects']:>5}"
+                f"  esperas {stats['waits']:>5}  reconexões {stats['reconnects']:>5}"
+            )
@@ -0,0 +1,108 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from setup.documents import LAZY_MODULES
+
+# Boot de um worker: aplicação WSGI, URLconf (views de todos os apps) e a
+# memória residente ao final, em um interpretador limpo
+BOOT_SCRIPT = """
+import json, os, resource, sys
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "setup.settings")
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+try:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1])
+except OSError:
+    pass
+print(json.dumps({
+    "rss": rss,
+    "lazy_loaded": [name for name in %r if name in sys.modules],
+}))
+"""
+
+
+def parse_importtime(output):
+    """
+    Converte a saída de `-X importtime` em (módulo, self µs, cumulativo µs,
+    profundidade); a indentação do nome indica o import que o disparou.
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            own, cumulative, name = line[len("import time:") :].split("|")
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            entries.append((name.strip(), int(own), int(cumulative), depth))
+        except ValueError:
+            # Cabeçalho "self [us] | cumulative | imported package"
+            continue
+    return entries
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede o boot de um worker em um processo novo: tempo de import por "
+        "módulo (como `python -X importtime`) e memória residente após o boot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top", type=int, default=25, help="Módulos exibidos (por tempo)."
+        )
+        parser.add_argument(
+            "--max-ms",
+            type=float,
+            default=None,
+            help="Falha se o tempo total de import passar deste valor.",
+        )
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT % (LAZY_MODULES,)],
+            cwd=settings.BASE_DIR,
+            env=os.environ.copy(),
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Falha no boot:\n{result.stderr[-2000:]}")
+
+        boot = json.loads(result.stdout.strip().splitlines()[-1])
+        entries = parse_importtime(result.stderr)
+        # Só os imports de primeiro nível, para não contar duas vezes
+        total = sum(cumulative for _, _, cumulative, depth in entries if not depth)
+
+        self.stdout.write(f"{'self [ms]':>10} {'cumulativo [ms]':>16}  módulo")
+        for name, own, cumulative, _ in sorted(
+            entries, key=lambda entry: entry[2], reverse=True
+        )[: options["top"]]:
+            self.stdout.write(f"{own / 1000:>10.1f} {cumulative / 1000:>16.1f}  {name}")
+
+        self.stdout.write(f"\nImport total: {total / 1000:.1f} ms")
+        self.stdout.write(f"RSS após o boot: {boot['rss'] / 1024:.1f} MB")
+
+        if boot["lazy_loaded"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Carregados no boot (deveriam ser sob demanda): "
+                    + ", ".join(boot["lazy_loaded"])
+                )
+            )
+        if options["max_ms"] is not None and total / 1000 > options["max_ms"]:
+            raise CommandError(
+                f"Import total de {total / 1000:.1f} ms "
+                f"acima de {options['max_ms']} ms."
+            )
@@ -0,0 +1,134 @@
+import logging
+import os
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+WORKER_KEY = "monitoring:db-pool:{pid}"
+WORKERS_KEY = "monitoring:db-pool:workers"
+
+# Intervalo (em segundos) entre as publicações das estatísticas de cada worker
+PUBLISH_INTERVAL = 10
+WORKER_TIMEOUT = 300
+
+ALIAS_FIELDS = ("reused", "connects", "waits", "reconnects")
+
+_lock = threading.Lock()
+_local = threading.local()
+_checkouts = 0
+_aliases = {}
+_last_publish = 0.0
+
+
+def _count(alias, field):
+    with _lock:
+        stats = _aliases.setdefault(alias, dict.fromkeys(ALIAS_FIELDS, 0))
+        stats[field] += 1
+
+
+@receiver(request_started)
+def checkout(sender, **kwargs):
+    """
+    Início de requisição: a thread reaproveita a conexão que já tem aberta.
+
+    Conectado depois do close_old_connections do Django, então as conexões
+    vencidas (CONN_MAX_AGE) ou inutilizáveis já foram fechadas aqui.
+    """
+    global _checkouts
+    with _lock:
+        _checkouts += 1
+    _local.in_request = True
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None:
+            _count(connection.alias, "reused")
+
+
+@receiver(connection_created)
+def connected(sender, connection, **kwargs):
+    _count(connection.alias, "connects")
+    if getattr(_local, "in_request", False):
+        # A requisição esperou o handshake (TCP, TLS e autenticação)
+        _count(connection.alias, "waits")
+
+    seen = getattr(_local, "seen", set())
+    if connection.alias in seen:
+        # Conexão anterior da thread expirou ou falhou no health check
+        _count(connection.alias, "reconnects")
+    seen.add(connection.alias)
+    _local.seen = seen
+
+
+@receiver(request_finished)
+def checkin(sender, **kwargs):
+    _local.in_request = False
+    if time.monotonic() - _last_publish >= PUBLISH_INTERVAL:
+        publish()
+
+
+def snapshot():
+    """
+    Estatísticas de conexões deste processo (worker do gunicorn).
+    """
+    with _lock:
+        aliases = {alias: dict(stats) for alias, stats in _aliases.items()}
+        checkouts = _checkouts
+    return {
+        "pid": os.getpid(),
+        "checkouts": checkouts,
+        "aliases": {
+            alias: {
+                "conn_max_age": connections[alias].settings_dict["CONN_MAX_AGE"],
+                "health_checks": connections[alias].settings_dict["CONN_HEALTH_CHECKS"],
+                **dict.fromkeys(ALIAS_FIELDS, 0),
+                **aliases.get(alias, {}),
+            }
+            for alias in connections
+        },
+    }
+
+
+def publish():
+    """
+    Grava as estatísticas deste worker no cache para o comando db_pool_stats.
+    """
+    global _last_publish
+    _last_publish = time.monotonic()
+    data = snapshot()
+    try:
+        cache.set(WORKER_KEY.format(pid=data["pid"]), data, WORKER_TIMEOUT)
+        workers = cache.get(WORKERS_KEY) or set()
+        if data["pid"] not in workers:
+            cache.set(WORKERS_KEY, workers | {data["pid"]}, None)
+    except Exception:
+        # Estatística não pode derrubar a requisição
+        logger.warning("Falha ao publicar as estatísticas do pool", exc_info=True)
+
+
+def collect():
+    """
+    Estatísticas publicadas pelos workers ativos (as dos encerrados expiram).
+    """
+    workers = cache.get(WORKERS_KEY) or set()
+    found = cache.get_many([WORKER_KEY.format(pid=pid) for pid in workers])
+    alive = {data["pid"] for data in found.values()}
+    if alive != workers:
+        cache.set(WORKERS_KEY, alive, None)
+    return sorted(found.values(), key=lambda data: data["pid"])
+
+
+def totals(workers):
+    result = {"checkouts": 0, "aliases": {}}
+    for data in workers:
+        result["checkouts"] += data["checkouts"]
+        for alias, stats in data["aliases"].items():
+            summed = result["aliases"].setdefault(alias, dict.fromkeys(ALIAS_FIELDS, 0))
+            for field in ALIAS_FIELDS:
+                summed[field] += stats[field]
+    return result
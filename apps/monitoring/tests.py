@@ -0,0 +1,153 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from apps.accounts.models import MemberFunctions
+from setup import replica
+
+from . import pool
+
+
+class DatabasePoolTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_counts_reused_connections_and_reconnects(self):
+        before = pool.snapshot()
+        connection.ensure_connection()
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        self.client.get("/api/praise/music/")
+        # Simula a thread abrindo uma conexão nova depois de perder a anterior
+        connection_created.send(sender=connection.__class__, connection=connection)
+        connection_created.send(sender=connection.__class__, connection=connection)
+        after = pool.snapshot()
+
+        self.assertEqual(after["checkouts"] - before["checkouts"], 1)
+        stats, previous = after["aliases"]["default"], before["aliases"]["default"]
+        self.assertEqual(stats["reused"] - previous["reused"], 1)
+        self.assertEqual(stats["connects"] - previous["connects"], 2)
+        self.assertGreaterEqual(stats["reconnects"] - previous["reconnects"], 1)
+
+    def test_debug_endpoint_is_admin_only(self):
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        response = self.client.get("/api/praise/debug/db-pool/")
+        self.assertEqual(response.status_code, 403)
+
+        admin = User.objects.create_user(username="admin", is_staff=True)
+        self.client.force_authenticate(admin)
+        pool.publish()
+        response = self.client.get("/api/praise/debug/db-pool/")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn("default", data["current"]["aliases"])
+        self.assertEqual(
+            [worker["pid"] for worker in data["workers"]], [data["current"]["pid"]]
+        )
+
+
+class FunctionNamesView(replica.ReplicaReadMixin, APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        if request.query_params.get("touch"):
+            # Escrita interna de uma leitura (ex.: contador recalculado)
+            MemberFunctions.objects.create(function_name="Interna")
+        if request.query_params.get("primary"):
+            with replica.primary():
+                return Response(
+                    list(MemberFunctions.objects.values_list("function_name"))
+                )
+        return Response(list(MemberFunctions.objects.values_list("function_name")))
+
+    def post(self, request):
+        MemberFunctions.objects.create(function_name=request.data["name"])
+        return self.get(request)
+
+
+class ReplicaRouterTestCase(TransactionTestCase):
+    """
+    Usa dois bancos SQLite: o default dos testes e um arquivo como réplica
+    (em um alias próprio, para não conflitar com MYSQL_REPLICA_URL).
+    """
+
+    alias = "replica_test"
+
+    def setUp(self):
+        patcher = mock.patch.object(replica, "REPLICA_ALIAS", self.alias)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        databases = connections.configure_settings(
+            {
+                "default": connections.settings["default"],
+                self.alias: {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": str(Path(directory.name) / "replica.sqlite3"),
+                },
+            }
+        )
+        connections.settings[self.alias] = databases[self.alias]
+        self.addCleanup(self.remove_replica)
+
+        with connections[self.alias].schema_editor() as editor:
+            editor.create_model(MemberFunctions)
+        MemberFunctions.objects.using(self.alias).create(function_name="Réplica")
+        MemberFunctions.objects.create(function_name="Primário")
+
+        replica.reset_lag_check()
+        self.view = replica.ReplicaMiddleware(FunctionNamesView.as_view())
+        self.factory = RequestFactory()
+
+    def remove_replica(self):
+        connections[self.alias].close()
+        del connections[self.alias]
+        del connections.settings[self.alias]
+        replica.reset_lag_check()
+
+    def names(self, response):
+        response.render()
+        return [row[0] for row in response.data]
+
+    def test_safe_reads_go_to_the_replica(self):
+        self.assertEqual(self.names(self.view(self.factory.get("/"))), ["Réplica"])
+
+    def test_primary_block_ignores_the_replica(self):
+        response = self.view(self.factory.get("/", {"primary": "1"}))
+        self.assertEqual(self.names(response), ["Primário"])
+        self.assertNotIn(replica.PIN_COOKIE, response.cookies)
+
+    def test_pins_to_primary_after_a_write(self):
+        response = self.view(self.factory.post("/", {"name": "Vocal"}))
+        self.assertEqual(self.names(response), ["Primário", "Vocal"])
+        cookie = response.cookies[replica.PIN_COOKIE]
+        self.assertEqual(cookie["samesite"], "None")
+        self.assertTrue(cookie["secure"])
+        self.assertTrue(cookie["httponly"])
+
+        self.factory.cookies[replica.PIN_COOKIE] = "1"
+        self.assertEqual(
+            self.names(self.view(self.factory.get("/"))), ["Primário", "Vocal"]
+        )
+
+    def test_internal_writes_on_safe_requests_do_not_pin(self):
+        response = self.view(self.factory.get("/", {"touch": "1"}))
+        # A própria requisição lê o que gravou, mas o cliente não fica fixado
+        self.assertEqual(self.names(response), ["Interna", "Primário"])
+        self.assertNotIn(replica.PIN_COOKIE, response.cookies)
+
+    def test_falls_back_to_primary_when_replica_lags(self):
+        with mock.patch.object(replica, "replica_lag", return_value=60):
+            response = self.view(self.factory.get("/"))
+        self.assertEqual(self.names(response), ["Primário"])
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import DatabasePoolView
+
+urlpatterns = [
+    path("debug/db-pool/", DatabasePoolView.as_view(), name="db-pool"),
+]
@@ -0,0 +1,62 @@
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import pool
+
+ALIAS_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "conn_max_age": openapi.Schema(type=openapi.TYPE_INTEGER, nullable=True),
+        "health_checks": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+        "reused": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "connects": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "waits": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "reconnects": openapi.Schema(type=openapi.TYPE_INTEGER),
+    },
+)
+
+WORKER_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "pid": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "checkouts": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "aliases": openapi.Schema(
+            type=openapi.TYPE_OBJECT, additional_properties=ALIAS_SCHEMA
+        ),
+    },
+)
+
+
+class DatabasePoolView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Estatísticas das conexões persistentes com o banco: as do worker que "
+            "atendeu a requisição e as publicadas pelos demais workers. Apenas "
+            "administradores."
+        ),
+        responses={
+            200: openapi.Response(
+                description="Estatísticas do pool de conexões",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "current": WORKER_SCHEMA,
+                        "workers": openapi.Schema(
+                            type=openapi.TYPE_ARRAY, items=WORKER_SCHEMA
+                        ),
+                    },
+                ),
+            )
+        },
+    )
+    def get(self, request):
+        return Response(
+            {"current": pool.snapshot(), "workers": pool.collect()},
+            status=status.HTTP_200_OK,
+        )
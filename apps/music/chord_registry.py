@@ -0,0 +1,93 @@
+import threading
+import uuid
+
+from django.core.cache import cache
+
+from setup import conditional
+
+from .models import MusicChord
+
+# Versão atual dos acordes, compartilhada entre os processos (web, admin e o
+# worker que importa PDFs) e trocada a cada escrita em MusicChord
+VERSION_KEY = "music:chords:version"
+
+# Cache local do processo: nome do acorde -> id de MusicChord, válido enquanto a
+# versão compartilhada for _version
+_chord_ids = {}
+_version = None
+_lock = threading.Lock()
+
+
+def clear_cache():
+    """
+    Invalida o cache de acordes de todos os processos (chamado pelos sinais de
+    escrita de MusicChord).
+    """
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+    with _lock:
+        _chord_ids.clear()
+
+
+def _sync_version():
+    """
+    Descarta o cache local se outro processo alterou os acordes; retorna a versão.
+    """
+    global _version
+    version = cache.get_or_set(VERSION_KEY, uuid.uuid4().hex, None)
+    with _lock:
+        if version != _version:
+            _chord_ids.clear()
+            _version = version
+    return version
+
+
+def _fetch(names):
+    rows = dict(
+        MusicChord.objects.filter(chord_name__in=names).values_list("chord_name", "id")
+    )
+    # O MySQL compara sem diferenciar maiúsculas (ex.: "CM7" e "Cm7")
+    folded = {name.casefold(): chord_id for name, chord_id in rows.items()}
+    return {
+        name: rows.get(name, folded.get(name.casefold()))
+        for name in names
+        if name in rows or name.casefold() in folded
+    }
+
+
+def resolve_chord_ids(names):
+    """
+    Resolve uma coleção de nomes de acordes para ids, criando os que faltarem.
+
+    Os acordes já conhecidos vêm do cache do processo (enquanto a versão
+    compartilhada não mudar); os demais são buscados em uma única consulta e
+    os inexistentes inseridos com um único bulk_create (e relidos em uma
+    consulta, já que o MySQL não devolve os ids inseridos).
+    Retorna um dicionário nome -> id na ordem recebida, sem os nomes maiores
+    que MusicChord.chord_name.
+    """
+    max_length = MusicChord._meta.get_field("chord_name").max_length
+    names = [name for name in dict.fromkeys(names) if len(name) <= max_length]
+    version = _sync_version()
+
+    with _lock:
+        resolved = {name: _chord_ids[name] for name in names if name in _chord_ids}
+    missing = [name for name in names if name not in resolved]
+
+    if missing:
+        found = _fetch(missing)
+        new = [name for name in missing if name not in found]
+        if new:
+            MusicChord.objects.bulk_create(
+                [MusicChord(chord_name=name) for name in new], ignore_conflicts=True
+            )
+            # bulk_create não dispara os sinais de escrita
+            conditional.invalidate(MusicChord)
+            found.update(_fetch(new))
+
+        resolved.update(found)
+        with _lock:
+            # Uma escrita de outro processo durante a busca descartou o cache
+            if _version == version:
+                _chord_ids.update(found)
+
+    return {name: resolved[name] for name in names if name in resolved}
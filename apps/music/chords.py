@@ -0,0 +1,90 @@
+import re
+from functools import lru_cache
+
+from pychord.constants.qualities import DEFAULT_QUALITIES
+from pychord.utils import NOTE_VAL_DICT
+
+# Tamanho máximo do cache de tokens já classificados
+CHORD_CACHE_SIZE = 4096
+
+
+def _alternation(values):
+    """
+    Monta uma alternância regex priorizando os valores mais longos.
+    """
+    ordered = sorted(set(values), key=len, reverse=True)
+    return "|".join(re.escape(value) for value in ordered)
+
+
+# Extensões entre parênteses, ex.: "7(9)", "(b5)"
+_TENSIONS_RE = re.compile(r"\([^)]*\)")
+
+# Inversões numéricas, ex.: "C/1"
+_INVERSION_RE = re.compile(r"/[0-9]+")
+
+_NOTES = _alternation(NOTE_VAL_DICT)
+_QUALITIES = _alternation(quality for quality, _ in DEFAULT_QUALITIES)
+
+# O que vem depois da tônica: qualidade/extensões e baixo invertido
+QUALITY_RE = re.compile(rf"(?P<quality>{_QUALITIES})(?:/(?P<bass>{_NOTES}))?")
+
+
+def split_token(token):
+    """
+    Separa um token em tônica e restante, sem extensões entre parênteses nem
+    inversões numéricas.
+
+    A tônica é separada antes de remover a inversão, como no pychord: em
+    "D/3b" o "b" que sobra é qualidade de D, e não acidente da tônica.
+    """
+    if "(" in token:
+        token = _TENSIONS_RE.sub("", token)
+    token = token.strip()
+
+    root_size = 2 if len(token) > 1 and token[1] in ("b", "#") else 1
+    root, rest = token[:root_size], token[root_size:]
+    if "/" in rest:
+        rest = _INVERSION_RE.sub("", rest)
+
+    return root, rest
+
+
+@lru_cache(maxsize=CHORD_CACHE_SIZE)
+def is_chord(token):
+    """
+    Verifica se um token representa um acorde válido, inclusive com extensões.
+    """
+    root, rest = split_token(token)
+    return root in NOTE_VAL_DICT and QUALITY_RE.fullmatch(rest) is not None
+
+
+def classify(tokens):
+    """
+    Classifica uma sequência de tokens, retornando pares (token, é_acorde).
+    """
+    return [(token, is_chord(token)) for token in tokens]
+
+
+def split_line(line):
+    """
+    Separa uma linha em acordes e palavras em uma única passagem.
+    """
+    chords = []
+    words = []
+    for token in line.split():
+        (chords if is_chord(token) else words).append(token)
+    return chords, words
+
+
+def strip_chords(line):
+    """
+    Remove os acordes de uma linha, mantendo apenas as palavras.
+    """
+    return " ".join(token for token in line.split() if not is_chord(token))
+
+
+def find_chords(text):
+    """
+    Retorna os acordes distintos de um texto, na ordem em que aparecem.
+    """
+    return list(dict.fromkeys(token for token in text.split() if is_chord(token)))
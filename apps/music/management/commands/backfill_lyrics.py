@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from apps.music.models import Music
+from apps.music import search
+from setup import conditional
+
+
+class Command(BaseCommand):
+    help = "Recalcula a letra sem acordes, os acordes detectados e o hash das músicas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Quantidade de músicas lidas e gravadas por lote.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        fields = ["plain_lyrics", "detected_chords", "text_hash"]
+
+        pending = []
+        updated = 0
+        musics = Music.objects.only("id", "music_text", "text_hash").iterator(
+            chunk_size=batch_size
+        )
+        for music in musics:
+            # Só músicas cujo texto mudou desde o último cálculo
+            if music.refresh_lyrics():
+                pending.append(music)
+
+            if len(pending) >= batch_size:
+                updated += Music.objects.bulk_update(pending, fields)
+                pending = []
+
+        if pending:
+            updated += Music.objects.bulk_update(pending, fields)
+
+        if updated:
+            # bulk_update não dispara os sinais (a busca usa a letra)
+            search.invalidate_index()
+            conditional.invalidate(Music)
+        self.stdout.write(self.style.SUCCESS(f"{updated} música(s) atualizada(s)."))
@@ -0,0 +1,72 @@
+import re
+import time
+
+from django.core.management.base import BaseCommand
+from pychord import Chord
+
+from apps.music import chords
+
+SAMPLE_SHEET = """
+[Intro] G D/F# Em7 C9
+G            D/F#          Em7
+Tu és santo, Senhor, digno de louvor
+C9                 Am7(11)      D4  D
+Toda a terra se prostra diante de Ti
+[Refrão]
+G  Bm7(b5)  E7(9-)  Am7  Cm6  G/B  A7sus4  Dadd9  F#m7-5  Bb°
+Aleluia, aleluia, ao Rei dos reis (2x)
+"""
+
+
+def legacy_is_chord(value):
+    # Implementação anterior, baseada em pychord
+    clean_value = re.sub(r"\([^)]*\)", "", value).strip()
+
+    try:
+        Chord(clean_value)
+        return True
+    except ValueError:
+        return False
+
+
+class Command(BaseCommand):
+    help = "Compara a vazão (tokens/s) da detecção de acordes antiga e da nova."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=500,
+            help="Quantas vezes a cifra de exemplo é repetida no documento.",
+        )
+
+    def handle(self, *args, **options):
+        tokens = (SAMPLE_SHEET * options["repeat"]).split()
+
+        results = {
+            "pychord": self._measure(lambda: [legacy_is_chord(t) for t in tokens]),
+            # Sem o lru_cache: cada token é analisado pela gramática
+            "chords (frio)": self._measure(
+                lambda: [(t, chords.is_chord.__wrapped__(t)) for t in tokens]
+            ),
+            # Todos os tokens já no lru_cache
+            "chords (quente)": self._measure(
+                lambda: chords.classify(tokens), warm_up=True
+            ),
+        }
+
+        for name, elapsed in results.items():
+            self.stdout.write(
+                f"{name:<16} {len(tokens) / elapsed:>14,.0f} tokens/s "
+                f"({elapsed * 1000:.1f} ms)"
+            )
+
+        speedup = results["pychord"] / results["chords (frio)"]
+        self.stdout.write(self.style.SUCCESS(f"Ganho sem cache: {speedup:.1f}x"))
+
+    def _measure(self, func, warm_up=False):
+        if warm_up:
+            func()
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-18 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music", "0007_alter_music_category_alter_music_music_chord"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="music",
+            name="detected_chords",
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name="music",
+            name="plain_lyrics",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="music",
+            name="text_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
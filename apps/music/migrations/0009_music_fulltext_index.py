@@ -0,0 +1,34 @@
+from django.db import migrations
+
+FULLTEXT_INDEXES = {
+    "music_music_title_ft": "music_title",
+    "music_music_search_ft": "music_title, author, plain_lyrics",
+}
+
+
+def create_fulltext_indexes(apps, schema_editor):
+    # FULLTEXT só existe no MySQL; nos demais bancos a busca usa o índice em memória
+    if schema_editor.connection.vendor != "mysql":
+        return
+    for name, columns in FULLTEXT_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE FULLTEXT INDEX {name} ON music_music ({columns})"
+        )
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    for name in FULLTEXT_INDEXES:
+        schema_editor.execute(f"DROP INDEX {name} ON music_music")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music", "0008_music_plain_lyrics"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_indexes, drop_fulltext_indexes),
+    ]
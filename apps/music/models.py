@@ -1,8 +1,15 @@
+import hashlib
+
 from django.db import models
 from tinymce.models import HTMLField
 
 from apps.accounts.models import TimeStampedModel
 
+from .utils import extract_lyrics_and_chords
+
+# Incrementar quando a extração da letra mudar, para recalcular os campos derivados
+LYRICS_VERSION = 1
+
 
 class MusicCategory(models.Model):
     category_name = models.CharField(
@@ -29,6 +36,11 @@ class Music(TimeStampedModel):
     music_text = HTMLField()
     music_link = models.URLField(max_length=255, blank=True)
 
+    # Campos derivados de music_text, recalculados apenas quando o texto muda
+    plain_lyrics = models.TextField(blank=True, editable=False)
+    detected_chords = models.JSONField(default=list, blank=True, editable=False)
+    text_hash = models.CharField(max_length=64, blank=True, editable=False)
+
     class Meta:
         indexes = [
             models.Index(fields=["music_title"]),
@@ -38,3 +50,34 @@ class Music(TimeStampedModel):
 
     def __str__(self) -> str:
         return self.music_title
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if (update_fields is None or "music_text" in update_fields) and (
+            self.refresh_lyrics()
+        ):
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields,
+                    "plain_lyrics",
+                    "detected_chords",
+                    "text_hash",
+                }
+        super().save(*args, **kwargs)
+
+    def refresh_lyrics(self):
+        """
+        Recalcula a letra sem acordes e os acordes detectados se music_text mudou.
+        Retorna True quando os campos derivados foram atualizados.
+        """
+        text_hash = hashlib.sha256(
+            f"{LYRICS_VERSION}:{self.music_text}".encode()
+        ).hexdigest()
+        if text_hash == self.text_hash:
+            return False
+
+        self.plain_lyrics, self.detected_chords = extract_lyrics_and_chords(
+            self.music_text
+        )
+        self.text_hash = text_hash
+        return True
@@ -0,0 +1,54 @@
+import hashlib
+import json
+import uuid
+
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from setup import replica
+from setup.pagination import KeysetPagination
+
+# Chave com a versão atual das contagens de músicas (trocada a cada escrita)
+COUNT_VERSION_KEY = "music:count:version"
+
+# Parâmetros que não mudam o conjunto filtrado (e portanto a contagem)
+PAGINATION_PARAMS = ("cursor", "page_size", "stream")
+
+
+def invalidate_counts():
+    cache.set(COUNT_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def cached_count(queryset, request):
+    """
+    Contagem do conjunto filtrado, guardada no cache até a próxima escrita em Music.
+    """
+    version = cache.get_or_set(COUNT_VERSION_KEY, uuid.uuid4().hex, None)
+    filters = sorted(
+        (key, value)
+        for key, value in request.query_params.items()
+        if key not in PAGINATION_PARAMS
+    )
+    digest = hashlib.sha256(json.dumps(filters).encode()).hexdigest()[:32]
+    key = f"music:count:{version}:{digest}"
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, replica.cache_timeout(None))
+    return count
+
+
+class MusicKeysetPagination(KeysetPagination):
+    """
+    Paginação por cursor (keyset) sobre (music_title, id), com as contagens do
+    conjunto filtrado na resposta.
+    """
+
+    ordering = ("music_title", "id")
+    results_key = "musics"
+
+    def get_paginated_response(self, data, counts=None):
+        return Response(
+            {"counts": counts, "next": self.get_next_link(), "musics": data}
+        )
@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+from setup import documents
+
+from .chords import find_chords
+
+# Quantidade de páginas processadas por tarefa do pool
+PAGE_BATCH_SIZE = 8
+
+_executor = None
+
+
+class InvalidPdf(Exception):
+    """
+    O arquivo não pôde ser aberto como PDF (corrompido ou de outro tipo).
+    """
+
+
+class PdfExtraction:
+    """
+    Resultado da extração de um PDF: texto, acordes e tempo gasto por página.
+    """
+
+    def __init__(self, pages):
+        self.text = "".join(text for text, _, _ in pages)
+        self.chords = list(
+            dict.fromkeys(chord for _, chords, _ in pages for chord in chords)
+        )
+        self.page_timings = [elapsed for _, _, elapsed in pages]
+
+    def timing_header(self):
+        """
+        Formata os tempos por página (ms) para o cabeçalho de debug.
+        """
+        return ",".join(f"{elapsed * 1000:.1f}" for elapsed in self.page_timings)
+
+
+def get_executor():
+    """
+    Retorna o pool de processos compartilhado pelo worker, criando-o no primeiro uso.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PDF_EXTRACTION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def spool_upload(file_obj):
+    """
+    Retorna a origem do PDF sem copiar o upload inteiro para um único bytes.
+
+    Uploads grandes já são gravados em arquivo temporário pelo Django
+    (FILE_UPLOAD_MAX_MEMORY_SIZE), então usamos o caminho do arquivo; os
+    pequenos continuam em memória e são lidos através de um memoryview.
+    Caminhos (ex.: arquivo de origem de um Job) são usados diretamente.
+    """
+    if isinstance(file_obj, (str, os.PathLike)):
+        return file_obj
+
+    if hasattr(file_obj, "temporary_file_path"):
+        return file_obj.temporary_file_path()
+
+    file_obj.seek(0)
+    return file_obj.file.getbuffer()
+
+
+def open_document(source):
+    try:
+        return documents.open_pdf(source)
+    except Exception as error:
+        raise InvalidPdf(str(error)) from error
+
+
+def check_pdf(file_obj):
+    """
+    Confere que o upload abre como PDF, sem ler as páginas; levanta InvalidPdf.
+    """
+    source = spool_upload(file_obj)
+    try:
+        with open_document(source):
+            pass
+    finally:
+        if isinstance(source, memoryview):
+            source.release()
+        file_obj.seek(0)
+
+
+def _read_pages(document, start, stop):
+    pages = []
+    for number in range(start, stop):
+        started = time.perf_counter()
+        text = document.load_page(number).get_text("text")  # preserva quebras de linha
+        pages.append((text, find_chords(text), time.perf_counter() - started))
+    return pages
+
+
+def _extract_batch(path, start, stop):
+    # Executado nos processos do pool: cada um abre sua própria cópia do documento
+    with documents.open_pdf(path) as document:
+        return _read_pages(document, start, stop)
+
+
+def extract_pdf(file_obj):
+    """
+    Extrai o texto e os acordes de um PDF enviado, página a página.
+
+    Documentos com mais de PAGE_BATCH_SIZE páginas gravados em disco são
+    divididos em lotes processados em paralelo; os resultados são unidos na
+    ordem original das páginas.
+    """
+    source = spool_upload(file_obj)
+
+    with open_document(source) as document:
+        page_count = document.page_count
+        if isinstance(source, memoryview) or page_count <= PAGE_BATCH_SIZE:
+            return PdfExtraction(_read_pages(document, 0, page_count))
+
+    starts = range(0, page_count, PAGE_BATCH_SIZE)
+    batches = get_executor().map(
+        _extract_batch,
+        [source] * len(starts),
+        starts,
+        [min(start + PAGE_BATCH_SIZE, page_count) for start in starts],
+    )
+    return PdfExtraction([page for batch in batches for page in batch])
@@ -0,0 +1,71 @@
+from django.db.models import Count
+
+from apps.dashboard.rankings import cached_ranking, window_range
+
+from .models import Music
+
+NAMESPACE = "most_played"
+DEFAULT_WINDOW_MONTHS = 6
+
+# Caminho de Music até a escala em que a música foi tocada
+LINEUP_LOOKUP = "playlist__praiselineup"
+
+# Agrupamentos extras aceitos: nome -> campo agrupado
+BREAKDOWNS = {
+    "category": "category__category_name",
+    "author": "author",
+}
+
+
+def _played_in_window(months):
+    # Cada escala da janela em que a playlist foi usada conta como uma execução
+    start, end = window_range(months)
+    return Music.objects.filter(
+        **{f"{LINEUP_LOOKUP}__lineup_date__range": (start, end)}
+    ).order_by()
+
+
+def compute_most_played(months=DEFAULT_WINDOW_MONTHS, limit=10, breakdowns=()):
+    """
+    Ranking das músicas mais tocadas nas escalas dos últimos `months` meses.
+
+    Uma consulta agrupada para o ranking e uma por agrupamento extra, já na
+    ordem final (total decrescente, depois título).
+    """
+    top_musics = (
+        _played_in_window(months)
+        .values("id", "music_title", "author")
+        .annotate(total=Count(LINEUP_LOOKUP))
+        .order_by("-total", "music_title", "id")[:limit]
+    )
+    ranking = {
+        "top_musics": [
+            {
+                "id": item["id"],
+                "music": item["music_title"],
+                "author": item["author"],
+                "total": item["total"],
+            }
+            for item in top_musics
+        ]
+    }
+
+    for breakdown in breakdowns:
+        field = BREAKDOWNS[breakdown]
+        groups = (
+            _played_in_window(months)
+            .filter(**{f"{field}__isnull": False})
+            .values(field)
+            .annotate(total=Count(LINEUP_LOOKUP))
+            .order_by("-total", field)[:limit]
+        )
+        ranking[f"by_{breakdown}"] = [
+            {breakdown: item[field], "total": item["total"]} for item in groups
+        ]
+    return ranking
+
+
+def most_played(months=DEFAULT_WINDOW_MONTHS, limit=10, breakdowns=()):
+    return cached_ranking(
+        NAMESPACE, compute_most_played, months, limit, tuple(breakdowns)
+    )
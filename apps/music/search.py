@@ -0,0 +1,169 @@
+import heapq
+import re
+import threading
+import unicodedata
+import uuid
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from .models import Music
+
+# Peso de cada campo na relevância: título, autor e letra
+FIELD_WEIGHTS = (3, 2, 1)
+
+# Campos carregados para os resultados (autocompletar não precisa da cifra)
+SEARCH_RESULT_FIELDS = ("id", "music_title", "author", "music_tone", "music_link")
+
+# Versão do índice em memória, compartilhada entre os processos e trocada a cada
+# escrita em Music
+INDEX_VERSION_KEY = "music:search:version"
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize(text):
+    """
+    Remove acentos e diferenças de maiúsculas (ex.: "Coração" -> "coracao").
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(normalize(text))
+
+
+class InvertedIndex:
+    """
+    Índice invertido em memória (fallback para bancos sem FULLTEXT, como o SQLite).
+
+    Cada termo aponta para {id da música: peso}; a lista ordenada de termos
+    permite a busca por prefixo com bisect.
+    """
+
+    def __init__(self, rows):
+        self.postings = defaultdict(dict)
+        for music_id, *fields in rows:
+            for weight, text in zip(FIELD_WEIGHTS, fields):
+                for token in tokenize(text or ""):
+                    scores = self.postings[token]
+                    scores[music_id] = scores.get(music_id, 0) + weight
+        self.terms = sorted(self.postings)
+
+    def _match_prefix(self, prefix):
+        matches = defaultdict(int)
+        index = bisect_left(self.terms, prefix)
+        while index < len(self.terms) and self.terms[index].startswith(prefix):
+            for music_id, weight in self.postings[self.terms[index]].items():
+                matches[music_id] += weight
+            index += 1
+        return matches
+
+    def search(self, query, limit):
+        scores = None
+        for term in tokenize(query):
+            matches = self._match_prefix(term)
+            if scores is None:
+                scores = matches
+            else:
+                # Todos os termos precisam aparecer na música
+                scores = {
+                    music_id: scores[music_id] + weight
+                    for music_id, weight in matches.items()
+                    if music_id in scores
+                }
+            if not scores:
+                return []
+        return heapq.nlargest(limit, (scores or {}).items(), key=lambda item: item[1])
+
+
+_index = None
+_index_version = None
+_lock = threading.Lock()
+
+
+def invalidate_index():
+    """
+    Descarta o índice em memória de todos os processos (chamado pelos sinais de
+    escrita de Music e depois de atualizações em lote).
+    """
+    global _index
+    cache.set(INDEX_VERSION_KEY, uuid.uuid4().hex, None)
+    with _lock:
+        _index = None
+
+
+def get_index():
+    """
+    Retorna o índice em memória, reconstruindo-o se a versão compartilhada mudou.
+    """
+    global _index, _index_version
+    version = cache.get_or_set(INDEX_VERSION_KEY, uuid.uuid4().hex, None)
+    with _lock:
+        if _index is None or _index_version != version:
+            _index = InvertedIndex(
+                Music.objects.values_list(
+                    "id", "music_title", "author", "plain_lyrics"
+                ).order_by()
+            )
+            _index_version = version
+        return _index
+
+
+def mysql_queryset(query):
+    """
+    Consulta FULLTEXT com pares (id, relevância), ou None se não houver termos.
+    """
+    # Cada termo é obrigatório e buscado por prefixo; a collation padrão do MySQL 8
+    # (utf8mb4_0900_ai_ci) já ignora acentos e maiúsculas
+    terms = tokenize(query)
+    if not terms:
+        return None
+    boolean_query = " ".join(f"+{term}*" for term in terms)
+
+    relevance = RawSQL(
+        "MATCH (music_title) AGAINST (%s IN BOOLEAN MODE) * 3 + "
+        "MATCH (music_title, author, plain_lyrics) AGAINST (%s IN BOOLEAN MODE)",
+        [boolean_query, boolean_query],
+    )
+    return (
+        Music.objects.annotate(relevance=relevance)
+        .filter(relevance__gt=0)
+        .order_by("-relevance")
+        .values_list("id", "relevance")
+    )
+
+
+def _mysql_search(query, limit):
+    queryset = mysql_queryset(query)
+    return [] if queryset is None else list(queryset[:limit])
+
+
+def search_music_ids(query, limit=20):
+    """
+    Retorna pares (id da música, relevância) ordenados da mais relevante para a menos.
+    """
+    if connection.vendor == "mysql":
+        return _mysql_search(query, limit)
+    return get_index().search(query, limit)
+
+
+def search_musics(query, limit=20):
+    """
+    Retorna as músicas encontradas, em ordem de relevância, com o atributo `relevance`.
+    """
+    ranked = search_music_ids(query, limit)
+    musics = Music.objects.only(*SEARCH_RESULT_FIELDS).in_bulk(
+        [music_id for music_id, _ in ranked]
+    )
+    results = []
+    for music_id, relevance in ranked:
+        if music_id in musics:
+            music = musics[music_id]
+            music.relevance = float(relevance)
+            results.append(music)
+    return results
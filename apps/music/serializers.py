@@ -78,6 +78,21 @@ class MusicSerializers(serializers.ModelSerializer):
         return instance
 
 
+class MusicSearchSerializers(serializers.ModelSerializer):
+    relevance = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Music
+        fields = [
+            "id",
+            "music_title",
+            "author",
+            "music_tone",
+            "music_link",
+            "relevance",
+        ]
+
+
 class UploadPdfSerializer(serializers.Serializer):
     file = serializers.FileField(required=True)
 
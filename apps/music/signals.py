@@ -0,0 +1,44 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.dashboard import rankings as dashboard_rankings
+from apps.lineup.models import PraiseLineup
+from apps.playlist.models import Playlist
+from setup import conditional
+
+from . import chord_registry, pagination, rankings, search
+from .models import Music, MusicCategory, MusicChord
+
+
+@receiver([post_save, post_delete], sender=MusicChord)
+def invalidate_chord_registry(sender, **kwargs):
+    chord_registry.clear_cache()
+
+
+@receiver([post_save, post_delete], sender=Music)
+def invalidate_search_index(sender, **kwargs):
+    search.invalidate_index()
+
+
+@receiver([post_save, post_delete], sender=Music)
+@receiver(m2m_changed, sender=Music.category.through)
+def invalidate_music_counts(sender, **kwargs):
+    pagination.invalidate_counts()
+
+
+@receiver([post_save, post_delete], sender=Music)
+@receiver([post_save, post_delete], sender=PraiseLineup)
+@receiver(post_delete, sender=Playlist)
+@receiver(m2m_changed, sender=Playlist.music.through)
+def invalidate_most_played(sender, **kwargs):
+    # Data ou playlist da escala, músicas da playlist e título/autor da música
+    dashboard_rankings.invalidate(rankings.NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=Music)
+@receiver([post_save, post_delete], sender=MusicCategory)
+@receiver([post_save, post_delete], sender=MusicChord)
+@receiver(m2m_changed, sender=Music.category.through)
+@receiver(m2m_changed, sender=Music.music_chord.through)
+def invalidate_collection_versions(sender, **kwargs):
+    conditional.invalidate(sender)
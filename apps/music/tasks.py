@@ -0,0 +1,37 @@
+from django.conf import settings
+
+from apps.jobs.registry import PermanentError, source_path, task
+
+from .chord_registry import resolve_chord_ids
+from .pdf import InvalidPdf, extract_pdf
+
+
+def import_pdf(source):
+    """
+    Extrai o PDF, cadastra os acordes encontrados e monta o conteúdo para o TinyMCE.
+    """
+    extraction = extract_pdf(source)
+
+    # Resolve os ids dos acordes, cadastrando de uma vez os que não existem
+    chord_ids = resolve_chord_ids(extraction.chords)
+
+    # Mesma ordem nas duas listas; nomes longos demais para MusicChord ficam fora
+    result = {
+        "chords": list(chord_ids),
+        "music_chord_ids": list(chord_ids.values()),
+        "html": f"<pre>{extraction.text.strip()}</pre>",
+    }
+    if settings.DEBUG:
+        # Tempo de extração de cada página, em milissegundos
+        result["page_timings"] = extraction.timing_header()
+    return result
+
+
+@task("music.import_pdf", timeout=120, max_attempts=2)
+def import_pdf_task(job):
+    try:
+        # Em disco, PDFs grandes são extraídos em paralelo pelo pool de processos
+        with source_path(job) as path:
+            return import_pdf(path)
+    except InvalidPdf as error:
+        raise PermanentError(f"Erro ao processar PDF: {error}") from error
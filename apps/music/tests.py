@@ -1,3 +1,454 @@
-from django.test import TestCase
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import fitz
+from dateutil.relativedelta import relativedelta
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.lineup.models import PraiseLineup
+from apps.playlist.models import Playlist
+from setup.testing import QueryBudgetMixin
+
+from . import chord_registry, models, pdf, search
+from .chords import find_chords, is_chord, split_line, strip_chords
+from .models import Music, MusicCategory, MusicChord
+from .rankings import compute_most_played, most_played
+from .search import search_musics
+from .tasks import import_pdf
+from .management.commands.benchmark_chords import SAMPLE_SHEET, legacy_is_chord
+
+GOLDEN_TOKENS = [
+    "C",
+    "Cm",
+    "C#m7",
+    "Dbmaj7",
+    "Eb",
+    "E#",
+    "Fb",
+    "F#m7-5",
+    "G/B",
+    "D/F#",
+    "Am7/G",
+    "A7sus4",
+    "Dadd9",
+    "C9",
+    "C/E/G",
+    "C/",
+    "C7/9",
+    "C/1/E",
+    "D/3b",
+    "D/3b2",
+    "E/46bm",
+    "D/3#",
+    "Bb/2b",
+    "G/4m",
+    "/1C",
+    "Am7(11)",
+    "E7(9-)",
+    "(2x)",
+    "C(",
+    "C)",
+    "Bb°",
+    "H7",
+    "Amor",
+    "Deus",
+    "Em",
+    "É",
+    "[Refrão]",
+    "",
+]
+
+
+class ChordClassifierTestCase(SimpleTestCase):
+    def test_matches_pychord_on_golden_corpus(self):
+        tokens = GOLDEN_TOKENS + SAMPLE_SHEET.split()
+        for token in tokens:
+            with self.subTest(token=token):
+                self.assertEqual(is_chord(token), legacy_is_chord(token))
+
+    def test_batch_api(self):
+        self.assertEqual(
+            split_line("G  Tu és santo D/F#"), (["G", "D/F#"], ["Tu", "és", "santo"])
+        )
+        self.assertEqual(strip_chords("Em7 Aleluia C9 aleluia"), "Aleluia aleluia")
+        self.assertEqual(find_chords("G D G Em\nG Am"), ["G", "D", "Em", "Am"])
+
+
+class MusicLyricsTestCase(TestCase):
+    def setUp(self):
+        self.music = Music.objects.create(
+            music_title="Santo", author="Autor", music_tone="G", music_text="G\nSanto"
+        )
+
+    def test_derived_fields_are_recomputed_only_when_text_changes(self):
+        self.assertEqual(self.music.plain_lyrics, "Santo")
+        self.assertEqual(self.music.detected_chords, ["G"])
+
+        with mock.patch.object(
+            models, "extract_lyrics_and_chords", wraps=models.extract_lyrics_and_chords
+        ) as extract:
+            self.music.author = "Outro autor"
+            self.music.save()
+            extract.assert_not_called()
+
+            self.music.music_text = "D\nDigno"
+            self.music.save()
+            extract.assert_called_once()
+
+        self.music.refresh_from_db()
+        self.assertEqual(self.music.plain_lyrics, "Digno")
+        self.assertEqual(self.music.detected_chords, ["D"])
+
+    def test_update_fields_also_saves_derived_fields(self):
+        old_hash = self.music.text_hash
+        self.music.music_text = "Em\nAleluia"
+        self.music.save(update_fields=["music_text"])
+
+        self.music.refresh_from_db()
+        self.assertEqual(self.music.plain_lyrics, "Aleluia")
+        self.assertEqual(self.music.detected_chords, ["Em"])
+        self.assertNotEqual(self.music.text_hash, old_hash)
+
+    def test_backfill_fills_existing_rows(self):
+        # Linhas gravadas antes dos campos derivados existirem
+        Music.objects.update(plain_lyrics="", detected_chords=[], text_hash="")
+        call_command("backfill_lyrics", stdout=StringIO())
+
+        self.music.refresh_from_db()
+        self.assertEqual(self.music.plain_lyrics, "Santo")
+        self.assertEqual(self.music.detected_chords, ["G"])
+        self.assertTrue(self.music.text_hash)
+
+    def test_backfill_refreshes_the_search_index(self):
+        Music.objects.create(
+            music_title="Louvor", author="Autor", music_tone="G", music_text="G\nHosana"
+        )
+        Music.objects.update(plain_lyrics="", detected_chords=[], text_hash="")
+        self.assertEqual(search_musics("hosana"), [])
+
+        call_command("backfill_lyrics", stdout=StringIO())
+        self.assertEqual(
+            [music.music_title for music in search_musics("hosana")], ["Louvor"]
+        )
+
+
+class ChordRegistryTestCase(TestCase):
+    def setUp(self):
+        chord_registry.clear_cache()
+        self.addCleanup(chord_registry.clear_cache)
+        self.existing = MusicChord.objects.create(chord_name="G")
+
+    def test_resolves_in_bulk_and_then_from_cache(self):
+        names = ["G", "D/F#", "Em", "G", "Cmaj7(9)add11"]
+        # Busca dos nomes, bulk_create dos novos e leitura dos ids criados
+        with self.assertNumQueries(3):
+            chord_ids = chord_registry.resolve_chord_ids(names)
+
+        self.assertEqual(list(chord_ids), ["G", "D/F#", "Em"])
+        self.assertEqual(chord_ids["G"], self.existing.id)
+        self.assertFalse(
+            MusicChord.objects.filter(chord_name__startswith="Cmaj").exists()
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(chord_registry.resolve_chord_ids(names), chord_ids)
+
+    def test_cache_is_cleared_on_chord_writes(self):
+        chord_registry.resolve_chord_ids(["G"])
+        self.existing.delete()
+        self.assertEqual(chord_registry._chord_ids, {})
+
+        chord_registry.resolve_chord_ids(["A"])
+        MusicChord.objects.create(chord_name="B")
+        self.assertEqual(chord_registry._chord_ids, {})
+
+    def test_writes_from_other_processes_discard_the_local_cache(self):
+        chord_registry.resolve_chord_ids(["G"])
+        # Id que outro processo (ex.: o admin) já apagou: lá os sinais só
+        # trocam a versão compartilhada, não o cache deste processo
+        chord_registry._chord_ids["G"] = -1
+        cache.set(chord_registry.VERSION_KEY, "outra-versao", None)
+
+        with self.assertNumQueries(1):
+            chord_ids = chord_registry.resolve_chord_ids(["G"])
+        self.assertEqual(chord_ids["G"], self.existing.id)
+
+
+class PdfExtractionTestCase(TestCase):
+    CHORDS = ["C", "Cm", "C7", "D", "Dm", "D7", "E", "Em", "E7"]
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(self.shutdown_pool)
+        # Os ids em cache seriam de acordes desfeitos pelo rollback do teste
+        self.addCleanup(chord_registry.clear_cache)
+        # Mais de PAGE_BATCH_SIZE páginas: vai para o pool de processos
+        self.pages = [
+            (self.CHORDS[number % len(self.CHORDS)], f"Pagina {number:02d}")
+            for number in range(pdf.PAGE_BATCH_SIZE * 2 + 1)
+        ]
+        document = fitz.open()
+        for chord, text in self.pages:
+            document.new_page().insert_text((72, 72), f"{chord}\n{text}")
+        self.path = Path(directory.name) / "cifra.pdf"
+        document.save(self.path)
+
+    def shutdown_pool(self):
+        if pdf._executor is not None:
+            pdf._executor.shutdown()
+            pdf._executor = None
+
+    @override_settings(DEBUG=True, PDF_EXTRACTION_WORKERS=2)
+    def test_large_pdf_is_extracted_in_page_order_by_the_pool(self):
+        result = import_pdf(str(self.path))
+
+        self.assertIsNotNone(pdf._executor)
+        positions = [result["html"].index(text) for _, text in self.pages]
+        self.assertEqual(positions, sorted(positions))
+        self.assertEqual(result["chords"], self.CHORDS)
+        self.assertEqual(len(result["page_timings"].split(",")), len(self.pages))
+
+
+class MusicSearchTestCase(TestCase):
+    def setUp(self):
+        for title, author, text in [
+            ("Coração Igual ao Teu", "Diante do Trono", "<p>G Se tu olhares</p>"),
+            ("Santo", "Fernandinho", "<p>D Santo, santo é o Senhor</p>"),
+            ("Teu Santo Nome", "Gabriela Rocha", "<p>C Coração grato</p>"),
+        ]:
+            Music.objects.create(
+                music_title=title, author=author, music_tone="G", music_text=text
+            )
+
+    def test_accent_insensitive_prefix_search_ranked_by_relevance(self):
+        titles = [music.music_title for music in search_musics("coracao")]
+        self.assertEqual(titles, ["Coração Igual ao Teu", "Teu Santo Nome"])
+
+        titles = [music.music_title for music in search_musics("san")]
+        self.assertEqual(titles[0], "Santo")
+        self.assertEqual(search_musics("santo gabri")[0].music_title, "Teu Santo Nome")
+
+    def test_index_is_refreshed_after_save(self):
+        self.assertEqual(search_musics("aleluia"), [])
+        Music.objects.create(
+            music_title="Aleluia", author="Autor", music_tone="A", music_text="<p>A</p>"
+        )
+        self.assertEqual(len(search_musics("aleluia")), 1)
+
+    def test_index_follows_writes_from_other_processes(self):
+        self.assertEqual(search_musics("aleluia"), [])
+        # Escrita sem sinais neste processo: só a versão compartilhada muda
+        Music.objects.filter(music_title="Santo").update(plain_lyrics="Aleluia")
+        cache.set(search.INDEX_VERSION_KEY, "outra-versao", None)
+        self.assertEqual(search_musics("aleluia")[0].music_title, "Santo")
+
+    def test_mysql_query_requires_every_prefix(self):
+        self.assertIsNone(search.mysql_queryset("  "))
+        sql, params = search.mysql_queryset("Coração igu").query.sql_with_params()
+        self.assertIn("MATCH (music_title, author, plain_lyrics) AGAINST", sql)
+        self.assertEqual(params[:2], ("+coracao* +igu*", "+coracao* +igu*"))
+
+
+@skipUnless(connection.vendor == "mysql", "FULLTEXT só existe no MySQL")
+class MusicFulltextSearchTestCase(TransactionTestCase):
+    # Linhas fora de transação: o InnoDB só indexa o FULLTEXT no commit
+    def setUp(self):
+        for title, text in [("Santo", "D Santo, santo"), ("Teu Nome", "C Santo")]:
+            Music.objects.create(
+                music_title=title, author="Autor", music_tone="G", music_text=text
+            )
+
+    def test_title_matches_rank_first(self):
+        titles = [music.music_title for music in search_musics("santo")]
+        self.assertEqual(titles, ["Santo", "Teu Nome"])
+        self.assertEqual(search_musics("inexistente"), [])
+
+
+class MusicQueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        self.category = MusicCategory.objects.create(category_name="Adoração")
+        self.chord = MusicChord.objects.create(chord_name="G")
+        self.create_musics(2)
+
+    def create_musics(self, count):
+        for _ in range(count):
+            music = Music.objects.create(
+                music_title="Santo", author="Autor", music_tone="G", music_text="G"
+            )
+            music.category.add(self.category)
+            music.music_chord.add(self.chord)
+
+    def test_list_endpoints_do_not_issue_queries_per_song(self):
+        for url in ["/api/praise/music/", "/api/praise/music/musics/"]:
+            with self.subTest(url=url):
+                self.assertQueriesDoNotGrow(
+                    lambda: self.client.get(url), lambda: self.create_musics(3)
+                )
+
+
+class MusicConditionalGetTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        self.category = MusicCategory.objects.create(category_name="Adoração")
+        self.music = Music.objects.create(
+            music_title="Santo", author="Autor", music_tone="G", music_text="G"
+        )
+        self.music.category.add(self.category)
+
+    def test_not_modified_without_queries(self):
+        response = self.client.get("/api/praise/music/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Last-Modified", response)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(
+                "/api/praise/music/", HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b"")
+        self.assertEqual(cached["ETag"], response["ETag"])
+
+        # Outra URL (filtros, página) tem outro ETag
+        other = self.client.get(
+            "/api/praise/music/?search=santo", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(other.status_code, 200)
+
+    def test_writes_change_the_version(self):
+        etag = self.client.get("/api/praise/music/")["ETag"]
+        writes = [
+            # Categoria aninhada, ManyToMany e exclusão não mudam Music.updated_at
+            lambda: self.category.save(),
+            lambda: self.music.category.clear(),
+            lambda: Music.objects.create(
+                music_title="Digno", author="Autor", music_tone="A", music_text="A"
+            ).delete(),
+        ]
+        for write in writes:
+            write()
+            response = self.client.get("/api/praise/music/", HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response["ETag"], etag)
+            etag = response["ETag"]
+
+    def test_reference_lists_are_cached_and_revalidated_by_date(self):
+        response = self.client.get("/api/praise/music-category/")
+        self.assertIn("max-age=300", response["Cache-Control"])
+        cached = self.client.get(
+            "/api/praise/music-category/",
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+        self.assertEqual(cached.status_code, 304)
+
+
+class MusicCursorPaginationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        for index in range(5):
+            Music.objects.create(
+                music_title=f"Música {index % 3}",
+                author="Autor",
+                music_tone="G",
+                music_text="G",
+            )
+        self.expected = list(
+            Music.objects.order_by("music_title", "id").values_list("id", flat=True)
+        )
+
+    def test_walks_all_pages_with_cursor(self):
+        url, seen = "/api/praise/music/musics/?page_size=2", []
+        while url:
+            data = self.client.get(url).json()
+            self.assertEqual(data["counts"], 5)
+            seen += [music["id"] for music in data["musics"]]
+            url = data["next"]
+        self.assertEqual(seen, self.expected)
+
+    def test_count_is_refreshed_after_write(self):
+        self.client.get("/api/praise/music/musics/")
+        Music.objects.first().delete()
+        self.assertEqual(
+            self.client.get("/api/praise/music/musics/").json()["counts"], 4
+        )
+
+    def test_streams_ndjson(self):
+        response = self.client.get("/api/praise/music/musics/?stream=ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], self.expected)
+
+    def test_rejects_ordering_param(self):
+        for url in (
+            "/api/praise/music/musics/?ordering=-music_title",
+            "/api/praise/music/musics/?ordering=author&stream=ndjson",
+        ):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("ordering", response.json())
+
+
+class MostPlayedRankingTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        worship = MusicCategory.objects.create(category_name="Adoração")
+        self.musics = {}
+        for title, author in [("Santo", "Autor A"), ("Digno", "Autor B")]:
+            music = Music.objects.create(
+                music_title=title, author=author, music_tone="G", music_text="G"
+            )
+            music.category.add(worship)
+            self.musics[title] = music
+
+        # "Digno" (id maior) tocada em duas escalas, "Santo" em uma
+        both = Playlist.objects.create(playlist_name="Culto")
+        both.music.add(*self.musics.values())
+        single = Playlist.objects.create(playlist_name="Ensaio")
+        single.music.add(self.musics["Digno"])
+        self.lineup = PraiseLineup.objects.create(lineup_event="Culto", playlist=both)
+        PraiseLineup.objects.create(lineup_event="Ensaio", playlist=single)
+
+    def test_ranking_is_ordered_and_computed_in_one_query(self):
+        with self.assertNumQueries(1):
+            ranking = compute_most_played()
+        self.assertEqual(
+            [(item["music"], item["total"]) for item in ranking["top_musics"]],
+            [("Digno", 2), ("Santo", 1)],
+        )
+
+    def test_breakdowns_and_window_parameters(self):
+        data = self.client.get(
+            "/api/praise/music/most-played?breakdown=category,author&limit=1"
+        ).json()
+        self.assertEqual([item["music"] for item in data["top_musics"]], ["Digno"])
+        self.assertEqual(data["by_category"], [{"category": "Adoração", "total": 3}])
+        self.assertEqual(data["by_author"], [{"author": "Autor B", "total": 2}])
+
+        response = self.client.get("/api/praise/music/most-played?breakdown=tone")
+        self.assertEqual(response.status_code, 400)
+
+    def test_cache_is_invalidated_when_lineup_moves(self):
+        self.assertEqual(len(most_played()["top_musics"]), 2)
+        with self.assertNumQueries(0):
+            most_played()
+
+        self.lineup.lineup_date = timezone.localdate() - relativedelta(years=1)
+        self.lineup.save()
+        self.assertEqual(
+            [item["music"] for item in most_played()["top_musics"]], ["Digno"]
+        )
@@ -1,21 +1,7 @@
 import html
 import re
 
-from pychord import Chord
-
-
-def is_chord(value):
-    """
-    Verifica se um valor representa um acorde válido, incluindo acordes com extensões entre parênteses.
-    """
-    # Remove parênteses e qualquer conteúdo dentro deles
-    clean_value = re.sub(r"\([^)]*\)", "", value).strip()
-
-    try:
-        Chord(clean_value)
-        return True
-    except ValueError:
-        return False
+from .chords import is_chord, split_line  # noqa: F401
 
 
 def strip_html_tags(text):
@@ -25,9 +11,10 @@ def strip_html_tags(text):
     return re.sub(r"<[^>]+>", "", text)
 
 
-def extract_lyrics_without_chords(raw_html):
+def extract_lyrics_and_chords(raw_html):
     """
-    Extrai letras da música, removendo acordes (incluindo acordes com extensões) e restaurando quebras de linha.
+    Extrai, em uma única passagem, a letra sem acordes (com as quebras de linha) e a
+    lista de acordes distintos da música.
     """
     # Remove tags HTML e decodifica entidades HTML
     text = html.unescape(strip_html_tags(raw_html))
@@ -37,14 +24,20 @@ def extract_lyrics_without_chords(raw_html):
 
     # Remove múltiplos espaços e colapsa linhas
     lines = []
+    chords = []
     for line in text.splitlines():
-        # Divide a linha em palavras, considerando tanto acordes simples quanto com parênteses
-        words = line.strip().split()
+        # Separa acordes (simples ou com parênteses) das palavras da letra
+        line_chords, words = split_line(line)
+        chords.extend(line_chords)
+
+        if words:
+            lines.append(" ".join(words))
 
-        # Filtra palavras que não são acordes
-        line_clean = " ".join(word for word in words if not is_chord(word))
+    return "\n".join(lines), list(dict.fromkeys(chords))
 
-        if line_clean:
-            lines.append(line_clean.strip())
 
-    return "\n".join(lines)
+def extract_lyrics_without_chords(raw_html):
+    """
+    Extrai letras da música, removendo acordes (incluindo acordes com extensões) e restaurando quebras de linha.
+    """
+    return extract_lyrics_and_chords(raw_html)[0]
@@ -1,7 +1,4 @@
-import fitz  # pymupdf
-from dateutil.relativedelta import relativedelta
-from django.db.models import Count
-from django.utils import timezone
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -9,36 +6,108 @@ from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.views import APIView
 
-from apps.lineup.models import PraiseLineup
-from apps.playlist.models import Playlist
+from apps.dashboard.rankings import parse_breakdowns, parse_ranking_params
+from apps.dashboard.stats import get_statistic
+from apps.jobs.registry import enqueue
+from apps.jobs.serializers import JobAcceptedSerializer
+from apps.jobs.views import accepted_response
+from setup.conditional import ConditionalGetMixin
+from setup.replica import ReplicaReadMixin
 
+from . import rankings
 from .models import Music, MusicCategory, MusicChord
 from .serializers import (
     MusicCategorySerializers,
     MusicChordSerializers,
+    MusicSearchSerializers,
     MusicSerializers,
     UploadPdfSerializer,
 )
-from .utils import is_chord
+from .pagination import MusicKeysetPagination, cached_count
+from .pdf import InvalidPdf, check_pdf
+from .search import search_musics
 
+# Quantidade máxima de resultados da busca textual
+SEARCH_MAX_LIMIT = 50
 
-class MusicViewSet(viewsets.ModelViewSet):
+# Formatos do modo streaming da listagem de músicas
+STREAM_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+STREAM_CHUNK_SIZE = 200
+
+
+class MusicViewSet(ConditionalGetMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Music.objects.all()
     serializer_class = MusicSerializers
+    replica_actions = {"list", "musics", "get_total_music"}
+    # Categorias e acordes vão aninhados em cada música
+    conditional_models = (Music, MusicCategory, MusicChord)
 
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     search_fields = ["music_title", "author", "category__category_name"]
     filterset_fields = ["category"]
 
+    # Relações serializadas de forma aninhada em cada ação de leitura
+    prefetch_by_action = {
+        "list": ["category", "music_chord"],
+        "retrieve": ["category", "music_chord"],
+        "musics": ["category", "music_chord"],
+    }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        prefetch = self.prefetch_by_action.get(self.action)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
     @swagger_auto_schema(
-        operation_description="Retorna todas as músicas cadastradas.",
+        operation_description=(
+            "Retorna as músicas cadastradas em ordem de título, paginadas por cursor. "
+            "Com stream=ndjson ou stream=json, envia todas as músicas em streaming "
+            "(sem paginação)."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description=(
+                    "Cursor da próxima página (campo next da resposta anterior)"
+                ),
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "page_size",
+                openapi.IN_QUERY,
+                description="Quantidade de músicas por página (até 200)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "stream",
+                openapi.IN_QUERY,
+                description=(
+                    "Modo streaming: ndjson (uma música por linha) ou json (array)"
+                ),
+                type=openapi.TYPE_STRING,
+                enum=["ndjson", "json"],
+                required=False,
+            ),
+        ],
         responses={
             200: openapi.Schema(
                 type=openapi.TYPE_OBJECT,
                 properties={
                     "counts": openapi.Schema(type=openapi.TYPE_INTEGER),
+                    "next": openapi.Schema(
+                        type=openapi.TYPE_STRING, format="uri", nullable=True
+                    ),
                     "musics": openapi.Schema(
                         type=openapi.TYPE_ARRAY,
                         items=openapi.Schema(
@@ -95,41 +164,71 @@ class MusicViewSet(viewsets.ModelViewSet):
                         ),
                     ),
                 },
-            )
+            ),
+            400: openapi.Response(
+                description="Cursor ou page_size inválido, ou ordering informado"
+            ),
         },
     )
     @action(detail=False, methods=["get"], url_path="musics")
     def musics(self, request):
         queryset = self.filter_queryset(
             self.get_queryset()
-        )  # <- aplica filtros, busca, ordenação
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"counts": queryset.count(), "musics": serializer.data},
-            status=status.HTTP_200_OK,
+        )  # <- aplica filtros e busca
+
+        # A ordem é fixa (título, id), também no streaming
+        paginator = MusicKeysetPagination()
+        paginator.check_ordering(request)
+
+        stream = request.query_params.get("stream")
+        if stream in STREAM_CONTENT_TYPES:
+            return self.stream_musics(queryset, stream)
+
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(
+            serializer.data, counts=cached_count(queryset, request)
         )
 
+    def stream_musics(self, queryset, stream):
+        """
+        Envia as músicas conforme são serializadas, lendo o banco em blocos.
+        """
+        queryset = queryset.order_by(*MusicKeysetPagination.ordering)
+        encoder = JSONEncoder()
+
+        def rows():
+            for music in queryset.iterator(chunk_size=STREAM_CHUNK_SIZE):
+                yield encoder.encode(self.get_serializer(music).data)
+
+        def ndjson():
+            for row in rows():
+                yield row + "\n"
+
+        def json_array():
+            yield "["
+            for index, row in enumerate(rows()):
+                yield row if index == 0 else "," + row
+            yield "]"
+
+        content = ndjson() if stream == "ndjson" else json_array()
+        return StreamingHttpResponse(content, content_type=STREAM_CONTENT_TYPES[stream])
+
     @swagger_auto_schema(
         operation_description="Recebe um arquivo PDF contendo cifras de músicas e retorna o conteúdo formatado para ser exibido no TinyMCE.",
         request_body=UploadPdfSerializer,  # Aqui definimos o body que esperamos
         responses={
-            200: openapi.Response(
-                description="HTML gerado a partir do PDF extraído.",
-                schema=openapi.Schema(
-                    type=openapi.TYPE_OBJECT,
-                    properties={
-                        "html": openapi.Schema(
-                            type=openapi.TYPE_STRING,
-                            description="HTML formatado com as cifras extraídas do PDF, dentro de uma tag <pre>.",
-                        ),
-                        "chords": openapi.Schema(
-                            type=openapi.TYPE_ARRAY,
-                            description="Todas as cifras presentes no texto.",
-                            items=openapi.Schema(type=openapi.TYPE_STRING),
-                        ),
-                    },
+            202: openapi.Response(
+                description=(
+                    "Job de importação criado. O resultado (html, chords e "
+                    "music_chord_ids) fica disponível em "
+                    "/api/praise/jobs/<id>/result/."
                 ),
-            )
+                schema=JobAcceptedSerializer,
+            ),
+            400: openapi.Response(
+                description="Arquivo ausente, maior que 10 MB ou que não abre como PDF"
+            ),
         },
     )
     @action(
@@ -142,39 +241,93 @@ class MusicViewSet(viewsets.ModelViewSet):
         serializer = UploadPdfSerializer(data=request.data)
         if serializer.is_valid():
             file_obj = serializer.validated_data["file"]
-
             try:
-                pdf_file = fitz.open(stream=file_obj.read(), filetype="pdf")
-                text_content = ""
-                for page in pdf_file:
-                    text_content += page.get_text("text")  # preserva quebras de linha
-            except Exception as e:
+                check_pdf(file_obj)
+            except InvalidPdf as error:
                 return Response(
-                    {"detail": f"Erro ao processar PDF: {str(e)}"},
+                    {"detail": f"Erro ao processar PDF: {error}"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            words = text_content.split()
-            chords = []
-            for word in words:
-                if is_chord(word):
-                    chords.append(word)
-
-            chords = list(set(chords))
+            # A extração roda no worker de jobs, fora do ciclo da requisição
+            job = enqueue("music.import_pdf", source=file_obj, user=request.user)
+            return accepted_response(job)
 
-            # Verificando se existe um acorde e adicionando no banco caso não exista
-            model_chords = MusicChord.objects.all()
-            for item in chords:
-                if not model_chords.filter(chord_name=item).exists():
-                    MusicChord.objects.create(chord_name=item)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-            html_content = f"<pre>{text_content.strip()}</pre>"
+    @swagger_auto_schema(
+        method="get",
+        operation_description=(
+            "Busca músicas por título, autor e letra, ordenadas por relevância. "
+            "Ignora acentos e aceita prefixos (autocompletar)."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "q",
+                openapi.IN_QUERY,
+                description="Termos da busca",
+                type=openapi.TYPE_STRING,
+                required=True,
+            ),
+            openapi.Parameter(
+                "limit",
+                openapi.IN_QUERY,
+                description=f"Quantidade máxima de resultados (até {SEARCH_MAX_LIMIT})",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+        ],
+        responses={
+            200: openapi.Response(
+                description="Músicas encontradas",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "results": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    "id": openapi.Schema(type=openapi.TYPE_INTEGER),
+                                    "music_title": openapi.Schema(
+                                        type=openapi.TYPE_STRING
+                                    ),
+                                    "author": openapi.Schema(type=openapi.TYPE_STRING),
+                                    "music_tone": openapi.Schema(
+                                        type=openapi.TYPE_STRING
+                                    ),
+                                    "music_link": openapi.Schema(
+                                        type=openapi.TYPE_STRING, format="uri"
+                                    ),
+                                    "relevance": openapi.Schema(
+                                        type=openapi.TYPE_NUMBER
+                                    ),
+                                },
+                            ),
+                        )
+                    },
+                ),
+            )
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"q": "Informe o termo da busca."}, status=status.HTTP_400_BAD_REQUEST
+            )
 
+        try:
+            limit = int(request.query_params.get("limit", 20))
+        except ValueError:
             return Response(
-                {"chords": chords, "html": html_content}, status=status.HTTP_200_OK
+                {"limit": "Valor inválido."}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+        serializer = MusicSearchSerializers(search_musics(query, limit), many=True)
+        return Response({"results": serializer.data}, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
         method="get",
@@ -195,15 +348,17 @@ class MusicViewSet(viewsets.ModelViewSet):
     )
     @action(detail=False, methods=["get"], url_path="total-music")
     def get_total_music(self, request):
-        musics = Music.objects.all()
-
-        return Response({"total": musics.count()}, status=status.HTTP_200_OK)
+        return Response(
+            {"total": get_statistic("total_music")}, status=status.HTTP_200_OK
+        )
 
 
-class MusicCategoryViewSet(viewsets.ModelViewSet):
+class MusicCategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = MusicCategory.objects.all()
     serializer_class = MusicCategorySerializers
     pagination_class = None
+    # Lista de apoio que quase não muda: o navegador reaproveita por 5 minutos
+    cache_control = {"private": True, "max_age": 300}
 
     filter_backends = [
         DjangoFilterBackend,
@@ -214,10 +369,11 @@ class MusicCategoryViewSet(viewsets.ModelViewSet):
     search_fields = ["category_name"]
 
 
-class MusicChordViewSet(viewsets.ModelViewSet):
+class MusicChordViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = MusicChord.objects.all()
     serializer_class = MusicChordSerializers
     pagination_class = None
+    cache_control = {"private": True, "max_age": 300}
 
     filter_backends = [
         DjangoFilterBackend,
@@ -229,9 +385,37 @@ class MusicChordViewSet(viewsets.ModelViewSet):
     filterset_fields = ["chord_name"]
 
 
-class MostPlayedSongs(APIView):
+class MostPlayedSongs(ReplicaReadMixin, APIView):
     @swagger_auto_schema(
-        operation_description="Retorna as 5 músicas mais tocadas nas playlists dos últimos 6 meses.",
+        operation_description=(
+            "Retorna as músicas mais tocadas nas escalas da janela informada (padrão: "
+            "10 músicas nos últimos 6 meses), em ordem de ranking."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "months",
+                openapi.IN_QUERY,
+                description="Janela em meses até hoje (1 a 60)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "limit",
+                openapi.IN_QUERY,
+                description="Quantidade de itens do ranking (1 a 50)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "breakdown",
+                openapi.IN_QUERY,
+                description=(
+                    "Agrupamentos extras separados por vírgula: category, author"
+                ),
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+        ],
         responses={
             200: openapi.Response(
                 description="Lista das músicas mais tocadas",
@@ -243,60 +427,46 @@ class MostPlayedSongs(APIView):
                             items=openapi.Schema(
                                 type=openapi.TYPE_OBJECT,
                                 properties={
+                                    "id": openapi.Schema(type=openapi.TYPE_INTEGER),
                                     "music": openapi.Schema(type=openapi.TYPE_STRING),
                                     "author": openapi.Schema(type=openapi.TYPE_STRING),
                                     "total": openapi.Schema(type=openapi.TYPE_INTEGER),
                                 },
                             ),
-                        )
+                        ),
+                        "by_category": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    "category": openapi.Schema(
+                                        type=openapi.TYPE_STRING
+                                    ),
+                                    "total": openapi.Schema(type=openapi.TYPE_INTEGER),
+                                },
+                            ),
+                        ),
+                        "by_author": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    "author": openapi.Schema(type=openapi.TYPE_STRING),
+                                    "total": openapi.Schema(type=openapi.TYPE_INTEGER),
+                                },
+                            ),
+                        ),
                     },
                 ),
             )
         },
     )
     def get(self, request):
-        date_now = timezone.now()
-        # Ajustando para 6 meses conforme a descrição da API
-        date_six_months_ago = date_now - relativedelta(months=6)
-
-        lineups = PraiseLineup.objects.filter(
-            lineup_date__range=(date_six_months_ago, date_now)
-        )
-
-        playlist_ids = lineups.values_list("playlist_id", flat=True)
-        through_model = Playlist.music.through  # acesso à tabela M2M
-
-        top_musics = (
-            through_model.objects.filter(playlist_id__in=playlist_ids)
-            .values("music")
-            .annotate(total=Count("music"))
-            .order_by("-total")[:10]
+        months, limit = parse_ranking_params(
+            request.query_params, rankings.DEFAULT_WINDOW_MONTHS
         )
-
-        # Abordagem 1: Preservando a ordem usando Case/When no Django
-        music_ids = [item["music"] for item in top_musics]
-
-        print(music_ids)
-
-        # Buscar músicas com a ordem preservada
-        musics = Music.objects.filter(id__in=music_ids)
-
-        print([music.id for music in musics])
-        # Dicionário para mapear ids de músicas com seus totais
-        music_count_map = {item["music"]: item["total"] for item in top_musics}
-
-        # Criar a lista de resultados mantendo a ordem correta
-        result = []
-        for music in musics:
-            result.append(
-                {
-                    "music": music.music_title,
-                    "author": music.author,
-                    "total": music_count_map[music.id],
-                }
-            )
-
+        breakdowns = parse_breakdowns(request.query_params, rankings.BREAKDOWNS)
         return Response(
-            {"top_musics": result},
+            rankings.most_played(months, limit, breakdowns),
             status=status.HTTP_200_OK,
         )
@@ -0,0 +1,79 @@
+from collections import defaultdict
+
+from .models import Playlist
+
+# Atributo em que os links resolvidos em lote ficam guardados na playlist
+PLAYLIST_LINKS_ATTR = "_playlist_links"
+
+
+def load_playlist_musics(playlist, fields=None):
+    """
+    Carrega as músicas de uma playlist, na ordem em que foram adicionadas, em uma
+    única consulta.
+
+    `fields` restringe as colunas de Music carregadas (as demais ficam adiadas).
+    """
+    rows = (
+        Playlist.music.through.objects.filter(playlist=playlist)
+        .select_related("music")
+        .order_by("id")
+    )
+    if fields:
+        rows = rows.only("music", *(f"music__{field}" for field in fields))
+    return [row.music for row in rows]
+
+
+def load_playlist_links(playlist_ids):
+    """
+    Retorna {id da playlist: [links das músicas]} para várias playlists em uma
+    única consulta, mantendo a ordem das músicas em cada playlist.
+    """
+    links = defaultdict(list)
+    if not playlist_ids:
+        return links
+    rows = (
+        Playlist.music.through.objects.filter(playlist_id__in=playlist_ids)
+        .order_by("id")
+        .values_list("playlist_id", "music__music_link")
+    )
+    for playlist_id, link in rows:
+        if link:
+            links[playlist_id].append(link)
+    return links
+
+
+def prefetch_playlist_links(playlists):
+    """
+    Resolve os links de todas as playlists de uma vez e guarda o resultado em
+    cada uma, para que get_playlist_link_display não consulte o banco por linha.
+    """
+    playlists = [
+        playlist
+        for playlist in playlists
+        if playlist is not None and not hasattr(playlist, PLAYLIST_LINKS_ATTR)
+    ]
+    links = load_playlist_links({playlist.id for playlist in playlists})
+    for playlist in playlists:
+        setattr(playlist, PLAYLIST_LINKS_ATTR, links.get(playlist.id, []))
+
+
+def load_playlists_musics(playlist_ids, fields=None):
+    """
+    Retorna {id da playlist: [músicas]} para várias playlists em uma única
+    consulta, mantendo a ordem das músicas em cada playlist.
+    """
+    musics = defaultdict(list)
+    if not playlist_ids:
+        return musics
+    rows = (
+        Playlist.music.through.objects.filter(playlist_id__in=playlist_ids)
+        .select_related("music")
+        .order_by("id")
+    )
+    if fields:
+        rows = rows.only(
+            "playlist_id", "music", *(f"music__{field}" for field in fields)
+        )
+    for row in rows:
+        musics[row.playlist_id].append(row.music)
+    return musics
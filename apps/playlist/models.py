@@ -20,10 +20,13 @@ class Playlist(TimeStampedModel):
         return f"{self.playlist_name} | {self.playlist_date}"
 
     def get_playlist_link_display(self):
-        if not self.music:
-            return []
+        from .content import PLAYLIST_LINKS_ATTR, load_playlist_musics
+
+        # Links já resolvidos em lote (ver content.prefetch_playlist_links)
+        if hasattr(self, PLAYLIST_LINKS_ATTR):
+            return getattr(self, PLAYLIST_LINKS_ATTR)
         return [
             music.music_link
-            for music in self.music.all()
-            if hasattr(music, "music_link") and music.music_link
+            for music in load_playlist_musics(self, ["music_link"])
+            if music.music_link
         ]
@@ -1,14 +1,39 @@
+from django.db.models import Manager, QuerySet
 from rest_framework import serializers
 
+from .content import prefetch_playlist_links
 from .models import Playlist
 
 
+class PlaylistLinksListSerializers(serializers.ListSerializer):
+    """
+    Lista que resolve os links das playlists da página inteira em uma consulta
+    antes de serializar cada item.
+
+    `playlist_attr` indica o campo que aponta para a playlist (ex.: escalas);
+    vazio quando os próprios itens são playlists.
+    """
+
+    playlist_attr = None
+
+    def to_representation(self, data):
+        if isinstance(data, (Manager, QuerySet)):
+            data = data.all()
+        data = list(data)
+        prefetch_playlist_links(
+            getattr(item, self.playlist_attr) if self.playlist_attr else item
+            for item in data
+        )
+        return super().to_representation(data)
+
+
 class PlaylistSerializers(serializers.ModelSerializer):
     playlist_link_display = serializers.SerializerMethodField()
 
     class Meta:
         model = Playlist
         fields = "__all__"
+        list_serializer_class = PlaylistLinksListSerializers
 
     def get_playlist_link_display(self, obj):
         return obj.get_playlist_link_display()
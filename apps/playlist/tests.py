@@ -1,3 +1,73 @@
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.lineup.models import PraiseLineup
+from apps.music.models import Music
+from setup.testing import QueryBudgetMixin
+
+from .models import Playlist
+
+
+class PlaylistLinksQueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="louvor"))
+        self.create_lineups(2)
+
+    def create_lineups(self, count):
+        start = Playlist.objects.count()
+        for index in range(start, start + count):
+            playlist = Playlist.objects.create(playlist_name=f"Culto {index}")
+            for position in range(3):
+                music = Music.objects.create(
+                    music_title=f"Música {index}-{position}",
+                    author="Autor",
+                    music_tone="G",
+                    music_text="G",
+                    music_link=f"https://example.com/{index}/{position}",
+                )
+                playlist.music.add(music)
+            PraiseLineup.objects.create(
+                lineup_event=f"Culto {index}", playlist=playlist
+            )
+        # Escala sem playlist também precisa ser aceita
+        PraiseLineup.objects.create(lineup_event="Ensaio")
+
+    def fetch(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_list_endpoints_resolve_links_in_one_query(self):
+        for url in [
+            "/api/praise/playlist/playlists/",
+            "/api/praise/praise-lineup/scales/",
+        ]:
+            with self.subTest(url=url):
+                self.assertQueriesDoNotGrow(
+                    lambda: self.fetch(url), lambda: self.create_lineups(3)
+                )
+
+    def test_list_loads_only_music_ids(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.fetch("/api/praise/playlist/playlists/").json()
+        self.assertEqual(len(data["playlists"][0]["music"]), 3)
+        for query in queries.captured_queries:
+            self.assertNotIn("music_text", query["sql"])
+            self.assertNotIn("plain_lyrics", query["sql"])
+
+    def test_links_keep_playlist_order(self):
+        playlist = Playlist.objects.get(playlist_name="Culto 0")
+        first = playlist.music.get(music_title="Música 0-0")
+        playlist.music.remove(first)
+        playlist.music.add(first)
+
+        expected = playlist.get_playlist_link_display()
+        self.assertEqual(expected[-1], "https://example.com/0/0")
+
+        data = self.fetch("/api/praise/playlist/playlists/").json()["playlists"]
+        links = {item["id"]: item["playlist_link_display"] for item in data}
+        self.assertEqual(links[playlist.id], expected)
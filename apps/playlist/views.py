@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -5,13 +6,24 @@ from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.dashboard.stats import get_statistic
+from apps.music.models import Music
+from setup.conditional import ConditionalGetMixin
+from setup.replica import ReplicaReadMixin
+
 from .models import Playlist
 from .serializers import PlaylistSerializers
 
 
-class PlaylistViewSet(viewsets.ModelViewSet):
-    queryset = Playlist.objects.all()
+class PlaylistViewSet(ConditionalGetMixin, ReplicaReadMixin, viewsets.ModelViewSet):
+    # O serializer só expõe os ids das músicas: a letra e o HTML ficam no banco
+    queryset = Playlist.objects.prefetch_related(
+        Prefetch("music", queryset=Music.objects.only("id"))
+    )
     serializer_class = PlaylistSerializers
+    replica_actions = {"list", "get_playlists", "get_total_playlist"}
+    # Os links das playlists vêm das músicas
+    conditional_models = (Playlist, Music)
 
     filter_backends = [
         DjangoFilterBackend,
@@ -85,6 +97,6 @@ class PlaylistViewSet(viewsets.ModelViewSet):
     )
     @action(detail=False, methods=["get"], url_path="total-playlist")
     def get_total_playlist(self, request):
-        playlists = Playlist.objects.all()
-
-        return Response({"total": playlists.count()}, status=status.HTTP_200_OK)
+        return Response(
+            {"total": get_statistic("total_playlist")}, status=status.HTTP_200_OK
+        )
@@ -8,6 +8,12 @@ python manage.py shell < reset_db.py
 echo "🔧 Aplicando migrações..."
 python manage.py migrate --noinput
 
+echo "🎵 Recalculando letras das músicas..."
+python manage.py backfill_lyrics
+
+echo "📊 Recalculando estatísticas do dashboard..."
+python manage.py rebuild_dashboard
+
 echo "🎒 Coletando arquivos estáticos..."
 python manage.py collectstatic --noinput
 
@@ -0,0 +1,14 @@
+import os
+
+# Modo assíncrono (views async sob setup.asgi):
+#   GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker gunicorn setup.asgi:application
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+
+# Cada thread guarda no máximo uma conexão persistente com o banco, então o pool
+# de cada worker fica limitado a `threads` conexões (workers * threads no total)
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+# Reinicia os workers periodicamente, renovando também as suas conexões
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = 100
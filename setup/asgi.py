@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "setup.settings")
+# Sob ASGI o código síncrono roda em uma thread por requisição, então conexões
+# persistentes não seriam reaproveitadas (e se acumulariam)
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
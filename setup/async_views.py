@@ -0,0 +1,39 @@
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView com handlers `async def` (o DRF 3.16 só executa handlers síncronos).
+
+    Autenticação, permissões e throttling continuam os do DRF, executados em
+    thread (usam cache e banco de forma síncrona); o handler roda no event loop
+    e consulta o banco pelo ORM assíncrono. Sob WSGI o Django executa a view
+    com async_to_sync, então as mesmas rotas funcionam nos dois modos.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if hasattr(response, "__await__"):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
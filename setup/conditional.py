@@ -0,0 +1,196 @@
+import hashlib
+import uuid
+from datetime import datetime, time
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+# Token trocado a cada escrita no model, com a hora da troca
+TOKEN_KEY = "conditional:{label}:token"
+# Versão da coleção (count e max(updated_at)) calculada sob um token
+VERSION_KEY = "conditional:{label}:version"
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+    default_detail = "Não modificado."
+    default_code = "not_modified"
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def _new_token(changed_at=None):
+    return {"id": uuid.uuid4().hex, "changed_at": changed_at}
+
+
+def invalidate(model):
+    """
+    Troca o token das coleções afetadas por uma escrita em `model` (chamado
+    pelos sinais de escrita); a versão guardada deixa de valer.
+    """
+    if model._meta.auto_created:
+        # Tabela intermediária de ManyToMany: as duas pontas mudam
+        models = [
+            field.related_model for field in model._meta.fields if field.remote_field
+        ]
+    else:
+        models = [model]
+    now = timezone.now()
+    cache.set_many(
+        {
+            TOKEN_KEY.format(label=_label(related)): _new_token(now)
+            for related in models
+        },
+        None,
+    )
+
+
+def _compute(model, token):
+    aggregates = {"count": Count("pk")}
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+        aggregates["updated_at"] = Max("updated_at")
+    # Sempre no primário: uma versão lida da réplica atrasada ficaria no cache
+    result = (
+        model._default_manager.using(DEFAULT_DB_ALIAS)
+        .order_by()
+        .aggregate(**aggregates)
+    )
+    # Exclusões e mudanças em ManyToMany não alteram updated_at
+    last_modified = max(
+        filter(None, (result.get("updated_at"), token["changed_at"])), default=None
+    )
+    return {
+        "token": token["id"],
+        "count": result["count"],
+        "last_modified": last_modified,
+    }
+
+
+def collection_versions(models):
+    """
+    Versão de cada model: quantidade de linhas e último updated_at, calculados
+    em uma consulta agregada e guardados no cache até a próxima escrita.
+    """
+    keys = {}
+    for model in models:
+        label = _label(model)
+        keys[model] = (TOKEN_KEY.format(label=label), VERSION_KEY.format(label=label))
+    cached = cache.get_many([key for pair in keys.values() for key in pair])
+
+    versions, stored = [], {}
+    for model, (token_key, version_key) in keys.items():
+        token = cached.get(token_key)
+        if token is None:
+            token = stored[token_key] = _new_token()
+        version = cached.get(version_key)
+        # Versão calculada antes da última escrita (ou durante ela)
+        if version is None or version["token"] != token["id"]:
+            version = stored[version_key] = _compute(model, token)
+        versions.append(version)
+    if stored:
+        cache.set_many(stored, None)
+    return versions
+
+
+def collection_validators(models, *params):
+    """
+    ETag e Last-Modified (timestamp) das coleções para os parâmetros
+    informados (URL, formato), sem consultar as linhas da resposta.
+    """
+    versions = collection_versions(models)
+    content = ":".join(
+        [
+            *(
+                f"{version['token']}.{version['count']}."
+                f"{version['last_modified'] and version['last_modified'].isoformat()}"
+                for version in versions
+            ),
+            *(str(param) for param in params),
+        ]
+    )
+    etag = quote_etag(hashlib.sha256(content.encode()).hexdigest()[:32])
+    last_modified = max(
+        (version["last_modified"] for version in versions if version["last_modified"]),
+        default=None,
+    )
+    return etag, last_modified and int(last_modified.timestamp())
+
+
+class ConditionalGetMixin:
+    """
+    ETag e Last-Modified nas leituras (GET/HEAD) de um ViewSet.
+
+    Os validadores vêm da versão das coleções em `conditional_models` (padrão:
+    o model do queryset) e da URL da requisição. Com If-None-Match ou
+    If-Modified-Since em dia, a resposta é 304 logo depois da autenticação,
+    sem filtrar, paginar nem serializar.
+
+    `cache_control` define o Cache-Control das respostas de leitura.
+
+    Ações em `date_dependent_actions` também dependem da data atual (ex.:
+    janela dos últimos 90 dias): a data entra no ETag e o Last-Modified nunca
+    fica antes da meia-noite, como nas chaves dos rankings.
+    """
+
+    conditional_models = None
+    cache_control = {"private": True, "no_cache": True}
+    date_dependent_actions = set()
+
+    conditional_validators = None
+
+    def get_conditional_models(self):
+        return self.conditional_models or (self.queryset.model,)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in ("GET", "HEAD"):
+            return
+        params = [request.get_full_path(), request.accepted_renderer.format]
+        today = None
+        if self.action in self.date_dependent_actions:
+            today = timezone.localdate()
+            params.append(today)
+        etag, last_modified = collection_validators(
+            self.get_conditional_models(), *params
+        )
+        if today is not None:
+            midnight = timezone.make_aware(datetime.combine(today, time.min))
+            last_modified = max(last_modified or 0, int(midnight.timestamp()))
+        self.conditional_validators = etag, last_modified
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if response is not None and response.status_code == 304:
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=exc.status_code)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.conditional_validators and response.status_code in (200, 304):
+            etag, last_modified = self.conditional_validators
+            # Ações com ETag próprio mantêm o seu
+            if not response.has_header("ETag"):
+                response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+            patch_cache_control(response, **self.cache_control)
+            # A autenticação vem do cookie ou do cabeçalho Authorization
+            patch_vary_headers(response, ("Cookie", "Authorization"))
+        return response
@@ -0,0 +1,42 @@
+"""
+Fachada das bibliotecas de documentos (PyMuPDF e python-pptx).
+
+Elas pesam no import e na memória de cada worker, mas só o upload de PDF e a
+geração de slides as usam; por isso são importadas no primeiro uso e não no
+boot (via setup.urls).
+"""
+
+import os
+
+# Módulos carregados sob demanda (o comando startup_profile confere que nenhum
+# deles é importado no boot)
+LAZY_MODULES = ("fitz", "pptx")
+
+
+def open_pdf(source):
+    """
+    Abre um PDF a partir de um caminho ou de um buffer em memória.
+    """
+    import fitz  # PyMuPDF
+
+    if isinstance(source, (str, os.PathLike)):
+        return fitz.open(source)
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def new_presentation():
+    from pptx import Presentation
+
+    return Presentation()
+
+
+def inches(value):
+    from pptx.util import Inches
+
+    return Inches(value)
+
+
+def points(value):
+    from pptx.util import Pt
+
+    return Pt(value)
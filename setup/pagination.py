@@ -0,0 +1,104 @@
+import base64
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) sobre (campo, id).
+
+    Cada página é uma consulta indexada "depois do último item visto", sem
+    OFFSET, então o custo não cresce com a posição na lista e linhas com o mesmo
+    valor no campo são desempatadas pelo id. O cursor só vale na ordem de
+    `ordering` (as duas colunas no mesmo sentido), por isso ?ordering= é
+    recusado em vez de ignorado.
+    """
+
+    ordering = None
+    page_size = 50
+    max_page_size = 200
+    # Chave da lista de itens na resposta
+    results_key = "results"
+
+    @property
+    def field(self):
+        return self.ordering[0].lstrip("-")
+
+    @property
+    def descending(self):
+        return self.ordering[0].startswith("-")
+
+    def encode_cursor(self, obj):
+        position = json.dumps([getattr(obj, self.field), obj.pk], cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(value, (str, int, float)):
+                raise TypeError
+            return value, int(pk)
+        except (ValueError, TypeError):
+            raise ValidationError({"cursor": "Cursor inválido."})
+
+    def check_ordering(self, request):
+        if "ordering" in request.query_params:
+            raise ValidationError(
+                {"ordering": f"A listagem é sempre ordenada por {self.field} e id."}
+            )
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get("page_size", self.page_size))
+        except ValueError:
+            raise ValidationError({"page_size": "Valor inválido."})
+        return max(1, min(page_size, self.max_page_size))
+
+    def after(self, value, pk):
+        lookup = "lt" if self.descending else "gt"
+        return Q(**{f"{self.field}__{lookup}": value}) | Q(
+            **{self.field: value, f"pk__{lookup}": pk}
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.check_ordering(request)
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            queryset = queryset.filter(self.after(*self.decode_cursor(cursor)))
+
+        # Um item a mais indica se existe próxima página
+        page = list(queryset[: page_size + 1])
+        self.has_next = len(page) > page_size
+        self.page = page[:page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            "cursor",
+            self.encode_cursor(self.page[-1]),
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), self.results_key: data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                self.results_key: schema,
+            },
+        }
@@ -0,0 +1,232 @@
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+REPLICA_ALIAS = "replica"
+
+# Cookie que mantém o cliente no primário logo depois de uma escrita
+PIN_COOKIE = "db_primary"
+
+# Estado da requisição atual (contextvars também isola as views assíncronas)
+_state = contextvars.ContextVar("replica_state", default=None)
+
+_lag_lock = threading.Lock()
+_lag_checked_at = None
+_replica_fresh = False
+
+
+class _RequestState:
+    def __init__(self, method):
+        self.method = method
+        self.read_replica = False
+        self.wrote = False
+
+
+def replica_configured():
+    return REPLICA_ALIAS in connections.settings
+
+
+def replica_lag():
+    """
+    Atraso da réplica em segundos; None se a replicação estiver parada.
+
+    No MySQL vem de SHOW REPLICA STATUS; outros bancos (SQLite nos testes) não
+    replicam e são considerados em dia.
+    """
+    connection = connections[REPLICA_ALIAS]
+    if connection.vendor != "mysql":
+        return 0
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute("SHOW REPLICA STATUS")
+        except DatabaseError:
+            # MySQL anterior ao 8.0.22
+            cursor.execute("SHOW SLAVE STATUS")
+        row = cursor.fetchone()
+        columns = [column[0] for column in cursor.description or ()]
+    if row is None:
+        return 0
+    status = dict(zip(columns, row))
+    return status.get("Seconds_Behind_Source", status.get("Seconds_Behind_Master"))
+
+
+def replica_is_fresh():
+    """
+    Se a réplica está dentro de REPLICA_MAX_LAG; consultado no máximo a cada
+    REPLICA_LAG_CHECK_INTERVAL segundos por processo.
+    """
+    global _lag_checked_at, _replica_fresh
+    with _lag_lock:
+        now = time.monotonic()
+        if (
+            _lag_checked_at is None
+            or now - _lag_checked_at >= settings.REPLICA_LAG_CHECK_INTERVAL
+        ):
+            try:
+                lag = replica_lag()
+            except DatabaseError:
+                logger.warning("Réplica indisponível, lendo do primário", exc_info=True)
+                lag = None
+            _replica_fresh = lag is not None and lag <= settings.REPLICA_MAX_LAG
+            _lag_checked_at = now
+        return _replica_fresh
+
+
+def reset_lag_check():
+    global _lag_checked_at
+    with _lag_lock:
+        _lag_checked_at = None
+
+
+def cache_timeout(timeout):
+    """
+    Limita a REPLICA_CACHE_TIMEOUT o cache de resultados lidos da réplica, que
+    podem estar atrasados e não devem durar até a próxima invalidação.
+    """
+    state = _state.get()
+    if state is None or not state.read_replica or state.wrote:
+        return timeout
+    if timeout is None:
+        return settings.REPLICA_CACHE_TIMEOUT
+    return min(timeout, settings.REPLICA_CACHE_TIMEOUT)
+
+
+def read_from_replica():
+    """
+    Marca a requisição atual para ler da réplica (se configurada e em dia).
+    """
+    state = _state.get()
+    if state is not None and replica_configured():
+        state.read_replica = True
+
+
+@contextlib.contextmanager
+def primary():
+    """
+    Lê do primário dentro do bloco, mesmo em uma view marcada para a réplica:
+    para dados que serão gravados (agregados, resumos) a partir da leitura.
+    """
+    token = _state.set(None)
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Leituras das views marcadas com ReplicaReadMixin vão para a réplica.
+
+    Depois de qualquer escrita na requisição, dentro de transações e com a
+    réplica atrasada, todas as leituras voltam ao primário.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (
+            state is None
+            or not state.read_replica
+            or state.wrote
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+            or not replica_is_fresh()
+        ):
+            return None
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # A réplica é uma cópia do primário
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS
+
+
+class ReplicaMiddleware:
+    """
+    Abre o estado de roteamento de cada requisição e, depois de uma escrita em
+    um método inseguro (POST, PUT, ...), fixa o cliente no primário por
+    REPLICA_PIN_SECONDS (read-your-writes).
+
+    Funciona sob WSGI e ASGI sem trocar de thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = _RequestState(request.method)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.process_response(state, response)
+
+    async def __acall__(self, request):
+        state = _RequestState(request.method)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.process_response(state, response)
+
+    def process_response(self, state, response):
+        # Escritas internas de leituras (contadores, caches no banco) não fixam
+        # o cliente: só as requisições de escrita pedem read-your-writes
+        if state.wrote and state.method not in SAFE_METHODS and replica_configured():
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                # O frontend está em outro site: como os cookies de autenticação
+                secure=True,
+                samesite="None",
+                path="/",
+            )
+        return response
+
+
+class ReplicaReadMixin:
+    """
+    Views de listagem e relatório que podem ler da réplica nos métodos seguros.
+
+    `replica_actions` limita as ações de um ViewSet; None libera todas.
+    """
+
+    replica_actions = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            request.method in SAFE_METHODS
+            and not request.COOKIES.get(PIN_COOKIE)
+            and (
+                self.replica_actions is None
+                or getattr(self, "action", None) in self.replica_actions
+            )
+        ):
+            read_from_replica()
@@ -57,6 +57,10 @@ INSTALLED_APPS = [
     "apps.music",
     "apps.playlist",
     "apps.lineup",
+    "apps.jobs",
+    "apps.dashboard",
+    "apps.mailing",
+    "apps.monitoring",
 ]
 
 SITE_ID = 1
@@ -65,6 +69,7 @@ MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "setup.replica.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -97,10 +102,37 @@ WSGI_APPLICATION = "setup.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
+# Conexões persistentes: cada thread do gunicorn reaproveita a sua conexão por até
+# DB_CONN_MAX_AGE segundos (mantenha abaixo do wait_timeout do MySQL) e o health
+# check descarta, antes do uso, as conexões derrubadas pelo servidor por ociosidade
 DATABASES = {
-    "default": dj_database_url.parse(str(os.getenv('MYSQL_URL')))
+    "default": dj_database_url.parse(
+        str(os.getenv('MYSQL_URL')),
+        conn_max_age=int(os.getenv("DB_CONN_MAX_AGE", 300)),
+        conn_health_checks=True,
+    )
 }
 
+# Réplica de leitura opcional para listagens, dashboard e relatórios (ver
+# setup/replica.py); nos testes ela espelha o banco default
+if os.getenv("MYSQL_REPLICA_URL"):
+    DATABASES["replica"] = dj_database_url.parse(
+        os.getenv("MYSQL_REPLICA_URL"),
+        conn_max_age=int(os.getenv("DB_CONN_MAX_AGE", 300)),
+        conn_health_checks=True,
+        test_options={"MIRROR": "default"},
+    )
+
+DATABASE_ROUTERS = ["setup.replica.ReplicaRouter"]
+
+# Atraso máximo aceito da réplica e intervalo entre as verificações (segundos)
+REPLICA_MAX_LAG = int(os.getenv("REPLICA_MAX_LAG", 5))
+REPLICA_LAG_CHECK_INTERVAL = 5
+# Depois de escrever, o cliente lê do primário por este tempo (read-your-writes)
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 10))
+# Validade máxima no cache de resultados calculados a partir da réplica
+REPLICA_CACHE_TIMEOUT = 60
+
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
@@ -112,6 +144,12 @@ CACHES = {
     }
 }
 
+# Sem Redis configurado (desenvolvimento local e testes) usa cache em memória
+if not os.getenv("REDIS_URL_DEPLOY"):
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
 
@@ -159,6 +197,29 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 MEDIA_URL = "/media/"
 
+# Fila de jobs assíncronos (importação de PDF, geração de slides)
+JOBS = {
+    # "redis" usa o Redis de CACHES como broker; "database" dispensa serviços externos
+    "BROKER": os.getenv("JOBS_BROKER", "redis"),
+    # Executa os jobs na própria requisição (desenvolvimento/testes)
+    "EAGER": os.getenv("JOBS_EAGER") == "True",
+    "POLL_INTERVAL": 5,
+    "RESULT_TTL": timedelta(hours=6),
+    "RETRY_DELAY": timedelta(seconds=10),
+}
+
+# Envios de e-mail mais antigos que isto são apagados a cada nova entrega
+MAIL_RETENTION = timedelta(days=int(os.getenv("MAIL_RETENTION_DAYS", 30)))
+
+# Cache das apresentações .pptx geradas, guardado no banco (remoção LRU acima do
+# tamanho máximo)
+SLIDES_CACHE_MAX_SIZE = int(os.getenv("SLIDES_CACHE_MAX_SIZE", 200 * 1024 * 1024))
+
+# Processos usados para extrair PDFs grandes em paralelo
+PDF_EXTRACTION_WORKERS = int(
+    os.getenv("PDF_EXTRACTION_WORKERS", min(4, os.cpu_count() or 1))
+)
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -190,6 +251,10 @@ SIMPLE_JWT = {
     "UPDATE_LAST_LOGIN": False
 }
 
+# Access tokens com menos tempo que isso até expirar são renovados na própria
+# requisição pelo RefreshTokenMiddleware
+ACCESS_TOKEN_REFRESH_MARGIN = timedelta(seconds=60)
+
 
 # Configurações do tinymce
 TINYMCE_JS_URL = os.path.join(STATIC_URL, str(os.getenv("TINYMCE_URL")))
@@ -203,7 +268,7 @@ TINYMCE_COMPRESSOR = True
 # Configurações do CORS
 CORS_ALLOW_ALL_ORIGINS = False
 
-CORS_EXPOSE_HEADERS = ["Content-Type", "X-CSRFToken"]
+CORS_EXPOSE_HEADERS = ["Content-Type", "X-CSRFToken", "ETag"]
 
 CORS_ALLOWED_ORIGINS = [
     'https://ministerio-louvor.vercel.app'
@@ -0,0 +1,37 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    Asserções de número de consultas para os testes (TestCase) das views.
+    """
+
+    def assertQueriesDoNotGrow(self, fetch, grow, max_queries=None):
+        """
+        Falha se o número de consultas de `fetch` aumentar depois de `grow` criar
+        mais registros (sinal de N+1) ou passar de `max_queries`.
+        """
+        # Medições com o cache aquecido: as versões das coleções
+        # (setup.conditional) são recalculadas uma vez depois de cada escrita
+        fetch()
+        with CaptureQueriesContext(connection) as before:
+            fetch()
+        grow()
+        fetch()
+        with CaptureQueriesContext(connection) as after:
+            fetch()
+
+        queries = "\n".join(query["sql"] for query in after.captured_queries)
+        self.assertEqual(
+            len(after),
+            len(before),
+            f"O número de consultas cresceu com os registros "
+            f"({len(before)} -> {len(after)}):\n{queries}",
+        )
+        if max_queries is not None:
+            self.assertLessEqual(
+                len(after),
+                max_queries,
+                f"{len(after)} consultas, orçamento de {max_queries}:\n{queries}",
+            )
@@ -13,7 +13,12 @@ from apps.accounts.views import (
     MemberViewSet,
     UserViewSet,
 )
-from apps.lineup.views import LineupMemberViewSet, PraiseLineupViewSet
+from apps.lineup.views import (
+    LineupMemberViewSet,
+    NextScalesView,
+    PraiseLineupViewSet,
+    PreviousScalesView,
+)
 from apps.music.views import MusicCategoryViewSet, MusicChordViewSet, MusicViewSet
 from apps.playlist.views import PlaylistViewSet
 
@@ -62,10 +67,24 @@ schema_view = get_schema_view(
 
 
 urlpatterns = [
+    # Views assíncronas; antes do router para não caírem no detalhe da escala
+    path(
+        "api/praise/praise-lineup/next-scales/",
+        NextScalesView.as_view(),
+        name="next-scales",
+    ),
+    path(
+        "api/praise/praise-lineup/previous-scales/",
+        PreviousScalesView.as_view(),
+        name="previous-scales",
+    ),
     path("", include(router.urls)),
     path("api/praise/", include("apps.accounts.urls")),
     path("api/praise/", include("apps.music.urls")),
     path("api/praise/", include("apps.lineup.urls")),
+    path("api/praise/", include("apps.jobs.urls")),
+    path("api/praise/", include("apps.dashboard.urls")),
+    path("api/praise/", include("apps.monitoring.urls")),
     path("api-admin-praise/", admin.site.urls),
     # rotas de autenticação
     path("api/token/", CookieTokenObtainPairView.as_view(), name="token_obtain_pair"),